@@ -0,0 +1,293 @@
+"""
+batch_validate.py
+~~~~~~~~~~~~~~~~~
+
+Validate many GCP/EDW table pairs from a manifest, several at a time, with
+:class:`~extended_migration_validator.ExtendedMigrationValidator`.  Each
+pair's seven outputs (plus its stage profile) are written to
+``<output-dir>/<name>/`` and one roll‑up row per pair to
+``<output-dir>/rollup.csv``:
+
+    python batch_validate.py wave_3.json --output-dir results --workers 8 --memory-budget-mb 32000
+
+The manifest is either a JSON file – a list of pairs, or an object with
+``defaults`` (options applied to every pair) and ``pairs`` – or a CSV file
+with one pair per row.  Every pair needs ``gcp`` and ``edw`` paths
+(relative paths are resolved against the manifest's directory) and may
+set ``name`` and any of these options:
+
+  * loader options – ``columns``, ``date_col``, ``start``, ``end``,
+    ``format`` (see :func:`columnar_loader.load_table_pair`; without
+    ``columns`` every column of each extract is read, so columns present
+    on one side only are counted in the roll‑up's ``Schema Differences``
+    and make the pair a mismatch),
+  * any :class:`ExtendedMigrationValidator` option, e.g. ``atol``,
+    ``rtol``, ``partition_freq``, ``distribution_mode``, ``n_workers`` or
+    ``key_cols`` (the columns that identify a row).
+
+In a CSV manifest list values (``columns``, ``key_cols``) are separated by
+``;``, mappings such as ``measure_tolerances`` are written as JSON and
+empty cells are ignored:
+
+    name,gcp,edw,rtol,partition_freq,key_cols
+    sales,gcp/sales.parquet,edw/sales.parquet,1e-6,W,store_id;sku
+
+Scheduling is bounded by two global budgets.  ``--workers`` is the number
+of processes in use at once; a pair occupies as many as its ``n_workers``
+option.  ``--memory-budget-mb`` is shared by the running pairs: each pair
+reserves an estimate of its peak (from the size of its extracts) and is
+started only when the reservation fits.  A pair whose estimate exceeds
+the whole budget runs alone with ``chunked=True`` inside that budget.
+Pairs start in manifest order.
+
+The exit status is 0 when every pair matches, 1 when any pair has
+mismatches and 2 when any pair failed to run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import dataclasses
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from columnar_loader import _FORMATS, load_table_pair  # noqa: E402
+from extended_migration_validator import ExtendedMigrationValidator  # noqa: E402
+
+OUTPUT_NAMES = ["1_summary", "2_grand_totals", "3_time_windows", "4_mismatches", "5_annotated_gcp",
+                "6_partition_checks", "7_distribution_stats", "profile"]
+ROLLUP_COLUMNS = ["Pair", "Status", "GCP Rows", "EDW Rows", "Schema Differences", "Mismatch Rows",
+                  "Grand Total Mismatches", "Partition Mismatches", "Wall Seconds", "Reserved MB", "Output Dir",
+                  "Error"]
+
+_LOADER_OPTIONS = {"columns", "date_col", "start", "end", "format"}
+_LIST_OPTIONS = {"columns", "key_cols"}
+_VALIDATOR_OPTIONS = {f.name: f for f in dataclasses.fields(ExtendedMigrationValidator)
+                      if f.init and f.name not in ("gcp_df", "edw_df")}
+
+# Loaded size relative to the extract on disk, by format
+_EXPANSION = {"parquet": 5.0, "ipc": 1.2, "csv": 1.5}
+# Peak relative to the loaded pair: the validator's copies plus the reconciliation join
+_PEAK_FACTOR = ExtendedMigrationValidator._MERGE_MEMORY_FACTOR + 2.0
+
+
+# ----------------------------------------------------------------------
+# Manifest
+# ----------------------------------------------------------------------
+def _parse_value(name: str, text: str) -> Any:
+    """Convert a CSV manifest cell to the option's type."""
+    if name in _LIST_OPTIONS:
+        return [item.strip() for item in text.split(";") if item.strip()]
+    spec = _VALIDATOR_OPTIONS.get(name)
+    kind = str(spec.type) if spec is not None else ""
+    if kind.startswith("bool"):
+        return text.strip().lower() in ("1", "true", "yes", "y")
+    if kind.startswith("int"):
+        return int(float(text))
+    if "Dict" in kind:
+        return json.loads(text)
+    if "float" in kind:
+        return float(text)
+    return text
+
+
+def read_manifest(path: str) -> List[Dict[str, Any]]:
+    """Return one dict per pair with ``name``, absolute ``gcp``/``edw`` paths and its options."""
+    base = os.path.dirname(os.path.abspath(path))
+    defaults: Dict[str, Any] = {}
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as fh:
+            entries = [{k.strip(): _parse_value(k.strip(), v) for k, v in row.items() if k and v not in (None, "")}
+                       for row in csv.DictReader(fh)]
+    else:
+        with open(path) as fh:
+            document = json.load(fh)
+        if isinstance(document, dict):
+            defaults = document.get("defaults", {})
+            entries = document.get("pairs", [])
+        else:
+            entries = document
+
+    pairs: List[Dict[str, Any]] = []
+    names = set()
+    for i, entry in enumerate(entries, start=1):
+        pair = {**defaults, **entry}
+        if "gcp" not in pair or "edw" not in pair:
+            raise ValueError(f"Manifest entry {i} needs both 'gcp' and 'edw'")
+        pair["gcp"] = os.path.join(base, pair["gcp"])
+        pair["edw"] = os.path.join(base, pair["edw"])
+        pair.setdefault("name", os.path.splitext(os.path.basename(pair["gcp"].rstrip("/")))[0])
+        unknown = set(pair) - _LOADER_OPTIONS - set(_VALIDATOR_OPTIONS) - {"name", "gcp", "edw"}
+        if unknown:
+            raise ValueError(f"Manifest entry {pair['name']!r} has unknown option(s): {sorted(unknown)}")
+        if pair["name"] in names:
+            raise ValueError(f"Manifest has more than one pair named {pair['name']!r}")
+        names.add(pair["name"])
+        pairs.append(pair)
+    return pairs
+
+
+# ----------------------------------------------------------------------
+# Loading and validating one pair (runs in a pool process)
+# ----------------------------------------------------------------------
+def _disk_mb(path: str) -> float:
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files) / 2 ** 20
+    return os.path.getsize(path) / 2 ** 20
+
+
+def estimate_peak_mb(pair: Dict[str, Any]) -> float:
+    """Rough peak memory of validating ``pair`` in memory, from the size of its extracts."""
+    total = 0.0
+    for side in ("gcp", "edw"):
+        fmt = pair.get("format") or _FORMATS.get(os.path.splitext(pair[side])[1].lower(), "parquet")
+        total += _disk_mb(pair[side]) * _EXPANSION.get(fmt, 2.0)
+    return total * _PEAK_FACTOR
+
+
+def load_pair(pair: Dict[str, Any]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Load a manifest pair, applying its loader options."""
+    return load_table_pair(pair["gcp"], pair["edw"], columns=pair.get("columns"), date_col=pair.get("date_col"),
+                           start=pair.get("start"), end=pair.get("end"), format=pair.get("format"))
+
+
+def _write(frame: pd.DataFrame, path: str, fmt: str) -> None:
+    if fmt == "parquet":
+        frame.to_parquet(path + ".parquet", index=False)
+    else:
+        frame.to_csv(path + ".csv", index=False)
+
+
+def validate_pair(pair: Dict[str, Any], output_dir: str, fmt: str = "csv") -> Dict[str, Any]:
+    """Validate one pair, write its outputs and return its roll‑up row."""
+    started = time.perf_counter()
+    out_dir = os.path.join(output_dir, pair["name"])
+    row: Dict[str, Any] = {"Pair": pair["name"], "Output Dir": out_dir, "Error": ""}
+    try:
+        gcp, edw = load_pair(pair)
+        options = {k: v for k, v in pair.items() if k in _VALIDATOR_OPTIONS}
+        validator = ExtendedMigrationValidator(gcp, edw, **options)
+        outputs = validator.run_all(include_profile=True)
+        os.makedirs(out_dir, exist_ok=True)
+        for name, frame in zip(OUTPUT_NAMES, outputs):
+            _write(frame, os.path.join(out_dir, name), fmt)
+        grand, mismatches, partitions = outputs[1], outputs[3], outputs[5]
+        if validator.output_dir:
+            # Streamed outputs: 4 is a preview and 5 holds the row counts per status
+            counts = outputs[4]
+            n_mismatches = int(counts.loc[counts["Output"] == "4_mismatches", "Rows"].sum())
+        else:
+            n_mismatches = len(mismatches)
+        row.update({
+            "GCP Rows": len(validator.gcp),
+            "EDW Rows": len(validator.edw),
+            # Columns present on one side only (listed in the summary's schema differences)
+            "Schema Differences": len(set(gcp.columns) ^ set(edw.columns)),
+            "Mismatch Rows": n_mismatches,
+            "Grand Total Mismatches": int((grand["Status"] != "Match").sum()),
+            "Partition Mismatches": int((partitions["Status"] != "Match").sum()),
+        })
+        clean = (row["Schema Differences"] == row["Mismatch Rows"] == row["Grand Total Mismatches"]
+                 == row["Partition Mismatches"] == 0)
+        row["Status"] = "Match" if clean else "Mismatch"
+    except Exception as exc:  # one broken pair must not stop the wave
+        row["Status"] = "Error"
+        row["Error"] = f"{type(exc).__name__}: {exc}"
+        traceback.print_exc()
+    row["Wall Seconds"] = round(time.perf_counter() - started, 3)
+    return row
+
+
+# ----------------------------------------------------------------------
+# Scheduling
+# ----------------------------------------------------------------------
+def run_batch(pairs: List[Dict[str, Any]], output_dir: str, workers: int = 1,
+              memory_budget_mb: float = 8192.0, fmt: str = "csv") -> pd.DataFrame:
+    """Validate ``pairs`` within the worker and memory budgets; returns the roll‑up table."""
+    os.makedirs(output_dir, exist_ok=True)
+    pending: List[Tuple[Dict[str, Any], int, float]] = []
+    for pair in pairs:
+        pair = dict(pair)
+        slots = min(max(int(pair.get("n_workers", 1)), 1), workers)
+        pair["n_workers"] = slots
+        try:
+            need = estimate_peak_mb(pair)
+        except Exception:  # unreadable extracts are reported by validate_pair
+            need = 0.0
+        reserve = min(need, memory_budget_mb)
+        if need > memory_budget_mb:
+            pair.setdefault("chunked", True)
+        pair.setdefault("memory_budget_mb", max(reserve, 1.0))
+        pair.setdefault("worker_memory_mb", max(reserve / slots, 1.0))
+        pending.append((pair, slots, reserve))
+
+    rows: List[Dict[str, Any]] = []
+    running: Dict[Future, Tuple[Dict[str, Any], int, float]] = {}
+    used_slots, used_mb = 0, 0.0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            # Start pairs in manifest order while the next one fits the budgets
+            while pending:
+                pair, slots, reserve = pending[0]
+                fits = used_slots + slots <= workers and used_mb + reserve <= memory_budget_mb
+                if running and not fits:
+                    break
+                pending.pop(0)
+                print(f"[Batch] Starting {pair['name']} ({slots} worker(s), {reserve:.0f} MB reserved)")
+                running[pool.submit(validate_pair, pair, output_dir, fmt)] = (pair, slots, reserve)
+                used_slots += slots
+                used_mb += reserve
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                pair, slots, reserve = running.pop(future)
+                used_slots -= slots
+                used_mb -= reserve
+                try:
+                    row = future.result()
+                except Exception as exc:  # e.g. the worker process died
+                    row = {"Pair": pair["name"], "Status": "Error", "Error": f"{type(exc).__name__}: {exc}"}
+                row["Reserved MB"] = round(reserve, 1)
+                print(f"[Batch] {row['Pair']}: {row['Status']}"
+                      + (f" ({row['Error']})" if row.get("Error") else ""))
+                rows.append(row)
+
+    order = {pair["name"]: i for i, pair in enumerate(pairs)}
+    rollup = pd.DataFrame(rows, columns=ROLLUP_COLUMNS)
+    rollup = rollup.sort_values("Pair", key=lambda s: s.map(order)).reset_index(drop=True)
+    rollup.to_csv(os.path.join(output_dir, "rollup.csv"), index=False)
+    return rollup
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1], formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", help="JSON or CSV manifest of table pairs")
+    parser.add_argument("--output-dir", default="validation_results")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes in use at once")
+    parser.add_argument("--memory-budget-mb", type=float, default=8192.0, help="memory shared by the running pairs")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="format of the per-pair outputs")
+    args = parser.parse_args(argv)
+
+    pairs = read_manifest(args.manifest)
+    print(f"[Batch] {len(pairs)} pair(s), {args.workers} worker(s), {args.memory_budget_mb:.0f} MB budget")
+    rollup = run_batch(pairs, args.output_dir, workers=max(args.workers, 1),
+                       memory_budget_mb=args.memory_budget_mb, fmt=args.format)
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(rollup.drop(columns=["Output Dir"]).to_string(index=False))
+    if (rollup["Status"] == "Error").any():
+        return 2
+    return 1 if (rollup["Status"] == "Mismatch").any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+benchmark.py
+~~~~~~~~~~~~
+
+Stage‑by‑stage benchmark of the three validators on synthetic table pairs
+(see :mod:`synthetic_data`).  For every size tier and validator the
+constructor and each ``run_*`` stage are timed (wall and CPU) and, unless
+``--no-memory`` is given, their peak traced allocation is recorded with
+:mod:`tracemalloc`.
+
+Results can be saved as a baseline and later runs compared against it;
+the script exits with status 1 when any stage is slower (or, with memory
+tracing, larger) than the baseline by more than ``--tolerance``, and with
+status 2 when there is no baseline for a tier and validator it ran, so a
+missing baseline never passes as "no regressions":
+
+    python benchmark.py --tiers 1e4 1e5 --update-baseline
+    python benchmark.py --tiers 1e4 1e5            # fails on regression
+
+Tiers up to ``1e8`` are accepted; the largest ones need a machine sized
+for them.  ``code_1.py`` and ``code_2.py`` are KNIME scripts, so they are
+loaded by executing them with small stand‑in input tables, as KNIME would.
+
+The ``sql`` validator is the SQL pushdown backend (:mod:`sql_backend`) run
+on the same tables, written untimed to a temporary SQLite or DuckDB file
+(``--sql-engine``).  ``extended_polars`` and ``code_2_polars`` are the
+same validators on the Polars backend (these need polars installed).
+When the pandas validator a backend stands in for runs too (``extended``
+for ``sql`` and ``extended_polars``, ``code_2`` for ``code_2_polars``),
+each of the backend's stages records whether its result matches the pandas
+backend (``matches_pandas``); a mismatch counts as a regression:
+
+    python benchmark.py --tiers 1e5 1e6 --validators extended sql extended_polars
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from synthetic_data import make_table_pair
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "benchmark_baseline.json")
+
+# Stages of each validator in execution order; "setup" is the constructor
+STAGES: Dict[str, List[str]] = {
+    "code_1": ["run_summary_validation", "run_grand_total_validation", "run_time_series_validation",
+               "run_row_level_validation", "run_full_reconciliation"],
+    "code_2": ["run_summary_validation", "run_grand_total_validation", "run_time_windows_validation",
+               "run_full_reconciliation"],
+    "extended": ["run_summary", "run_grand_totals", "run_time_windows", "run_reconciliation",
+                 "run_partition_checks", "run_distribution_stats"],
+    "sql": ["run_summary", "run_grand_totals", "run_time_windows", "run_reconciliation",
+            "run_partition_checks", "run_distribution_stats"],
+}
+STAGES["extended_polars"] = STAGES["extended"]
+STAGES["code_2_polars"] = STAGES["code_2"]
+
+# Alternative backend -> the pandas validator whose results it must reproduce
+REFERENCE: Dict[str, str] = {"sql": "extended", "extended_polars": "extended", "code_2_polars": "code_2"}
+
+# Stages faster than this (seconds) or smaller than this (MB) are too noisy to flag
+_MIN_WALL_S = 0.05
+_MIN_PEAK_MB = 5.0
+
+
+def load_validators() -> Dict[str, Callable[..., Any]]:
+    """Return a constructor per validator name (``sql`` takes a database and two table names)."""
+    sys.path.insert(0, HERE)
+    from extended_migration_validator import ExtendedMigrationValidator
+    from sql_backend import SqlPushdownValidator
+
+    stand_in, stand_in_edw, _ = make_table_pair(100, seed=1)
+    classes: Dict[str, Callable[..., Any]] = {
+        "extended": ExtendedMigrationValidator,
+        "extended_polars": functools.partial(ExtendedMigrationValidator, backend="polars"),
+        "sql": SqlPushdownValidator.from_database,
+    }
+    for name in ("code_1", "code_2"):
+        namespace = {"input_table_1": stand_in, "input_table_2": stand_in_edw, "__name__": "knime"}
+        with open(os.path.join(HERE, f"{name}.py")) as fh:
+            exec(compile(fh.read(), f"{name}.py", "exec"), namespace)
+        classes[name] = namespace["MigrationValidator"]
+    classes["code_2_polars"] = type("MigrationValidator", (classes["code_2"],), {"BACKEND": "polars"})
+    return classes
+
+
+def _rows_out(result: Any) -> Any:
+    """Row count(s) of a stage result."""
+    if isinstance(result, tuple):
+        return [len(r) for r in result]
+    return len(result) if hasattr(result, "__len__") else None
+
+
+def _measure(fn: Callable[[], Any], memory: bool) -> Tuple[Dict[str, Any], Any]:
+    if memory:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        result, error = fn(), None
+    except Exception as exc:  # a failing stage is reported, not fatal
+        result, error = None, f"{type(exc).__name__}: {exc}"
+    record: Dict[str, Any] = {
+        "wall_s": round(time.perf_counter() - wall, 4),
+        "cpu_s": round(time.process_time() - cpu, 4),
+    }
+    if memory:
+        record["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        tracemalloc.stop()
+    record["rows_out"] = _rows_out(result) if error is None else None
+    if error:
+        record["error"] = error
+    return record, result
+
+
+def _matches(stage: str, result: Any, reference: Any) -> bool:
+    """Whether a backend's stage result equals the pandas backend's (sums to summation order).
+
+    The SQL backend returns row counts per status in place of output 5,
+    so those are checked against the statuses of the annotated GCP table.
+    """
+    try:
+        if isinstance(result, tuple) and stage == "run_reconciliation" and "Output" in result[1].columns:
+            pd.testing.assert_frame_equal(result[0], reference[0], check_exact=False, rtol=1e-9)
+            counts = result[1].loc[result[1]["Output"] == "5_annotated_gcp"].set_index("Status")["Rows"]
+            return counts.to_dict() == reference[1]["validation_status"].value_counts().to_dict()
+        if isinstance(result, tuple):
+            return len(result) == len(reference) and all(_matches(stage, r, ref) for r, ref in zip(result, reference))
+        pd.testing.assert_frame_equal(result, reference, check_exact=False, rtol=1e-9)
+        return True
+    except AssertionError:
+        return False
+
+
+def run_benchmark(tiers: List[int], validators: List[str], memory: bool = True,
+                  generator_options: Optional[Dict[str, Any]] = None,
+                  sql_engine: Optional[str] = None) -> Dict[str, Any]:
+    """Benchmark every validator stage on every tier; returns ``{tier: {validator: {stage: record}}}``."""
+    constructors = load_validators()
+    from sql_backend import _has_duckdb, write_tables
+    sql_engine = sql_engine or ("duckdb" if _has_duckdb else "sqlite")
+    results: Dict[str, Any] = {}
+    for tier in tiers:
+        gcp, edw, injected = make_table_pair(tier, **(generator_options or {}))
+        print(f"[Benchmark] tier {tier:.0e}: GCP {len(gcp)} rows, EDW {len(edw)} rows, injected {injected}")
+        results[str(tier)] = {}
+        reference: Dict[str, Dict[str, Any]] = {}
+        with tempfile.TemporaryDirectory(prefix="benchmark_") as directory:
+            database = os.path.join(directory, f"tables.{sql_engine}")
+            if "sql" in validators:
+                write_tables(database, {"gcp": gcp, "edw": edw}, engine=sql_engine)
+            for name in validators:
+                if name == "sql":
+                    build = lambda: constructors[name](database, "gcp", "edw", engine=sql_engine)
+                else:
+                    build = lambda: constructors[name](gcp, edw)
+                stages: Dict[str, Any] = {}
+                record, validator = _measure(build, memory)
+                stages["setup"] = record
+                for stage in STAGES[name]:
+                    if validator is None:
+                        break
+                    stages[stage], result = _measure(getattr(validator, stage), memory)
+                    if name in REFERENCE.values():
+                        reference.setdefault(name, {})[stage] = result
+                    elif reference.get(REFERENCE.get(name), {}).get(stage) is not None and result is not None:
+                        stages[stage]["matches_pandas"] = _matches(stage, result, reference[REFERENCE[name]][stage])
+                if name == "sql" and validator is not None:
+                    validator.close()
+                results[str(tier)][name] = stages
+    return results
+
+
+def missing_baselines(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """The ``tier/validator`` pairs of ``results`` that ``baseline`` has no entry for."""
+    return [f"{tier}/{name}" for tier, by_validator in results.items()
+            for name in by_validator if name not in baseline.get(tier, {})]
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe every stage that regressed by more than ``tolerance`` relative to ``baseline``."""
+    regressions: List[str] = []
+    for tier, by_validator in results.items():
+        for name, stages in by_validator.items():
+            for stage, record in stages.items():
+                base = baseline.get(tier, {}).get(name, {}).get(stage)
+                if base is None:
+                    continue
+                if "error" in record and "error" not in base:
+                    regressions.append(f"{tier}/{name}/{stage}: now fails ({record['error']})")
+                    continue
+                if record.get("matches_pandas") is False:
+                    regressions.append(f"{tier}/{name}/{stage}: result differs from the pandas backend")
+                for metric, floor in (("wall_s", _MIN_WALL_S), ("peak_mb", _MIN_PEAK_MB)):
+                    if metric in record and metric in base and record[metric] > floor \
+                            and record[metric] > base[metric] * (1 + tolerance):
+                        regressions.append(f"{tier}/{name}/{stage}: {metric} {base[metric]} -> {record[metric]}")
+    return regressions
+
+
+def to_frame(results: Dict[str, Any]) -> pd.DataFrame:
+    """Flatten results into one row per tier, validator and stage."""
+    rows = [{"Tier": tier, "Validator": name, "Stage": stage, **record}
+            for tier, by_validator in results.items()
+            for name, stages in by_validator.items()
+            for stage, record in stages.items()]
+    return pd.DataFrame(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1], formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiers", nargs="+", default=["1e4", "1e5", "1e6"],
+                        help="base row counts, e.g. 1e4 1e5 (up to 1e8)")
+    parser.add_argument("--validators", nargs="+", choices=sorted(STAGES), default=sorted(STAGES))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown/growth")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster, no peak_mb)")
+    parser.add_argument("--output", help="also write results to this CSV file")
+    parser.add_argument("--cardinality", type=int, default=50)
+    parser.add_argument("--measures", type=int, default=3)
+    parser.add_argument("--dup-rate", type=float, default=0.01)
+    parser.add_argument("--mismatch-rate", type=float, default=0.001)
+    parser.add_argument("--one-sided-rate", type=float, default=0.0005)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sql-engine", choices=["sqlite", "duckdb"],
+                        help="engine of the sql validator (default: duckdb when installed, else sqlite)")
+    args = parser.parse_args(argv)
+
+    tiers = [int(float(t)) for t in args.tiers]
+    generator_options = {"cardinality": args.cardinality, "n_measures": args.measures, "dup_rate": args.dup_rate,
+                         "mismatch_rate": args.mismatch_rate, "gcp_only_rate": args.one_sided_rate,
+                         "edw_only_rate": args.one_sided_rate, "seed": args.seed}
+    results = run_benchmark(tiers, args.validators, memory=not args.no_memory, generator_options=generator_options,
+                            sql_engine=args.sql_engine)
+
+    table = to_frame(results)
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(table.to_string(index=False))
+    if args.output:
+        table.to_csv(args.output, index=False)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as fh:
+                baseline = json.load(fh)
+        for tier, by_validator in results.items():
+            baseline.setdefault(tier, {}).update(by_validator)
+        with open(args.baseline, "w") as fh:
+            json.dump(baseline, fh, indent=1)
+        print(f"[Benchmark] Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"[Benchmark] No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 2
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"[Benchmark] REGRESSION {line}")
+    missing = missing_baselines(results, baseline)
+    for line in missing:
+        print(f"[Benchmark] No baseline for {line}; run with --update-baseline to create one")
+    if missing:
+        return 2
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
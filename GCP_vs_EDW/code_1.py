@@ -14,12 +14,89 @@
 #   - output_table_2: Grand Total Comparison (Sum of all measures)
 #   - output_table_3: GroupBy Dimension Comparison (Sum of measures by each dimension)
 #   - output_table_4: Row-Level Mismatches (Detailed value differences on joined data)
+#   - output_table_5: GCP rows annotated with validation_status & mismatch_details
+
+# Set the flow variable "validator_stages" (comma-separated names from
+# MigrationValidator.STAGES, e.g. "summary,mismatches") to compute only the
+# outputs that are connected; the others are returned empty.
+
+# Row keys: __comparison_id__ is a uint64 hash of the dimensions (date at day
+# granularity) and the row's sequence number within its dimension group, as in
+# the other validators. Output 5 adds the readable "<dims>#<seq>" label as
+# __comparison_label__ for the rows of mismatching groups only (READABLE_KEYS).
+
+# Stage profile: setup and every run_* stage print a "[Validator] Stage ..." line
+# with wall/CPU seconds, peak RSS and input/output row counts. The same events go
+# to MigrationValidator.PROFILE_HOOK (a callable taking one dict, if set) and, as
+# a JSON list, to the flow variable "validator_profile". The ports are unchanged.
 # --------------------------------------------------------------------------
 
+import functools
+import json
+import sys
+import time
+
 import pandas as pd
 import numpy as np
-import hashlib
 
+try:
+    import resource  # peak RSS for the stage profile (not available on Windows)
+    _has_resource = True
+except ImportError:
+    _has_resource = False
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process so far in MB (None where unavailable)."""
+    if not _has_resource:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10, 1)
+
+
+def _profiled(stage):
+    """
+    Record one event per call of a validator stage in `self.profile`: wall/CPU seconds,
+    peak RSS, input and output row counts and the error if it raised. The event is
+    printed and passed to PROFILE_HOOK. A stage run inside another is named "outer/inner".
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            stack = self.__dict__.setdefault('_profile_stack', [])
+            name = "/".join(stack + [stage])
+            stack.append(stage)
+            wall, cpu = time.perf_counter(), time.process_time()
+            result, error = None, ""
+            try:
+                result = method(self, *args, **kwargs)
+                return result
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                raise
+            finally:
+                stack.pop()
+                results = result if isinstance(result, tuple) else (result,)
+                event = {
+                    'Stage': name,
+                    'Wall Seconds': round(time.perf_counter() - wall, 4),
+                    'CPU Seconds': round(time.process_time() - cpu, 4),
+                    'Peak RSS MB': _peak_rss_mb(),
+                    'GCP Rows': len(self.gcp_df) if 'gcp_df' in self.__dict__ else None,
+                    'EDW Rows': len(self.edw_df) if 'edw_df' in self.__dict__ else None,
+                    'Output Rows': " / ".join(str(len(r)) for r in results if hasattr(r, '__len__')),
+                    'Error': error,
+                }
+                self.__dict__.setdefault('profile', []).append(event)
+                print(f"[Validator] Stage {name}: {event['Wall Seconds']:.3f}s wall, {event['CPU Seconds']:.3f}s CPU,",
+                      f"peak RSS {event['Peak RSS MB']} MB, rows GCP {event['GCP Rows']} / EDW {event['EDW Rows']}",
+                      f"-> {event['Output Rows'] or '-'}" + (f", failed: {error}" if error else ""))
+                hook = self.__dict__.get('PROFILE_HOOK', type(self).PROFILE_HOOK)
+                if hook is not None:
+                    hook(dict(event))
+        return wrapper
+    return decorate
 
 
 class MigrationValidator:
@@ -27,6 +104,23 @@ class MigrationValidator:
     Performs a staged, performance-optimized validation of a data migration
     from EDW (source) to GCP (target).
     """
+
+    # Equality tolerance (np.isclose defaults) and per-measure overrides {"measure": (atol, rtol)}
+    ATOL = 1e-8
+    RTOL = 1e-5
+    MEASURE_TOLERANCES = {}
+
+    # Render "<dims>#<seq>" labels for the mismatching rows of output 5
+    READABLE_KEYS = True
+
+    # Output name -> output port (1-based), in port order; see run_stages
+    STAGES = {"summary": 1, "grand_totals": 2, "time_series": 3, "mismatches": 4, "annotated_gcp": 5}
+
+    # Called with every stage profile event (a dict, see _profiled); events are also
+    # kept in validator.profile and printed as "[Validator] Stage ..." lines
+    PROFILE_HOOK = None
+
+    @_profiled('setup')
     def __init__(self, gcp_df: pd.DataFrame, edw_df: pd.DataFrame):
         self.gcp_df = gcp_df.copy()
         self.edw_df = edw_df.copy()
@@ -39,8 +133,8 @@ class MigrationValidator:
         # Identify common dimension and measure columns
         self.dimension_cols = sorted(
             list(
-                set(self.gcp_df.select_dtypes(include=['object', 'category']).columns)
-                .intersection(self.edw_df.select_dtypes(include=['object', 'category']).columns)
+                set(self.gcp_df.select_dtypes(include=['object', 'category', 'string']).columns)
+                .intersection(self.edw_df.select_dtypes(include=['object', 'category', 'string']).columns)
             )
         )
         if not self.dimension_cols:
@@ -76,16 +170,23 @@ class MigrationValidator:
             self.date_col_gcp = None
             self.date_col_edw = None
 
-        # Replace references to self.date_col with self.date_col_gcp and self.date_col_edw
-        if self.date_col_gcp:
-            self.gcp_df[self.date_col_gcp] = pd.to_datetime(self.gcp_df[self.date_col_gcp], errors='coerce')
-        if self.date_col_edw:
-            self.edw_df[self.date_col_edw] = pd.to_datetime(self.edw_df[self.date_col_edw], errors='coerce')
+        # Parse the date column on both sides (the stages filter and group on it by name)
+        if self.date_col:
+            self.gcp_df[self.date_col] = pd.to_datetime(self.gcp_df[self.date_col], errors='coerce')
+            self.edw_df[self.date_col] = pd.to_datetime(self.edw_df[self.date_col], errors='coerce')
 
-        # Generate unique row hashes for comparison
+        # Generate unique row hashes for comparison; a second, independently keyed hash
+        # guards against collisions, on which both sides fall back to string keys
         self.id_col = '__comparison_id__'
+        self.label_col = '__comparison_label__'
+        self._string_keys = False
         self.gcp_df[self.id_col] = self._generate_comparison_id(self.gcp_df)
         self.edw_df[self.id_col] = self._generate_comparison_id(self.edw_df)
+        if self._comparison_ids_collide():
+            print("Warning: 64-bit comparison ID collision detected; falling back to string keys")
+            self._string_keys = True
+            self.gcp_df[self.id_col] = self._generate_comparison_id(self.gcp_df)
+            self.edw_df[self.id_col] = self._generate_comparison_id(self.edw_df)
 
         # Ensure no duplicate columns are added during processing
         self.gcp_df = self.gcp_df.loc[:, ~self.gcp_df.columns.duplicated()]
@@ -95,22 +196,97 @@ class MigrationValidator:
         print("Final GCP Columns After Deduplication:", self.gcp_df.columns.tolist())
         print("Final EDW Columns After Deduplication:", self.edw_df.columns.tolist())
 
-        # Ensure the DATE column is not duplicated during merging
-        if self.date_col in self.gcp_df.columns and self.date_col in self.edw_df.columns:
-            self.gcp_df = self.gcp_df.rename(columns={self.date_col: f"{self.date_col}_GCP"})
-            self.edw_df = self.edw_df.rename(columns={self.date_col: f"{self.date_col}_EDW"})
+        # Intermediates shared between stages, computed on first use
+        self._cache = {}
+
+    def _key_columns(self) -> list:
+        """
+        Columns that identify a row's dimension group: the date (if any) and the dimensions.
+        """
+        if self.date_col and self.date_col not in self.dimension_cols:
+            return [self.date_col] + self.dimension_cols
+        return list(self.dimension_cols)
+
+    def _dim_hash(self, df: pd.DataFrame, hash_key: str = "0123456789123456") -> np.ndarray:
+        """
+        Vectorized 64-bit hash of the key columns, with the date normalized to the day.
+        """
+        parts = {}
+        for col in self._key_columns():
+            if col == self.date_col and pd.api.types.is_datetime64_any_dtype(df[col]):
+                parts[col] = df[col].dt.normalize()
+            else:
+                parts[col] = df[col]
+        return pd.util.hash_pandas_object(pd.DataFrame(parts, index=df.index), index=False,
+                                          hash_key=hash_key).to_numpy()
+
+    def _dim_label(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Readable "<dim1>|<dim2>|..." label of each row (date as YYYY-MM-DD).
+        """
+        parts = []
+        for col in self._key_columns():
+            if col == self.date_col and pd.api.types.is_datetime64_any_dtype(df[col]):
+                parts.append(df[col].dt.strftime("%Y-%m-%d").fillna("NaT"))
+            else:
+                parts.append(df[col].astype(str))
+        label = parts[0]
+        for part in parts[1:]:
+            label = label.str.cat(part, sep="|")
+        return label
+
+    def _row_sequence(self, df: pd.DataFrame, dim_hash: np.ndarray) -> np.ndarray:
+        """
+        Deterministic 0..k-1 numbering inside each dimension group, ordered by the measures
+        and then by row position, so duplicate rows pair up the same way on both sides.
+        """
+        order = np.lexsort([df[m].to_numpy(dtype="float64") for m in reversed(self.measure_cols)] + [dim_hash])
+        position = np.arange(len(df))
+        sorted_hash = dim_hash[order]
+        starts = np.r_[True, sorted_hash[1:] != sorted_hash[:-1]] if len(df) else np.zeros(0, dtype=bool)
+        seq = np.empty(len(df), dtype="int64")
+        seq[order] = position - np.maximum.accumulate(np.where(starts, position, 0))
+        return seq
 
     def _generate_comparison_id(self, df: pd.DataFrame) -> pd.Series:
         """
-        Generate a unique hash ID for each row based on dimension columns.
+        Generate the comparison ID of each row: a uint64 hash of its dimension hash and its
+        sequence number within the dimension group (see _row_sequence). With string keys
+        (after a collision) the ID is the "<dims>#<seq>" label itself.
         """
         if not self.dimension_cols:
             raise ValueError("Dimension columns must be identified before generating comparison IDs.")
 
-        dim_data = df[self.dimension_cols].astype(str).apply(lambda x: '|'.join(x), axis=1)
-        row_indices = df.index.astype(str)
-        id_strings = dim_data + '|ROW_' + row_indices
-        return id_strings.apply(lambda x: hashlib.md5(x.encode()).hexdigest())
+        dim_hash = self._dim_hash(df)
+        seq = self._row_sequence(df, dim_hash)
+        if self._string_keys:
+            return self._dim_label(df).str.cat(pd.Series(seq, index=df.index).astype(str), sep="#")
+        return pd.util.hash_pandas_object(pd.DataFrame({'hash': dim_hash, 'seq': seq}, index=df.index), index=False)
+
+    def _comparison_ids_collide(self) -> bool:
+        """
+        True if two different dimension groups share a primary hash (they would differ under
+        the independently keyed check hash) or if a side has duplicate comparison IDs.
+        """
+        pairs = pd.concat([pd.DataFrame({'hash': self._dim_hash(df), 'check': self._dim_hash(df, hash_key="gcp_vs_edw_check")})
+                           for df in (self.gcp_df, self.edw_df)], ignore_index=True).drop_duplicates()
+        return bool(pairs['hash'].duplicated().any()
+                    or self.gcp_df[self.id_col].duplicated().any() or self.edw_df[self.id_col].duplicated().any())
+
+    def _readable_labels(self, df: pd.DataFrame, rows: np.ndarray) -> np.ndarray:
+        """
+        "<dims>#<seq>" labels of the given row positions of df ("" for every other row).
+        """
+        labels = np.full(len(df), "", dtype=object)
+        if len(rows) == 0:
+            return labels
+        if self._string_keys:
+            labels[rows] = df[self.id_col].to_numpy()[rows]
+            return labels
+        seq = self._row_sequence(df, self._dim_hash(df))[rows]
+        subset = df.iloc[rows]
+        labels[rows] = self._dim_label(subset).str.cat(pd.Series(seq, index=subset.index).astype(str), sep="#").to_numpy()
+        return labels
 
     def _analyze_data_type_differences(self) -> pd.DataFrame:
         """
@@ -127,6 +303,7 @@ class MigrationValidator:
 
         return pd.DataFrame(differences)
 
+    @_profiled('run_summary_validation')
     def run_summary_validation(self) -> pd.DataFrame:
         """
         Stage 1: Compares high-level metadata: row counts, column schemas,
@@ -174,6 +351,34 @@ class MigrationValidator:
 
         return summary_df
 
+    def _compare_measures(self, gcp_block, edw_block):
+        """
+        Compares two float blocks whose last axis follows measure_cols in one pass, with
+        per-measure tolerances. Returns the mismatch matrix (NaN equals NaN, as
+        ~np.isclose(..., equal_nan=True)) and the difference matrix gcp - edw.
+        """
+        tolerances = [self.MEASURE_TOLERANCES.get(m, (self.ATOL, self.RTOL)) for m in self.measure_cols]
+        atol = np.array([t[0] for t in tolerances], dtype="float64")
+        rtol = np.array([t[1] for t in tolerances], dtype="float64")
+        gcp_block = np.asarray(gcp_block, dtype="float64")
+        edw_block = np.asarray(edw_block, dtype="float64")
+        with np.errstate(invalid="ignore", over="ignore"):
+            difference = gcp_block - edw_block
+            close = np.abs(difference) <= atol + rtol * np.abs(edw_block)
+        close &= np.isfinite(difference)  # infinities only match the same infinity
+        close |= gcp_block == edw_block
+        close |= np.isnan(gcp_block) & np.isnan(edw_block)
+        return ~close, difference
+
+    def _measure_blocks(self, merged: pd.DataFrame):
+        """
+        The {measure}_GCP and {measure}_EDW columns of a merged frame as two float blocks.
+        """
+        gcp_block = merged[[f'{measure}_GCP' for measure in self.measure_cols]].to_numpy(dtype="float64")
+        edw_block = merged[[f'{measure}_EDW' for measure in self.measure_cols]].to_numpy(dtype="float64")
+        return gcp_block, edw_block
+
+    @_profiled('run_grand_total_validation')
     def run_grand_total_validation(self) -> pd.DataFrame:
         """
         Stage 2: Compares the grand sum of all common numeric columns (measures)
@@ -186,11 +391,13 @@ class MigrationValidator:
         edw_totals = self.edw_df[self.measure_cols].sum().rename('EDW_Sum')
 
         report = pd.concat([gcp_totals, edw_totals], axis=1)
+        mismatch, _ = self._compare_measures(gcp_totals.to_numpy(), edw_totals.to_numpy())
         report['Difference'] = report['GCP_Sum'] - report['EDW_Sum']
-        report['Status'] = np.where(np.isclose(report['GCP_Sum'], report['EDW_Sum']), 'Match', 'Mismatch')
+        report['Status'] = np.where(mismatch, 'Mismatch', 'Match')
 
         return report.reset_index().rename(columns={'index': 'Measure'})
 
+    @_profiled('run_time_series_validation')
     def run_time_series_validation(self) -> pd.DataFrame:
         """
         Stage 3: Performs time-series validation by comparing aggregated measures
@@ -217,24 +424,25 @@ class MigrationValidator:
             'YTD': (ytd_start, daily)
         }
 
-        results = []
-        for measure in self.measure_cols:
-            row = {'Measure': measure}
-            for period, (start, end) in time_ranges.items():
-                gcp_filtered = self.gcp_df[(self.gcp_df[self.date_col] >= start) & (self.gcp_df[self.date_col] <= end)]
-                edw_filtered = self.edw_df[(self.edw_df[self.date_col] >= start) & (self.edw_df[self.date_col] <= end)]
-
-                gcp_sum = gcp_filtered[measure].sum()
-                edw_sum = edw_filtered[measure].sum()
-                difference = gcp_sum - edw_sum
-                status = 'Match' if np.isclose(gcp_sum, edw_sum) else 'Variance'
+        # Filter each side once per period rather than once per period and measure
+        filtered = {
+            period: (self.gcp_df.loc[(self.gcp_df[self.date_col] >= start) & (self.gcp_df[self.date_col] <= end), self.measure_cols],
+                     self.edw_df.loc[(self.edw_df[self.date_col] >= start) & (self.edw_df[self.date_col] <= end), self.measure_cols])
+            for period, (start, end) in time_ranges.items()
+        }
 
-                row[f'{period}_Status'] = status
-                row[f'{period}_Difference'] = difference
-                row[f'{period}_GCP_Sum'] = gcp_sum
-                row[f'{period}_EDW_Sum'] = edw_sum
+        # Per-period sums of every measure, compared as one (periods x measures) block
+        gcp_sums = {period: gcp_filtered.sum() for period, (gcp_filtered, _) in filtered.items()}
+        edw_sums = {period: edw_filtered.sum() for period, (_, edw_filtered) in filtered.items()}
+        mismatch, _ = self._compare_measures(np.vstack([gcp_sums[p].to_numpy(dtype="float64") for p in filtered]),
+                                             np.vstack([edw_sums[p].to_numpy(dtype="float64") for p in filtered]))
 
-            results.append(row)
+        results = {'Measure': list(self.measure_cols)}
+        for i, period in enumerate(filtered):
+            results[f'{period}_Status'] = np.where(mismatch[i], 'Variance', 'Match')
+            results[f'{period}_Difference'] = (gcp_sums[period] - edw_sums[period]).to_numpy()
+            results[f'{period}_GCP_Sum'] = gcp_sums[period].to_numpy()
+            results[f'{period}_EDW_Sum'] = edw_sums[period].to_numpy()
 
         return pd.DataFrame(results)
 
@@ -243,9 +451,10 @@ class MigrationValidator:
         Create detailed mismatch DataFrame with comprehensive status by comparison_id.
         """
         mismatches = []
-        for measure in self.measure_cols:
+        mismatch, _ = self._compare_measures(*self._measure_blocks(merged))
+        for j, measure in enumerate(self.measure_cols):
             gcp_col, edw_col = f'{measure}_GCP', f'{measure}_EDW'
-            mismatch_mask = ~np.isclose(merged[gcp_col], merged[edw_col], equal_nan=True)
+            mismatch_mask = mismatch[:, j]
 
             if mismatch_mask.any():
                 mismatched_rows = merged.loc[mismatch_mask, self.dimension_cols + [gcp_col, edw_col]].copy()
@@ -257,51 +466,91 @@ class MigrationValidator:
 
         return pd.concat(mismatches, ignore_index=True)
 
-    def run_row_level_validation(self) -> pd.DataFrame:
+    def _build_mismatch_description(self, merged: pd.DataFrame, mismatch: np.ndarray,
+                                    differences: np.ndarray) -> pd.Series:
         """
-        Stage 4: Performs a row-level comparison by matching unique dimensions
-        for each date, comparing the sum of each measure, and creating flags
-        and descriptive columns for mismatches.
+        Build "measure: difference, ..." for each row, listing the measures whose
+        status is 'Mismatch'. Works column-wise over the (rows x measures) mismatch and
+        difference matrices and only touches rows that are not 'All Measures Match'.
         """
-        if not self.date_col:
-            return pd.DataFrame({'Message': ['No common date column found for row-level validation.']})
+        description = np.full(len(merged), "", dtype=object)
+        rows = np.flatnonzero((merged['Row_Status'] != 'All Measures Match').to_numpy())
+        if len(rows) == 0 or not self.measure_cols:
+            return pd.Series(description, index=merged.index, dtype="object")
+
+        mismatch_mask = mismatch[rows]
+        differences = differences[rows]
+
+        text = np.full(len(rows), "", dtype=object)
+        for j, measure in enumerate(self.measure_cols):
+            hit = np.flatnonzero(mismatch_mask[:, j])
+            if len(hit) == 0:
+                continue
+            part = f"{measure}: " + differences[hit, j].astype(str).astype(object)
+            previous = text[hit]
+            text[hit] = np.where(previous == "", part, previous + ", " + part)
+        description[rows] = text
+        return pd.Series(description, index=merged.index, dtype="object")
+
+    def _grouped(self, side: str) -> pd.DataFrame:
+        """
+        Measure sums per dimension/date group of one side ('gcp' or 'edw'), memoized.
+        """
+        if ('grouped', side) not in self._cache:
+            df = self.gcp_df if side == 'gcp' else self.edw_df
+            self._cache[('grouped', side)] = df.groupby(self.dimension_cols + [self.date_col])[self.measure_cols].sum().reset_index()
+        return self._cache[('grouped', side)]
 
-        # Group by dimensions and date, then aggregate measures
-        gcp_grouped = self.gcp_df.groupby(self.dimension_cols + [self.date_col])[self.measure_cols].sum().reset_index()
-        edw_grouped = self.edw_df.groupby(self.dimension_cols + [self.date_col])[self.measure_cols].sum().reset_index()
+    def _compared_groups(self) -> pd.DataFrame:
+        """
+        Outer merge of both sides' groups with per-measure Difference/Status, Row_Status
+        and Mismatch_Description, memoized. Shared by stages 4 and 5; callers copy it
+        before modifying it.
+        """
+        if 'compared' in self._cache:
+            return self._cache['compared']
 
         # Perform an outer join to include all rows from both datasets
-        merged = pd.merge(gcp_grouped, edw_grouped, on=self.dimension_cols + [self.date_col], how='outer', suffixes=('_GCP', '_EDW'))
-
-        # Initialize a list to store mismatch details
-        mismatch_details = []
-
-        for measure in self.measure_cols:
-            gcp_col, edw_col = f'{measure}_GCP', f'{measure}_EDW'
+        merged = pd.merge(
+            self._grouped('gcp'), self._grouped('edw'),
+            on=self.dimension_cols + [self.date_col],
+            how='outer',
+            suffixes=('_GCP', '_EDW')
+        )
 
-            # Calculate differences and create flags
-            merged[f'{measure}_Difference'] = merged[gcp_col] - merged[edw_col]
-            merged[f'{measure}_Status'] = np.where(
-                np.isclose(merged[gcp_col], merged[edw_col], equal_nan=True),
-                'Match',
-                'Mismatch'
-            )
+        # Calculate differences and create flags for all measures in one comparison
+        mismatch, differences = self._compare_measures(*self._measure_blocks(merged))
+        flags = {}
+        for j, measure in enumerate(self.measure_cols):
+            difference = differences[:, j]
+            if all(pd.api.types.is_integer_dtype(merged[f'{measure}{side}']) for side in ('_GCP', '_EDW')):
+                difference = difference.astype('int64')
+            flags[f'{measure}_Difference'] = difference
+            flags[f'{measure}_Status'] = np.where(mismatch[:, j], 'Mismatch', 'Match')
+        merged = pd.concat([merged, pd.DataFrame(flags, index=merged.index)], axis=1)
 
         # Add descriptive columns
         merged['Row_Status'] = np.where(
-            merged[[f'{measure}_Status' for measure in self.measure_cols]].eq('Match').all(axis=1),
-            'All Measures Match',
-            'Some Measures Mismatch'
+            mismatch.any(axis=1),
+            'Some Measures Mismatch',
+            'All Measures Match'
         )
 
-        merged['Mismatch_Description'] = merged.apply(
-            lambda row: ', '.join([
-                f"{measure}: {row[f'{measure}_Difference']}"
-                for measure in self.measure_cols
-                if row[f'{measure}_Status'] == 'Mismatch'
-            ]),
-            axis=1
-        )
+        merged['Mismatch_Description'] = self._build_mismatch_description(merged, mismatch, differences)
+        self._cache['compared'] = merged
+        return merged
+
+    @_profiled('run_row_level_validation')
+    def run_row_level_validation(self) -> pd.DataFrame:
+        """
+        Stage 4: Performs a row-level comparison by matching unique dimensions
+        for each date, comparing the sum of each measure, and creating flags
+        and descriptive columns for mismatches.
+        """
+        if not self.date_col:
+            return pd.DataFrame({'Message': ['No common date column found for row-level validation.']})
+
+        merged = self._compared_groups().copy()
 
         # Ensure consistent data types in dimension columns
         for col in self.dimension_cols + [self.date_col]:
@@ -309,6 +558,7 @@ class MigrationValidator:
 
         return merged
 
+    @_profiled('run_full_reconciliation')
     def run_full_reconciliation(self) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
         Stage 4 & 5: Performs a full reconciliation by matching unique dimensions
@@ -323,66 +573,72 @@ class MigrationValidator:
                 , self.gcp_df.assign(validation_status='No Date Column', mismatch_details='')
             )
 
-        # Group by dimensions and date, then aggregate measures
-        gcp_grouped = self.gcp_df.groupby(self.dimension_cols + [self.date_col])[self.measure_cols].sum().reset_index()
-        edw_grouped = self.edw_df.groupby(self.dimension_cols + [self.date_col])[self.measure_cols].sum().reset_index()
+        merged = self._compared_groups().copy()
 
-        # Perform an outer join to include all rows from both datasets
-        merged = pd.merge(
-            gcp_grouped, edw_grouped,
-            on=self.dimension_cols + [self.date_col],
-            how='outer',
-            suffixes=('_GCP', '_EDW')
-        )
-
-        # Initialize a list to store mismatch details
-        mismatches = []
-
-        for measure in self.measure_cols:
-            gcp_col, edw_col = f'{measure}_GCP', f'{measure}_EDW'
-
-            # Calculate differences and create flags
-            merged[f'{measure}_Difference'] = merged[gcp_col] - merged[edw_col]
-            merged[f'{measure}_Status'] = np.where(
-                np.isclose(merged[gcp_col], merged[edw_col], equal_nan=True),
-                'Match',
-                'Mismatch'
-            )
-
-        # Add descriptive columns
-        merged['Row_Status'] = np.where(
-            merged[[f'{measure}_Status' for measure in self.measure_cols]].eq('Match').all(axis=1),
-            'All Measures Match',
-            'Some Measures Mismatch'
-        )
-
-        merged['Mismatch_Description'] = merged.apply(
-            lambda row: ', '.join([
-                f"{measure}: {row[f'{measure}_Difference']}"
-                for measure in self.measure_cols
-                if row[f'{measure}_Status'] == 'Mismatch'
-            ]),
-            axis=1
-        )
+        # Status per dimension/date group, keyed before the keys are cast to strings
+        group_keys = self.dimension_cols + [self.date_col]
+        group_status = merged[group_keys + ['Row_Status', 'Mismatch_Description']]
 
         # Ensure consistent data types in dimension columns
-        for col in self.dimension_cols + [self.date_col]:
+        for col in group_keys:
             merged[col] = merged[col].astype(str)
 
         # Create the mismatch report (output_table_4)
         mismatch_report = merged[merged['Row_Status'] != 'All Measures Match']
 
-        # Create the GCP table with appended validation status (output_table_5)
+        # Create the GCP table with appended validation status (output_table_5);
+        # the report is aggregated, so each GCP row takes the status of its group
         gcp_with_status = self.gcp_df.copy()
         gcp_with_status = pd.merge(
             gcp_with_status,
-            merged[[self.id_col, 'Row_Status', 'Mismatch_Description']],
-            on=self.id_col,
+            group_status,
+            on=group_keys,
             how='left'
         ).rename(columns={'Row_Status': 'validation_status', 'Mismatch_Description': 'mismatch_details'})
 
+        if self.READABLE_KEYS:
+            # The left merge keeps the GCP row order, so labels are rendered by position
+            flagged = np.flatnonzero((gcp_with_status['validation_status'] == 'Some Measures Mismatch').to_numpy())
+            gcp_with_status.insert(gcp_with_status.columns.get_loc(self.id_col) + 1, self.label_col,
+                                   self._readable_labels(self.gcp_df, flagged))
+
         return mismatch_report, gcp_with_status
 
+    def run_stages(self, stages) -> dict:
+        """
+        Compute only the named outputs (keys of STAGES, plus 'row_level') and return
+        {name: DataFrame}. Outputs 4 and 5 come from one reconciliation, which runs only
+        if either is asked for; row-level validation reuses the same merged groups.
+        """
+        stages = list(stages)
+        bad = [s for s in stages if s not in self.STAGES and s != 'row_level']
+        if bad:
+            raise ValueError(f"Unknown stage(s) {bad}; choose from {list(self.STAGES) + ['row_level']}")
+        out = {}
+        if 'summary' in stages:
+            print("Stage 1: Running high-level summary validation...")
+            out['summary'] = self.run_summary_validation()
+        if 'grand_totals' in stages:
+            print("Stage 2: Running grand total validation...")
+            out['grand_totals'] = self.run_grand_total_validation()
+        if 'time_series' in stages:
+            print("Stage 3: Running time-series validation...")
+            out['time_series'] = self.run_time_series_validation()
+        if 'mismatches' in stages or 'annotated_gcp' in stages:
+            print("Stage 4 & 5: Running full reconciliation...")
+            out['mismatches'], out['annotated_gcp'] = self.run_full_reconciliation()
+        if 'row_level' in stages:
+            print("Running row-level validation...")
+            out['row_level'] = self.run_row_level_validation()
+        return {s: out[s] for s in stages}
+
+    def run_all(self, stages=None) -> tuple:
+        """
+        The five outputs in port order; with `stages`, outputs not named there are empty DataFrames.
+        """
+        out = self.run_stages(self.STAGES if stages is None else stages)
+        return tuple(out.get(name, pd.DataFrame()) for name in self.STAGES)
+
 # ==============================================================================
 # KNIME EXECUTION LOGIC
 # ==============================================================================
@@ -395,18 +651,14 @@ try:
     # Initialize the validator with KNIME inputs
     validator = MigrationValidator(input_table_1, input_table_2) # type: ignore
 
-    # --- Execute Each Validation Stage ---
-    print("Stage 1: Running high-level summary validation...")
-    output_table_1 = validator.run_summary_validation()
-
-    print("Stage 2: Running grand total validation...")
-    output_table_2 = validator.run_grand_total_validation()
-
-    print("Stage 3: Running time-series validation...")
-    output_table_3 = validator.run_time_series_validation()
+    # --- Execute the requested validation stages (all when the flow variable is unset) ---
+    requested = globals().get('flow_variables', {}).get('validator_stages')
+    stages = [s.strip() for s in requested.split(',') if s.strip()] if requested else None
+    output_table_1, output_table_2, output_table_3, output_table_4, output_table_5 = validator.run_all(stages)
 
-    print("Stage 4 & 5: Running full reconciliation...")
-    output_table_4, output_table_5 = validator.run_full_reconciliation()
+    # Per-stage profile for downstream nodes (the same events were printed above)
+    if 'flow_variables' in globals():
+        flow_variables['validator_profile'] = json.dumps(validator.profile)
 
     print("\nValidation complete. All output tables have been generated.")
 
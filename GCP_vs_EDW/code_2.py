@@ -8,14 +8,187 @@
 #   output_table_3 -> Time Windows + Monthly Breakdown (tidy format)
 #   output_table_4 -> Full Reconciliation (mismatch-only) with mismatch_type
 #   output_table_5 -> GCP table with appended validation_status & mismatch_details
-
+# Disconnected ports:
+#   Set the flow variable "validator_stages" (comma-separated names from
+#   MigrationValidator.STAGES, e.g. "summary,grand_totals") to compute only those
+#   outputs; the others are returned empty. Row keys are only built when output 4 or 5
+#   is requested.
+# Business keys:
+#   Set MigrationValidator.KEY_COLS = ["order_id", ...] when those columns identify rows
+#   uniquely on both sides: no duplicate sequencing, and outputs 4 & 5 use an
+#   integer-coded sort-merge join (inputs already sorted by the key skip the sort).
+# Large tables:
+#   Set MigrationValidator.CHUNKED = True (and MEMORY_BUDGET_MB / SPILL_DIR) to run
+#   outputs 4 & 5 out-of-core over hash-partitioned on-disk buckets.
+# Large outputs:
+#   Set MigrationValidator.OUTPUT_DIR (or the flow variable "validator_output_dir") to write
+#   outputs 4 & 5 chunk by chunk to 4_mismatches / 5_annotated_gcp files there (Parquet, or
+#   Arrow IPC with OUTPUT_FORMAT = "ipc"; needs pyarrow). Ports 4 & 5 then carry the top
+#   PREVIEW_ROWS mismatches by absolute difference and the row counts per status.
+# Polars backend:
+#   Set MigrationValidator.BACKEND = "polars" (needs polars) to run the key hashing, duplicate
+#   sequencing and collision check, the daily/monthly sums behind output 3 and the outer join
+#   of outputs 4 & 5 on multithreaded Polars lazy frames (or set the flow variable
+#   "validator_backend"). Inputs and outputs stay pandas; results match the pandas backend,
+#   comparison IDs included.
+# Stage profile:
+#   Setup and every run_* stage print a "[Validator] Stage ..." line with wall/CPU seconds,
+#   peak RSS and input/output row counts. The same events go to MigrationValidator.PROFILE_HOOK
+#   (a callable taking one dict, if set) and, as a JSON list, to the flow variable
+#   "validator_profile". The output ports are unchanged.
+
+import functools
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
 import pandas as pd
 import numpy as np
 import warnings
 
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    _has_pyarrow = True
+except ImportError:
+    _has_pyarrow = False
+
+try:
+    import polars as pl
+    _has_polars = True
+except ImportError:
+    _has_polars = False
+
+try:
+    import resource  # peak RSS for the stage profile (not available on Windows)
+    _has_resource = True
+except ImportError:
+    _has_resource = False
+
 # Quiet down chained-assignment warnings; we use .copy()/.loc deliberately
 warnings.simplefilter("ignore", category=pd.errors.SettingWithCopyWarning)
 
+class _ChunkWriter:
+    """
+    Appends DataFrame chunks to one Parquet or Arrow IPC file. The schema comes from the first
+    chunk (all-null columns typed as strings) and later chunks are converted to it.
+    """
+    SUFFIXES = {"parquet": ".parquet", "ipc": ".arrow"}
+
+    def __init__(self, path, fmt):
+        if not _has_pyarrow:
+            raise ImportError("OUTPUT_DIR requires pyarrow (pip install pyarrow)")
+        self.path, self.fmt, self.rows = path, fmt, 0
+        self._schema = self._writer = None
+
+    def write(self, frame):
+        if self._schema is None:
+            schema = pa.Schema.from_pandas(frame, preserve_index=False)
+            self._schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in schema])
+            self._writer = (pq.ParquetWriter(self.path, self._schema) if self.fmt == "parquet"
+                            else pa.ipc.new_file(self.path, self._schema))
+        self._writer.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+        self.rows += len(frame)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _pl_mix(e):
+    """The splitmix64 finaliser pandas' hash_array applies to 64-bit values, on a Polars UInt64 expression."""
+    e = e ^ (e // (1 << 30))
+    e = e * pl.lit(0xBF58476D1CE4E5B9, dtype=pl.UInt64)
+    e = e ^ (e // (1 << 27))
+    e = e * pl.lit(0x94D049BB133111EB, dtype=pl.UInt64)
+    return e ^ (e // (1 << 31))
+
+
+def _pl_combine(exprs):
+    """Combine column hashes into row hashes the way pd.util.hash_pandas_object does."""
+    out, mult = pl.lit(0x345678, dtype=pl.UInt64), 1000003
+    for i, e in enumerate(exprs):
+        out = (out ^ e) * pl.lit(mult, dtype=pl.UInt64)
+        mult += 82520 + 2 * (len(exprs) - i)
+    return out + pl.lit(97531, dtype=pl.UInt64)
+
+
+def _pl_column_hash(name, values, hash_key):
+    """
+    (Polars input, hash expression) for one column. Numbers, booleans and datetimes go in as
+    their bits and are mixed in Polars; categoricals hash their categories in pandas and look
+    up the codes in Polars (code -1 wraps round to the null hash appended last); anything else
+    is hashed by pandas.
+    """
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        table = pd.util.hash_array(np.asarray(dtype.categories), hash_key=hash_key, categorize=False)
+        table = pl.Series(np.append(table, np.uint64(np.iinfo("uint64").max)))
+        return values.cat.codes.to_numpy(), pl.lit(table).gather(pl.col(name))
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufmM" and dtype.itemsize <= 8:
+        arr = values.to_numpy()
+        if dtype.kind != "b":
+            arr = arr.view(f"u{dtype.itemsize}")
+        return arr.astype("uint64", copy=False), _pl_mix(pl.col(name))
+    return pd.util.hash_array(values.to_numpy(), hash_key=hash_key), pl.col(name)
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process so far in MB (None where unavailable)."""
+    if not _has_resource:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10, 1)
+
+
+def _profiled(stage):
+    """
+    Record one event per call of a validator stage in `self.profile`: wall/CPU seconds, peak RSS,
+    input and output row counts and the error if it raised. The event is printed and passed to
+    PROFILE_HOOK. A stage run inside another is named "outer/inner".
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            stack = self.__dict__.setdefault("_profile_stack", [])
+            name = "/".join(stack + [stage])
+            stack.append(stage)
+            wall, cpu = time.perf_counter(), time.process_time()
+            result, error = None, ""
+            try:
+                result = method(self, *args, **kwargs)
+                return result
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                raise
+            finally:
+                stack.pop()
+                results = result if isinstance(result, tuple) else (result,)
+                event = {
+                    "Stage": name,
+                    "Wall Seconds": round(time.perf_counter() - wall, 4),
+                    "CPU Seconds": round(time.process_time() - cpu, 4),
+                    "Peak RSS MB": _peak_rss_mb(),
+                    "GCP Rows": len(self.gcp) if "gcp" in self.__dict__ else None,
+                    "EDW Rows": len(self.edw) if "edw" in self.__dict__ else None,
+                    "Output Rows": " / ".join(str(len(r)) for r in results if hasattr(r, "__len__")),
+                    "Error": error,
+                }
+                self.__dict__.setdefault("profile", []).append(event)
+                print(f"[Validator] Stage {name}: {event['Wall Seconds']:.3f}s wall, {event['CPU Seconds']:.3f}s CPU,",
+                      f"peak RSS {event['Peak RSS MB']} MB, rows GCP {event['GCP Rows']} / EDW {event['EDW Rows']}",
+                      f"-> {event['Output Rows'] or '-'}" + (f", failed: {error}" if error else ""))
+                hook = self.__dict__.get("PROFILE_HOOK", type(self).PROFILE_HOOK)
+                if hook is not None:
+                    hook(dict(event))
+        return wrapper
+    return decorate
+
+
 class MigrationValidator:
     """
     Plug-and-play migration validator for KNIME.
@@ -29,8 +202,52 @@ class MigrationValidator:
     # Tunable numeric tolerance (abs + relative) for equality checks
     ATOL = 1e-9
     RTOL = 1e-9
-
+    # Per-measure overrides: {"measure": (atol, rtol)}; all measures are compared at once
+    MEASURE_TOLERANCES = {}
+
+    # Tunable out-of-core reconciliation: when CHUNKED is True, stages 4 & 5 join
+    # hash buckets spilled to SPILL_DIR (temp dir if None) one at a time, with the
+    # bucket count chosen so each join fits in MEMORY_BUDGET_MB.
+    CHUNKED = False
+    MEMORY_BUDGET_MB = 1024
+    SPILL_DIR = None
+    MERGE_MEMORY_FACTOR = 4.0   # join peak memory relative to its two inputs
+
+    # Streamed outputs 4 & 5: when OUTPUT_DIR is set they are written there chunk by chunk
+    # (OUTPUT_FORMAT "parquet" or "ipc") and ports 4 & 5 get a preview and counts instead
+    OUTPUT_DIR = None
+    OUTPUT_FORMAT = "parquet"
+    PREVIEW_ROWS = 1000
+    WRITE_CHUNK_ROWS = 1_000_000
+
+    # Declared business key (list of column names). Must be unique per side; key columns are
+    # never measures. None = no natural key: match rows on "<dims>#<seq>".
+    KEY_COLS = None
+
+    # Output 4 keeps the uint64 __comparison_id__ (same key as output 5) and adds readable
+    # "<dims>#<seq>" labels as __comparison_label__ (rendered for mismatch rows only)
+    READABLE_KEYS = True
+
+    # "pandas" or "polars": engine for the collision check, time-window sums and the outer join
+    BACKEND = "pandas"
+
+    # Date-name candidates are test-parsed on this many values before a full conversion
+    ROLE_SAMPLE_ROWS = 10_000
+
+    # Called with every stage profile event (a dict, see _profiled); events are also kept in
+    # validator.profile and printed as "[Validator] Stage ..." lines
+    PROFILE_HOOK = None
+    _GCP_ROW_COL = "__gcp_row__"
+
+    # Output name -> output port (1-based), in port order; see run_stages
+    STAGES = {"summary": 1, "grand_totals": 2, "time_windows": 3, "mismatches": 4, "annotated_gcp": 5}
+
+    @_profiled("setup")
     def __init__(self, gcp_df: pd.DataFrame, edw_df: pd.DataFrame):
+        if self.BACKEND not in ("pandas", "polars"):
+            raise ValueError(f"BACKEND must be 'pandas' or 'polars', got {self.BACKEND!r}")
+        if self.BACKEND == "polars" and not _has_polars:
+            raise ImportError('BACKEND = "polars" requires polars (pip install polars)')
         self.gcp = gcp_df.copy()
         self.edw = edw_df.copy()
 
@@ -40,9 +257,25 @@ class MigrationValidator:
 
         self._remove_duplicate_named_columns()
         self._normalize_dtypes_and_strings()
+        self.key_cols = list(self.KEY_COLS) if self.KEY_COLS else []
+        missing = [c for c in self.key_cols if c not in self.gcp.columns or c not in self.edw.columns]
+        if missing:
+            raise ValueError(f"KEY_COLS {missing} are not present in both tables")
         self._discover_roles()       # sets self.date_col, self.measure_cols, self.dimension_cols
+        unknown = [m for m in self.MEASURE_TOLERANCES if m not in self.measure_cols]
+        if unknown:
+            raise ValueError(f"MEASURE_TOLERANCES names {unknown}, which are not measures")
         self._coerce_types()         # makes measures numeric, dims object (date stays datetime)
-        self._build_comparison_ids() # creates self.key_col="__comparison_id__"
+        if self.key_cols:
+            self._build_key_codes()  # validates KEY_COLS up front (raises on duplicate keys)
+        # __comparison_id__ is built on first use by the reconciliation (_ensure_comparison_ids),
+        # so runs that skip outputs 4 and 5 never hash or sequence rows
+        self.key_col = "__comparison_id__"
+        self._string_keys = False
+        self._keys_built = False
+
+        # Intermediates shared between stages, computed on first use
+        self._cache = {}
 
         # Helpful runtime log (visible in KNIME console)
         print("[Validator] Date column:", self.date_col)
@@ -65,6 +298,9 @@ class MigrationValidator:
             # Strip whitespace in object columns
             for c in df.select_dtypes(include="object").columns:
                 df[c] = df[c].where(df[c].isna(), df[c].astype(str).str.strip())
+            # Arrow-backed strings (columnar_loader) keep their dtype
+            for c in df.select_dtypes(include="string").columns:
+                df[c] = df[c].str.strip()
 
     def _discover_roles(self):
         def pick_date_col(df: pd.DataFrame):
@@ -79,6 +315,10 @@ class MigrationValidator:
                          if any(k in c.lower() for k in ["date", "as_of", "asof", "dt", "day", "period"])]
             for c in name_hits:
                 try:
+                    # Reject cheaply on a strided sample of <= ROLE_SAMPLE_ROWS values first
+                    vals = df[c].dropna()
+                    sample = vals.iloc[::max(1, len(vals) // self.ROLE_SAMPLE_ROWS)].iloc[:self.ROLE_SAMPLE_ROWS]
+                    pd.to_datetime(sample, errors="raise", infer_datetime_format=True, utc=False)
                     parsed = pd.to_datetime(df[c], errors="raise", infer_datetime_format=True, utc=False)
                     df[c] = parsed
                     return c
@@ -114,7 +354,7 @@ class MigrationValidator:
 
         gcp_meas = set(numeric_cols(self.gcp))
         edw_meas = set(numeric_cols(self.edw))
-        self.measure_cols = sorted(list(gcp_meas.intersection(edw_meas)))
+        self.measure_cols = sorted(list(gcp_meas.intersection(edw_meas) - set(self.key_cols)))
 
         # Dimensions = shared columns minus measures; include date (if shared)
         shared = sorted(list(set(self.gcp.columns).intersection(set(self.edw.columns))))
@@ -139,61 +379,284 @@ class MigrationValidator:
         for df in (self.gcp, self.edw):
             for c in self.measure_cols:
                 df[c] = pd.to_numeric(df[c], errors="coerce").astype("float64")
-        # Dims: object (except date)
+        # Dims: object (except date and numeric key columns)
         for df in (self.gcp, self.edw):
             for c in self.dimension_cols:
                 if c == self.date_col:
                     continue
-                if c in df.columns:
+                if c in self.key_cols and pd.api.types.is_numeric_dtype(df[c]):
+                    continue
+                if c in df.columns and isinstance(df[c].dtype, pd.StringDtype):
+                    # Arrow-backed strings use pd.NA; convert to NaN like object columns
+                    df[c] = df[c].astype("object").where(df[c].notna(), np.nan)
+                elif c in df.columns:
                     df[c] = df[c].astype("object")
 
-    def _build_comparison_ids(self):
+    def _dim_label(self, df):
+        """Readable "<dim1>|<dim2>|..." label per row (date at day granularity); KEY_COLS if set."""
+        parts = []
+        for c in self.key_cols or self.dimension_cols:
+            if c == self.date_col and pd.api.types.is_datetime64_any_dtype(df[c]):
+                parts.append(df[c].dt.strftime("%Y-%m-%d").fillna("NaT"))
+            else:
+                parts.append(df[c].astype(str).fillna("NaN"))
+        key = parts[0]
+        for p in parts[1:]:
+            key = key.str.cat(p, sep="|")
+        return key
+
+    def _dim_hash(self, df, hash_key="0123456789123456"):
+        """Vectorized 64-bit hash of the dimension values (date normalized to the day); KEY_COLS if set."""
+        if self.BACKEND == "polars":
+            return self._polars_dim_hash(df, hash_key)
+        parts = {}
+        for c in self.key_cols or self.dimension_cols:
+            if c == self.date_col and pd.api.types.is_datetime64_any_dtype(df[c]):
+                parts[c] = df[c].dt.normalize()
+            else:
+                parts[c] = df[c]
+        return pd.util.hash_pandas_object(pd.DataFrame(parts, index=df.index), index=False, hash_key=hash_key)
+
+    def _polars_dim_hash(self, df, hash_key):
+        """_dim_hash on Polars, bit for bit (the IDs reach output 5, so the hash must not change)."""
+        columns, exprs = {}, []
+        for i, c in enumerate(self.key_cols or self.dimension_cols):
+            name, values = f"c{i}", df[c]
+            if c == self.date_col and isinstance(values.dtype, np.dtype) and values.dtype.kind == "M":
+                # Floor to the day in the column's own unit; NaT stays NaT
+                day = int(np.timedelta64(1, "D") // np.timedelta64(1, np.datetime_data(values.dtype)[0]))
+                columns[name] = values.to_numpy().view("int64")
+                col = pl.col(name)
+                nat = np.iinfo("int64").min
+                exprs.append(_pl_mix(pl.when(col == nat).then(col).otherwise(col // day * day).reinterpret(signed=False)))
+                continue
+            if c == self.date_col and pd.api.types.is_datetime64_any_dtype(values):
+                values = values.dt.normalize()
+            columns[name], expr = _pl_column_hash(name, values, hash_key)
+            exprs.append(expr)
+        hashed = pl.LazyFrame(columns).select(_pl_combine(exprs)).collect().to_series()
+        return pd.Series(hashed.to_numpy(), index=df.index)
+
+    def _seq_key(self, df):
+        """uint64 hash of (__dim_hash__, __row_seq__): the comparison_id without KEY_COLS."""
+        if self.BACKEND == "polars":
+            frame = pl.LazyFrame({"h": df["__dim_hash__"].to_numpy(), "seq": df["__row_seq__"].to_numpy(dtype="int64")})
+            hashed = frame.select(_pl_combine([_pl_mix(pl.col("h")), _pl_mix(pl.col("seq").reinterpret(signed=False))]))
+            return pd.Series(hashed.collect().to_series().to_numpy(), index=df.index)
+        return pd.util.hash_pandas_object(df[["__dim_hash__", "__row_seq__"]], index=False)
+
+    def _build_comparison_ids(self, string_keys=False):
         """
         Key strategy:
-        - Build a dimension hash string (including date at day granularity if present).
+        - Hash the dimensions (including date at day granularity if present) to a uint64.
         - Within each dimension group, assign a deterministic sequence number based on a stable
           sort by all measure columns. This pairs duplicate rows between systems deterministically.
-        - comparison_id = "<dim_hash>#<seq>"
+        - comparison_id = uint64 hash of (dim_hash, seq). The readable "<dims>#<seq>" form is
+          only rendered for rows in the mismatch report, as __comparison_label__ (READABLE_KEYS).
+        - A second, independently keyed hash guards against collisions; on a collision we fall
+          back to the old string keys.
+        - With KEY_COLS the key alone identifies a row: no sequencing, comparison_id is the key
+          hash (or "<keys>" string) and __key_code__ holds the sort-merge join code.
         """
-        dims = list(self.dimension_cols)
-
-        def dim_hash(df):
-            parts = []
-            for c in dims:
-                if c == self.date_col and pd.api.types.is_datetime64_any_dtype(df[c]):
-                    parts.append(df[c].dt.strftime("%Y-%m-%d").fillna("NaT"))
-                else:
-                    parts.append(df[c].astype(str).fillna("NaN"))
-            key = parts[0]
-            for p in parts[1:]:
-                key = key.str.cat(p, sep="|")
-            return key
-
-        def seq_within_group(df):
-            if len(self.measure_cols) == 0:
-                return df.groupby(dims, dropna=False).cumcount()
-            # Stable sort by dims + measures so both sides generate the same order
-            tmp = df.copy()
-            tmp["_tmp_idx_"] = np.arange(len(tmp))
-            sort_cols = dims + self.measure_cols + ["_tmp_idx_"]
-            tmp = tmp.sort_values(by=sort_cols, kind="mergesort")
-            seq_sorted = tmp.groupby(dims, dropna=False).cumcount()
-            seq = pd.Series(index=tmp.index, data=seq_sorted.values, dtype="int64")
-            seq = seq.reindex(df.index)
-            return seq
-
+        self._string_keys = string_keys
         for df in (self.gcp, self.edw):
-            df["__dim_hash__"] = dim_hash(df)
-            df["__row_seq__"]  = seq_within_group(df).astype("int64")
-            df["__comparison_id__"] = df["__dim_hash__"].str.cat(df["__row_seq__"].astype(str), sep="#")
+            if string_keys:
+                df["__dim_hash__"] = self._dim_label(df)
+                df["__row_seq__"]  = self._seq_within_group(df)
+                df["__comparison_id__"] = (df["__dim_hash__"] if self.key_cols else
+                                           df["__dim_hash__"].str.cat(df["__row_seq__"].astype(str), sep="#"))
+            else:
+                df["__dim_hash__"] = self._dim_hash(df)
+                df["__row_seq__"]  = self._seq_within_group(df)
+                df["__comparison_id__"] = df["__dim_hash__"] if self.key_cols else self._seq_key(df)
 
         self.key_col = "__comparison_id__"
 
+        if not string_keys:
+            # Collision check: each primary hash must map to exactly one check hash, and keys
+            # must be unique per side
+            if self.BACKEND == "polars":
+                collided = self._polars_collision_check()
+            else:
+                pairs = pd.concat([pd.DataFrame({"h": df["__dim_hash__"].to_numpy(),
+                                                 "h2": self._dim_hash(df, hash_key="gcp_vs_edw_check").to_numpy()})
+                                   for df in (self.gcp, self.edw)], ignore_index=True).drop_duplicates()
+                collided = (pairs["h"].duplicated().any()
+                            or self.gcp[self.key_col].duplicated().any() or self.edw[self.key_col].duplicated().any())
+            if collided:
+                print("[Validator] 64-bit key collision detected; falling back to string keys")
+                self._build_comparison_ids(string_keys=True)
+        self._keys_built = True
+
+    @_profiled("comparison_ids")
+    def _ensure_comparison_ids(self):
+        """Build __comparison_id__ on both sides unless already built (only outputs 4 and 5 need it)."""
+        if not self._keys_built:
+            self._build_comparison_ids()
+
+    def _polars_collision_check(self):
+        """The collision check above as Polars lazy queries, collected together."""
+        sides = (self.gcp, self.edw)
+        pairs = pl.LazyFrame({
+            "h": np.concatenate([df["__dim_hash__"].to_numpy() for df in sides]),
+            "h2": np.concatenate([self._dim_hash(df, hash_key="gcp_vs_edw_check").to_numpy() for df in sides]),
+        })
+        checks = [pairs.unique().select(pl.col("h").is_duplicated().any())]
+        checks += [pl.LazyFrame({"k": df[self.key_col].to_numpy()}).select(pl.col("k").is_duplicated().any())
+                   for df in sides]
+        return any(frame.item() for frame in pl.collect_all(checks))
+
+    def _seq_within_group(self, df):
+        """
+        Deterministic 0..k-1 numbering inside each dimension group, ordered by raw date,
+        then all measures, then original row position (same pairing as a full stable sort).
+        Groups come from factorizing __dim_hash__; only rows of groups with duplicates are
+        sorted, singleton groups (the vast majority) just get 0. KEY_COLS rows are all 0.
+        BACKEND = "polars" numbers the duplicated rows with int_range over each hash instead.
+        """
+        seq = np.zeros(len(df), dtype="int64")
+        if len(df) == 0 or self.key_cols:
+            return seq
+        if self.BACKEND == "polars":
+            return self._polars_seq_within_group(df, seq)
+        codes, _ = pd.factorize(df["__dim_hash__"], sort=False)
+        dup_rows = np.flatnonzero(np.bincount(codes)[codes] > 1)
+        if len(dup_rows) == 0:
+            return seq
+
+        # np.lexsort: last key is primary; NaN sorts last (as in sort_values)
+        sort_keys = [dup_rows] + [df[m].to_numpy(dtype="float64")[dup_rows] for m in reversed(self.measure_cols)]
+        if (self.measure_cols and self.date_col in self.dimension_cols
+                and pd.api.types.is_datetime64_any_dtype(df[self.date_col])):
+            dates = df[self.date_col].to_numpy(dtype="datetime64[ns]")[dup_rows]
+            sort_keys.append(np.where(np.isnat(dates), np.iinfo("int64").max, dates.view("int64")))
+        sort_keys.append(codes[dup_rows])
+        order = dup_rows[np.lexsort(sort_keys)]
+
+        # Position within each run of equal group codes
+        sorted_codes = codes[order]
+        pos = np.arange(len(order))
+        run_start = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+        seq[order] = pos - np.maximum.accumulate(np.where(run_start, pos, 0))
+        return seq
+
+    def _polars_seq_within_group(self, df, seq):
+        frame, order_by = {"h": df["__dim_hash__"].to_numpy()}, []
+        if (self.measure_cols and self.date_col in self.dimension_cols
+                and pd.api.types.is_datetime64_any_dtype(df[self.date_col])):
+            frame["date"] = df[self.date_col].to_numpy(dtype="datetime64[ns]").view("int64")
+            # NaT last, as above
+            order_by.append(pl.when(pl.col("date") == np.iinfo("int64").min)
+                            .then(int(np.iinfo("int64").max)).otherwise(pl.col("date")))
+        for j, m in enumerate(self.measure_cols):
+            frame[f"m{j}"] = df[m].to_numpy(dtype="float64")
+            order_by.append(pl.col(f"m{j}") + 0.0)  # -0.0 ties with 0.0, as in np.lexsort
+        dups = (pl.LazyFrame(frame).with_row_index("row").filter(pl.col("h").is_duplicated())
+                .select("row", pl.int_range(pl.len(), dtype=pl.Int64).over("h", order_by=order_by + [pl.col("row")])
+                        .alias("seq"))
+                .collect())
+        seq[dups["row"].to_numpy()] = dups["seq"].to_numpy()
+        return seq
+
+    def _build_key_codes(self):
+        """
+        __key_code__: int64 code of each row's KEY_COLS tuple, shared by both sides and
+        ordered like the tuples (values sorted per column, missing last, dates by day), so
+        tables sorted by their key have ascending codes. Raises ValueError on duplicate keys.
+        """
+        for c in self.key_cols:
+            gt, et = self.gcp[c].dtype, self.edw[c].dtype
+            if gt != et and pd.api.types.is_numeric_dtype(gt) and pd.api.types.is_numeric_dtype(et):
+                # e.g. int IDs on one side, float IDs (with NaN) on the other
+                self.gcp[c] = self.gcp[c].astype("float64")
+                self.edw[c] = self.edw[c].astype("float64")
+
+        n_gcp = len(self.gcp)
+        codes = np.zeros(n_gcp + len(self.edw), dtype="int64")
+        span = 1
+        for c in self.key_cols:
+            values = pd.concat([self.gcp[c], self.edw[c]], ignore_index=True)
+            if c == self.date_col and pd.api.types.is_datetime64_any_dtype(values):
+                values = values.dt.normalize()
+            try:
+                col, uniques = pd.factorize(values, sort=True)
+            except TypeError:
+                col, uniques = pd.factorize(values, sort=False)
+            col, size = np.where(col < 0, len(uniques), col), len(uniques) + 1
+            if span > np.iinfo("int64").max // size:
+                # Re-densify (order preserving) before the combined code could overflow
+                codes = np.unique(codes, return_inverse=True)[1].astype("int64")
+                span = int(codes.max()) + 1 if len(codes) else 1
+            codes = codes * size + col
+            span *= size
+        self.gcp["__key_code__"] = codes[:n_gcp]
+        self.edw["__key_code__"] = codes[n_gcp:]
+
+        dups = [int((np.diff(np.sort(side)) == 0).sum()) for side in (codes[:n_gcp], codes[n_gcp:])]
+        if any(dups):
+            raise ValueError(f"KEY_COLS {self.key_cols} do not identify rows uniquely: "
+                             f"{dups[0]} duplicate key(s) in GCP, {dups[1]} in EDW")
+
+    @staticmethod
+    def _sort_merge_positions(gcp_codes, edw_codes):
+        """
+        Full outer join of two unique int key arrays without a hash table: for each key of the
+        union (ascending), its position on each side (-1 if absent). A side is only sorted if its
+        codes do not already ascend; a key's union slot = smaller GCP keys + smaller EDW-only keys.
+        """
+        def order(codes):
+            if len(codes) < 2 or (codes[1:] >= codes[:-1]).all():
+                return np.arange(len(codes))
+            return np.argsort(codes, kind="stable")
+
+        g_order, e_order = order(gcp_codes), order(edw_codes)
+        g_sorted, e_sorted = gcp_codes[g_order], edw_codes[e_order]
+        e_before = np.searchsorted(e_sorted, g_sorted, side="left")
+        g_before = np.searchsorted(g_sorted, e_sorted, side="left")
+        if len(g_sorted):
+            e_only = g_sorted[np.minimum(g_before, len(g_sorted) - 1)] != e_sorted
+        else:
+            e_only = np.ones(len(e_sorted), dtype=bool)
+        e_only_before = np.r_[0, np.cumsum(e_only)]
+        size = len(g_sorted) + int(e_only.sum())
+        g_at = np.full(size, -1, dtype="int64")
+        e_at = np.full(size, -1, dtype="int64")
+        g_at[np.arange(len(g_sorted)) + e_only_before[e_before]] = g_order
+        e_at[g_before + e_only_before[:-1]] = e_order
+        return g_at, e_at
+
+    def _readable_keys(self, keys):
+        """Map uint64 comparison ids to "<dims>#<seq>", rendering only the rows in `keys`."""
+        if self._string_keys or len(keys) == 0:
+            return keys
+        labels = []
+        for df in (self.gcp, self.edw):
+            rows = df.loc[df[self.key_col].isin(keys)]
+            label = self._dim_label(rows)
+            if not self.key_cols:
+                label = label.str.cat(rows["__row_seq__"].astype(str), sep="#")
+            labels.append(pd.Series(label.to_numpy(), index=rows[self.key_col].to_numpy()))
+        lookup = pd.concat(labels)
+        lookup = lookup[~lookup.index.duplicated()]
+        return keys.map(lookup)
+
+    def _finalize_mismatch_report(self, report):
+        """Readable labels (if READABLE_KEYS) and key order, same for in-memory and chunked paths."""
+        report = report.copy()
+        if not self.READABLE_KEYS:
+            return report.sort_values(self.key_col, kind="mergesort").reset_index(drop=True)
+        # Keep the uint64 key so mismatch rows still join to output 5
+        report.insert(1, "__comparison_label__", self._readable_keys(report[self.key_col]).to_numpy(dtype=object))
+        return report.sort_values("__comparison_label__", kind="mergesort").reset_index(drop=True)
+
     # ---------- Stage 1: Summary ----------
 
+    @_profiled("run_summary_validation")
     def run_summary_validation(self) -> pd.DataFrame:
-        gcp_cols = set(self.gcp.columns)
-        edw_cols = set(self.edw.columns)
+        # Key columns added by the validator (some only once rows are matched) are not part of the schemas
+        helpers = {"__dim_hash__", "__row_seq__", "__comparison_id__", "__key_code__"}
+        gcp_cols = set(self.gcp.columns) - helpers
+        edw_cols = set(self.edw.columns) - helpers
         shared   = sorted(list(gcp_cols & edw_cols))
 
         # Row count
@@ -238,27 +701,58 @@ class MigrationValidator:
         out = pd.concat([row_block, schema_block, dtypes_block, nulls_block], ignore_index=True).fillna("")
         return out.astype(str)
 
+    # ---------- Measure comparison (stages 2-5) ----------
+
+    @staticmethod
+    def _compare_blocks(gv, ev, atol, rtol):
+        """
+        One pass over two float blocks whose last axis is the measures; atol/rtol are scalars or
+        one value per measure. Returns (mismatch matrix, gv - ev) with the semantics of
+        ~np.isclose(gv, ev, equal_nan=True).
+        """
+        with np.errstate(invalid="ignore", over="ignore"):
+            diff = gv - ev
+            close = np.abs(diff) <= atol + rtol * np.abs(ev)
+        close &= np.isfinite(diff)   # infinities are only close to the same infinity
+        close |= gv == ev
+        close |= np.isnan(gv) & np.isnan(ev)
+        return ~close, diff
+
+    def _compare_measures(self, gv, ev):
+        """(mismatch, difference) matrices of blocks ordered like measure_cols, per-measure tolerances."""
+        tol = [self.MEASURE_TOLERANCES.get(m, (self.ATOL, self.RTOL)) for m in self.measure_cols]
+        atol = np.array([t[0] for t in tol], dtype="float64")
+        rtol = np.array([t[1] for t in tol], dtype="float64")
+        return self._compare_blocks(np.asarray(gv, dtype="float64"), np.asarray(ev, dtype="float64"), atol, rtol)
+
+    def _measure_blocks(self, frame):
+        """The {m}__GCP and {m}__EDW columns of a merged frame as two contiguous float blocks."""
+        gv = np.ascontiguousarray(frame[[f"{m}__GCP" for m in self.measure_cols]].to_numpy(dtype="float64"))
+        ev = np.ascontiguousarray(frame[[f"{m}__EDW" for m in self.measure_cols]].to_numpy(dtype="float64"))
+        return gv, ev
+
     # ---------- Stage 2: Grand Totals ----------
 
+    @_profiled("run_grand_total_validation")
     def run_grand_total_validation(self) -> pd.DataFrame:
         cols = ["Measure","GCP_Sum","EDW_Sum","Difference","Status"]
         if not self.measure_cols:
             return pd.DataFrame(columns=cols)
 
-        gsum = self.gcp[self.measure_cols].sum(numeric_only=True)
-        esum = self.edw[self.measure_cols].sum(numeric_only=True)
-        df = pd.DataFrame({
+        gsum = self.gcp[self.measure_cols].sum(numeric_only=True).reindex(self.measure_cols).to_numpy(dtype="float64")
+        esum = self.edw[self.measure_cols].sum(numeric_only=True).reindex(self.measure_cols).to_numpy(dtype="float64")
+        mismatch, diff = self._compare_measures(gsum, esum)
+        return pd.DataFrame({
             "Measure": self.measure_cols,
-            "GCP_Sum": [gsum.get(m, np.nan) for m in self.measure_cols],
-            "EDW_Sum": [esum.get(m, np.nan) for m in self.measure_cols],
+            "GCP_Sum": gsum,
+            "EDW_Sum": esum,
+            "Difference": diff,
+            "Status": np.where(mismatch, "Mismatch", "Match"),
         })
-        df["Difference"] = df["GCP_Sum"] - df["EDW_Sum"]
-        df["Status"] = np.where(np.isclose(df["GCP_Sum"], df["EDW_Sum"], equal_nan=True,
-                                           atol=self.ATOL, rtol=self.RTOL), "Match","Mismatch")
-        return df
 
     # ---------- Stage 3: Time Windows (Daily/MTD/QTD/YTD + Monthly) ----------
 
+    @_profiled("run_time_windows_validation")
     def run_time_windows_validation(self) -> pd.DataFrame:
         """
         Returns a tidy (long) DataFrame with:
@@ -268,6 +762,9 @@ class MigrationValidator:
         - QTD = latest quarter to date (Period=YYYY-Q#)
         - YTD = year to date (Period=YYYY)
         - Monthly = per-calendar-month across all available data (Period=YYYY-MM)
+        Windows are applied to whole days: every row on the latest day counts towards Daily
+        (and MTD/QTD/YTD) whatever its time of day. Earlier versions cut every window off at
+        midnight of the latest day, so intraday rows of that day were left out of all four.
         """
         cols = ["Measure","Window","Period","GCP_Sum","EDW_Sum","Difference","Status"]
         if not self.measure_cols or not self.date_col:
@@ -284,196 +781,523 @@ class MigrationValidator:
         if latest is None or pd.isna(latest):
             return pd.DataFrame(columns=cols)
 
-        def month_start(d): return pd.Timestamp(d.year, d.month, 1)
-        def quarter_first_month(m): return 3 * ((m - 1) // 3) + 1
-        def quarter_start(d): return pd.Timestamp(d.year, quarter_first_month(d.month), 1)
-        def year_start(d): return pd.Timestamp(d.year, 1, 1)
-
-        daily_start = latest.normalize()
-        daily_end   = latest.normalize()
-        mtd_start   = month_start(latest)
-        qtd_start   = quarter_start(latest)
-        ytd_start   = year_start(latest)
-
-        def window_sum(df, start, end):
-            mask = (df[self.date_col] >= start) & (df[self.date_col] <= end)
-            return df.loc[mask, self.measure_cols].sum(numeric_only=True)
-
-        rows = []
-
-        # Daily / MTD / QTD / YTD snapshots (at latest date)
-        ranges = [
-            ("Daily", daily_start, daily_end, daily_start.strftime("%Y-%m-%d")),
-            ("MTD",   mtd_start,   daily_end, mtd_start.strftime("%Y-%m")),
-            ("QTD",   qtd_start,   daily_end, f"{qtd_start.year}-Q{((latest.month-1)//3)+1}"),
-            ("YTD",   ytd_start,   daily_end, str(ytd_start.year)),
-        ]
-        for window, start, end, label in ranges:
-            g_agg = window_sum(self.gcp, start, end)
-            e_agg = window_sum(self.edw, start, end)
-            for m in self.measure_cols:
-                gv = g_agg.get(m, np.nan)
-                ev = e_agg.get(m, np.nan)
-                diff = gv - ev if (pd.notna(gv) and pd.notna(ev)) else (gv - ev)
-                status = "Match" if np.isclose(gv, ev, equal_nan=True, atol=self.ATOL, rtol=self.RTOL) else "Mismatch"
-                rows.append({"Measure": m, "Window": window, "Period": label,
-                             "GCP_Sum": gv, "EDW_Sum": ev, "Difference": diff, "Status": status})
+        # Daily / MTD / QTD / YTD snapshots (at latest date), from the window engine
+        snap = self._window_table(pd.DatetimeIndex([latest]), ["Daily", "MTD", "QTD", "YTD"])
 
         # Monthly breakdown across all available months in union of both tables
-        def month_series(df):
-            return df[self.date_col].dt.to_period("M").astype(str)
-
-        gcp_month = self.gcp[[self.date_col]].dropna().assign(_month=lambda d: d[self.date_col].dt.to_period("M").astype(str))["_month"]
-        edw_month = self.edw[[self.date_col]].dropna().assign(_month=lambda d: d[self.date_col].dt.to_period("M").astype(str))["_month"]
+        gcp_month = self._month_labels("gcp")[self.gcp[self.date_col].notna()]
+        edw_month = self._month_labels("edw")[self.edw[self.date_col].notna()]
         all_months = sorted(set(gcp_month.unique()).union(set(edw_month.unique())))
 
         if all_months:
             # Pre-compute per-month sums for each source
-            gcp_by_m = (self.gcp
-                        .assign(_month=self.gcp[self.date_col].dt.to_period("M").astype(str))
-                        .groupby("_month", dropna=False)[self.measure_cols]
-                        .sum(numeric_only=True))
-            edw_by_m = (self.edw
-                        .assign(_month=self.edw[self.date_col].dt.to_period("M").astype(str))
-                        .groupby("_month", dropna=False)[self.measure_cols]
-                        .sum(numeric_only=True))
-            # Emit rows per month
-            for mo in all_months:
-                g_row = gcp_by_m.loc[mo] if mo in gcp_by_m.index else pd.Series(index=self.measure_cols, dtype="float64")
-                e_row = edw_by_m.loc[mo] if mo in edw_by_m.index else pd.Series(index=self.measure_cols, dtype="float64")
-                for m in self.measure_cols:
-                    gv = g_row.get(m, np.nan)
-                    ev = e_row.get(m, np.nan)
-                    diff = gv - ev if (pd.notna(gv) and pd.notna(ev)) else (gv - ev)
-                    status = "Match" if np.isclose(gv, ev, equal_nan=True, atol=self.ATOL, rtol=self.RTOL) else "Mismatch"
-                    rows.append({"Measure": m, "Window": "Monthly", "Period": mo,
-                                 "GCP_Sum": gv, "EDW_Sum": ev, "Difference": diff, "Status": status})
-
-        return pd.DataFrame(rows, columns=cols)
+            if self.BACKEND == "polars":
+                gcp_by_m, edw_by_m = (self._polars_period_sums(side, "1mo") for side in ("gcp", "edw"))
+                gcp_by_m.index = gcp_by_m.index.to_period("M").astype(str)
+                edw_by_m.index = edw_by_m.index.to_period("M").astype(str)
+            else:
+                gcp_by_m = self.gcp[self.measure_cols].groupby(self._month_labels("gcp"), dropna=False).sum(numeric_only=True)
+                edw_by_m = self.edw[self.measure_cols].groupby(self._month_labels("edw"), dropna=False).sum(numeric_only=True)
+            # One (months x measures) comparison; months missing on a side are NaN there
+            gv = gcp_by_m.reindex(index=all_months, columns=self.measure_cols).to_numpy(dtype="float64")
+            ev = edw_by_m.reindex(index=all_months, columns=self.measure_cols).to_numpy(dtype="float64")
+            mismatch, diff = self._compare_measures(gv, ev)
+            k = len(self.measure_cols)
+            monthly = pd.DataFrame({
+                "Measure": np.tile(np.asarray(self.measure_cols, dtype=object), len(all_months)),
+                "Window": "Monthly",
+                "Period": np.repeat(np.asarray(all_months, dtype=object), k),
+                "GCP_Sum": gv.ravel(), "EDW_Sum": ev.ravel(), "Difference": diff.ravel(),
+                "Status": np.where(mismatch.ravel(), "Mismatch", "Match"),
+            })
+            return pd.concat([snap[cols], monthly[cols]], ignore_index=True)
+
+        return snap[cols].reset_index(drop=True)
+
+    # Window -> (first day of window, Period label) for a DatetimeIndex of as-of dates
+    WINDOWS = {
+        "Daily": (lambda d: d, lambda d: d.strftime("%Y-%m-%d")),
+        "WTD":   (lambda d: d - pd.to_timedelta(d.dayofweek, unit="D"), lambda d: d.to_period("W").astype(str)),
+        "MTD":   (lambda d: d.to_period("M").start_time, lambda d: d.strftime("%Y-%m")),
+        "QTD":   (lambda d: d.to_period("Q").start_time, lambda d: d.year.astype(str) + "-Q" + d.quarter.astype(str)),
+        "YTD":   (lambda d: d.to_period("Y").start_time, lambda d: d.year.astype(str)),
+    }
+
+    def _month_labels(self, side):
+        """Month label ("YYYY-MM", "NaT" without a date) of every row of one side (memoized)."""
+        if ("months", side) not in self._cache:
+            df = self.gcp if side == "gcp" else self.edw
+            self._cache[("months", side)] = df[self.date_col].dt.to_period("M").astype(str)
+        return self._cache[("months", side)]
+
+    def _daily_cumsums(self, side):
+        """(sorted days, cumulative measure sums with a leading zero row) from one daily groupby (memoized)."""
+        if ("cumsums", side) not in self._cache:
+            df = self.gcp if side == "gcp" else self.edw
+            if self.BACKEND == "polars":
+                daily = self._polars_period_sums(side, "1d")
+            else:
+                daily = (df.loc[df[self.date_col].notna(), self.measure_cols]
+                           .groupby(df[self.date_col].dt.normalize()).sum(numeric_only=True)
+                           .reindex(columns=self.measure_cols))
+            cums = np.vstack([np.zeros((1, len(self.measure_cols))), np.cumsum(daily.to_numpy(dtype="float64"), axis=0)])
+            self._cache[("cumsums", side)] = (daily.index, cums)
+        return self._cache[("cumsums", side)]
+
+    def _polars_period_sums(self, side, every):
+        """Measure sums of one side's dated rows per Polars period ("1d", "1mo"), indexed by period start."""
+        df = self.gcp if side == "gcp" else self.edw
+        columns = {"__period__": df[self.date_col].to_numpy(dtype="datetime64[ns]")}
+        columns.update({f"v{j}": df[m].to_numpy(dtype="float64") for j, m in enumerate(self.measure_cols)})
+        sums = (pl.LazyFrame(columns).drop_nulls("__period__")
+                  .group_by(pl.col("__period__").dt.truncate(every))
+                  .agg([pl.col(f"v{j}").fill_nan(None).sum() for j in range(len(self.measure_cols))])
+                  .sort("__period__").collect())
+        return pd.DataFrame({m: sums[f"v{j}"].to_numpy() for j, m in enumerate(self.measure_cols)},
+                            index=pd.DatetimeIndex(sums["__period__"].to_numpy()))
+
+    def _window_table(self, asof, windows):
+        """
+        Window sums for every as-of date x window x measure (in that order).
+        Each window is cum[end] - cum[start-1] via searchsorted, so cost does not
+        depend on window length or row count.
+        """
+        asof = pd.DatetimeIndex(asof).normalize()
+        starts = np.column_stack([self.WINDOWS[w][0](asof).to_numpy() for w in windows]).ravel()
+        labels = np.column_stack([np.asarray(self.WINDOWS[w][1](asof), dtype=object) for w in windows]).ravel()
+        ends = np.repeat(asof.to_numpy(), len(windows))
+
+        def sums(side):
+            days, cums = self._daily_cumsums(side)
+            return (cums[days.searchsorted(ends, side="right")] - cums[days.searchsorted(starts, side="left")]).ravel()
+
+        k = len(self.measure_cols)
+        gv, ev = sums("gcp").reshape(-1, k), sums("edw").reshape(-1, k)
+        mismatch, diff = self._compare_measures(gv, ev)
+        return pd.DataFrame({
+            "AsOfDate": np.repeat(ends, k),
+            "Measure": np.tile(np.asarray(self.measure_cols, dtype=object), len(ends)),
+            "Window": np.tile(np.repeat(np.asarray(windows, dtype=object), k), len(asof)),
+            "Period": np.repeat(labels, k),
+            "GCP_Sum": gv.ravel(), "EDW_Sum": ev.ravel(), "Difference": diff.ravel(),
+            "Status": np.where(mismatch.ravel(), "Mismatch", "Match"),
+        })
+
+    @_profiled("run_time_windows_range")
+    def run_time_windows_range(self, start=None, end=None, windows=None) -> pd.DataFrame:
+        """
+        Backfill audit: Daily/WTD/MTD/QTD/YTD sums for EVERY as-of date in [start, end]
+        (defaults: earliest..latest date on either side) in one vectorized call.
+        Weeks start on Monday. Tidy columns:
+          AsOfDate, Measure, Window, Period, GCP_Sum, EDW_Sum, Difference, Status
+        """
+        windows = list(self.WINDOWS) if windows is None else list(windows)
+        bad = [w for w in windows if w not in self.WINDOWS]
+        if bad:
+            raise ValueError(f"Unknown window(s) {bad}; choose from {list(self.WINDOWS)}")
+        cols = ["AsOfDate","Measure","Window","Period","GCP_Sum","EDW_Sum","Difference","Status"]
+        if not self.measure_cols or not self.date_col:
+            return pd.DataFrame(columns=cols)
+        if self.date_col not in self.gcp.columns or self.date_col not in self.edw.columns:
+            return pd.DataFrame(columns=cols)
+        dates = pd.concat([self.gcp[self.date_col], self.edw[self.date_col]]).dropna()
+        if dates.empty:
+            return pd.DataFrame(columns=cols)
+        start = dates.min() if start is None else pd.Timestamp(start)
+        end = dates.max() if end is None else pd.Timestamp(end)
+        return self._window_table(pd.date_range(start.normalize(), end.normalize(), freq="D"), windows)[cols]
 
     # ---------- Stages 4 & 5: Full reconciliation + annotated GCP ----------
 
-    def run_full_reconciliation(self):
+    def _reconcile_frames(self, gcp, edw):
+        """
+        Outer-join (part of) both sides on the comparison key and classify each key.
+        Shared by the in-memory path (full tables) and the chunked path (one bucket).
+        """
         key = self.key_col
 
-        # Prepare left/right with suffixed measure columns so we can compare side-by-side
-        left = self.gcp.copy()
-        right = self.edw.copy()
+        # Prepare left/right with suffixed measure columns so we can compare side-by-side.
+        # Dimensions come from the GCP side only so shared names don't collide in the merge.
+        dim_cols = [c for c in self.dimension_cols if c != key and c in gcp.columns]
+        left = gcp[[key] + dim_cols + self.measure_cols + [c for c in (self._GCP_ROW_COL,) if c in gcp.columns]]
+        right = edw[[key] + self.measure_cols]
         left = left.rename(columns={m: f"{m}__GCP" for m in self.measure_cols})
         right = right.rename(columns={m: f"{m}__EDW" for m in self.measure_cols})
 
         # Ensure no lingering 'category' cols
+        left, right = left.copy(), right.copy()
         for df in (left, right):
             cats = df.select_dtypes(include="category").columns
             if len(cats) > 0:
                 df[cats] = df[cats].astype("object")
 
-        merged = pd.merge(
-            left[[key] + [c for c in left.columns if c != key]],
-            right[[key] + [c for c in right.columns if c != key]],
-            on=key, how="outer", suffixes=("","")
-        )
+        if self.key_cols or self.BACKEND == "polars":
+            # Join positions from a sort-merge on the KEY_COLS codes or a Polars hash join on the
+            # comparison key; the frame is laid out like the merge below
+            if self.key_cols:
+                g_at, e_at = self._sort_merge_positions(gcp["__key_code__"].to_numpy(), edw["__key_code__"].to_numpy())
+            else:
+                g_at, e_at = self._polars_join_positions(gcp[key].to_numpy(), edw[key].to_numpy())
+            in_gcp, in_edw = g_at >= 0, e_at >= 0
+            keys = np.empty(len(g_at), dtype=left[key].dtype if len(left) else right[key].dtype)
+            keys[in_gcp] = left[key].to_numpy()[g_at[in_gcp]]
+            keys[in_edw] = right[key].to_numpy()[e_at[in_edw]]
+            merged = pd.concat([left.drop(columns=key).reset_index(drop=True).reindex(g_at).reset_index(drop=True),
+                                right.drop(columns=key).reset_index(drop=True).reindex(e_at).reset_index(drop=True)],
+                               axis=1)
+            merged.insert(0, key, keys)
+        else:
+            merged = pd.merge(left, right, on=key, how="outer", suffixes=("",""))
 
-        # Presence flags via key membership
-        gcp_keys = set(self.gcp[key].unique())
-        edw_keys = set(self.edw[key].unique())
-        in_gcp = merged[key].isin(gcp_keys)
-        in_edw = merged[key].isin(edw_keys)
+            # Presence flags via key membership
+            in_gcp = merged[key].isin(gcp[key])
+            in_edw = merged[key].isin(edw[key])
 
-        # Value mismatches across measures
+        # Value mismatches across all measures in one (rows x measures) comparison
         if self.measure_cols:
-            diffs = []
-            for m in self.measure_cols:
-                lg, rg = f"{m}__GCP", f"{m}__EDW"
-                if lg not in merged.columns: merged[lg] = np.nan
-                if rg not in merged.columns: merged[rg] = np.nan
-                # np.isclose handles NaNs with equal_nan=True
-                same = np.isclose(merged[lg], merged[rg], equal_nan=True, atol=self.ATOL, rtol=self.RTOL)
-                diffs.append(~same.rename(m))
-            any_value_mismatch = pd.concat(diffs, axis=1).any(axis=1) if diffs else pd.Series(False, index=merged.index)
+            any_value_mismatch = self._compare_measures(*self._measure_blocks(merged))[0].any(axis=1)
         else:
-            any_value_mismatch = pd.Series(False, index=merged.index)
+            any_value_mismatch = np.zeros(len(merged), dtype=bool)
 
         merged["mismatch_type"] = np.where(~in_edw & in_gcp, "In GCP Only",
                                     np.where(~in_gcp & in_edw, "In EDW Only",
                                              np.where(any_value_mismatch, "Value Mismatch", "Match")))
-
-        # ---- Output 4: mismatch-only report
+        return merged
+
+    @staticmethod
+    def _polars_join_positions(gcp_keys, edw_keys):
+        """Full outer join of two unique key arrays on Polars: each key's position per side (-1 = absent)."""
+        gcp = pl.DataFrame({"key": gcp_keys}).with_row_index("gcp").lazy()
+        edw = pl.DataFrame({"key": edw_keys}).with_row_index("edw").lazy()
+        joined = (gcp.join(edw, on="key", how="full", coalesce=True)
+                     .select(pl.col("gcp").cast(pl.Int64).fill_null(-1), pl.col("edw").cast(pl.Int64).fill_null(-1))
+                     .collect())
+        return joined["gcp"].to_numpy(), joined["edw"].to_numpy()
+
+    def _mismatch_report(self, merged):
+        key = self.key_col
         mismatches_only = merged.loc[merged["mismatch_type"] != "Match"].copy()
 
         # Enrich with dimension context (prefer unsuffixed columns that survived merge)
         dim_cols = [c for c in self.dimension_cols if c != key and c in mismatches_only.columns]
 
-        # Add per-measure diffs (GCP-EDW) to mismatch report
-        for m in self.measure_cols:
-            lg, rg = f"{m}__GCP", f"{m}__EDW"
-            if lg not in mismatches_only.columns: mismatches_only[lg] = np.nan
-            if rg not in mismatches_only.columns: mismatches_only[rg] = np.nan
-            mismatches_only[f"{m}__Diff"] = mismatches_only[lg] - mismatches_only[rg]
+        # Add per-measure diffs (GCP-EDW) to mismatch report, one block subtraction
+        if self.measure_cols:
+            gv, ev = self._measure_blocks(mismatches_only)
+            mismatches_only = pd.concat([mismatches_only, pd.DataFrame(
+                gv - ev, index=mismatches_only.index, columns=[f"{m}__Diff" for m in self.measure_cols])], axis=1)
 
-        base_cols = [key, "mismatch_type"]
-        report_cols = base_cols + dim_cols + \
+        report_cols = [key, "mismatch_type"] + dim_cols + \
                       [f"{m}__GCP" for m in self.measure_cols] + \
                       [f"{m}__EDW" for m in self.measure_cols] + \
                       [f"{m}__Diff" for m in self.measure_cols]
-        report_cols = [c for c in report_cols if c in mismatches_only.columns]
-        mismatches_only = mismatches_only[report_cols].reset_index(drop=True)
-
-        # ---- Output 5: GCP with validation_status + mismatch_details
-        status_map = merged[[key, "mismatch_type"]].drop_duplicates()
-        gcp_with_status = self.gcp.merge(status_map, on=key, how="left")
-        gcp_with_status["validation_status"] = gcp_with_status["mismatch_type"].fillna("Match")
+        return mismatches_only[report_cols].reset_index(drop=True)
 
+    def _build_mismatch_details(self, frame):
+        """
+        "m=gcp|edw (Δ=diff); ..." for every Value Mismatch row, "" otherwise. Built
+        column-wise over a (rows x measures) mismatch mask, for mismatching rows only.
+        """
+        details = np.full(len(frame), "", dtype=object)
+        rows = np.flatnonzero((frame["validation_status"] == "Value Mismatch").to_numpy())
+        if len(rows) == 0 or not self.measure_cols:
+            return pd.Series(details, index=frame.index, dtype="object")
+
+        gv, ev = self._measure_blocks(frame.iloc[rows])
+        # flag only those not close
+        differs, diff = self._compare_measures(gv, ev)
+
+        text = np.full(len(rows), "", dtype=object)
+        for j, m in enumerate(self.measure_cols):
+            hit = np.flatnonzero(differs[:, j])
+            if len(hit) == 0:
+                continue
+            part = (f"{m}=" + gv[hit, j].astype(str).astype(object) + "|" + ev[hit, j].astype(str).astype(object)
+                    + " (Δ=" + diff[hit, j].astype(str).astype(object) + ")")
+            prev = text[hit]
+            text[hit] = np.where(prev == "", part, prev + "; " + part)
+        details[rows] = text
+        return pd.Series(details, index=frame.index, dtype="object")
+
+    @_profiled("run_full_reconciliation")
+    def run_full_reconciliation(self):
+        self._ensure_comparison_ids()
+        if self.CHUNKED:
+            return self._run_full_reconciliation_chunked()
+
+        # GCP rows carry their position through the join, so output 5 is attached by
+        # position instead of merging statuses and side-by-side values back onto GCP
+        gcp_part = self.gcp[self._join_columns()[0]]
+        gcp_part = gcp_part.assign(**{self._GCP_ROW_COL: np.arange(len(self.gcp), dtype="int64")})
+        return self._assemble_outputs([(gcp_part, self.edw)])
+
+    def _join_columns(self):
+        """(GCP columns, EDW columns) read by the reconciliation join."""
+        key = self.key_col
+        gcp_cols = [key] + [c for c in self.dimension_cols if c != key] + self.measure_cols
+        edw_cols = [key] + self.measure_cols
+        if self.key_cols:
+            gcp_cols.append("__key_code__")
+            edw_cols.append("__key_code__")
+        return gcp_cols, edw_cols
+
+    def _reconcile_pair(self, gcp_part, edw_part):
+        """Join (part of) both sides: (mismatch rows, GCP row positions, their status, their details)."""
+        row_col = self._GCP_ROW_COL
+        merged = self._reconcile_frames(gcp_part, edw_part)
+        on_gcp = merged.loc[merged[row_col].notna()].copy()
+        on_gcp["validation_status"] = on_gcp["mismatch_type"]
+        return (self._mismatch_report(merged),
+                on_gcp[row_col].to_numpy(dtype="int64"),
+                on_gcp["validation_status"].to_numpy(dtype=object),
+                self._build_mismatch_details(on_gcp).to_numpy(dtype=object))
+
+    def _assemble_outputs(self, pairs):
+        """Outputs 4 & 5 from an iterable of (GCP part, EDW part) joins; GCP rows are 'Match' unless joined otherwise."""
+        results = (self._reconcile_pair(gcp_part, edw_part) for gcp_part, edw_part in pairs)
+        if self.OUTPUT_DIR:
+            return self._stream_outputs(results)
+
+        status = np.full(len(self.gcp), "Match", dtype=object)
+        details = np.full(len(self.gcp), "", dtype=object)
+        chunks = []
+        for report, rows, chunk_status, chunk_details in results:
+            if not report.empty:
+                chunks.append(report)
+            status[rows] = chunk_status
+            details[rows] = chunk_details
+        mismatches_only = pd.concat(chunks, ignore_index=True) if chunks else self._empty_mismatch_report()
+        return self._finalize_mismatch_report(mismatches_only), self._annotate(slice(None), status, details)
+
+    def _empty_mismatch_report(self):
+        return self._mismatch_report(self._reconcile_frames(self.gcp.head(0), self.edw.head(0)))
+
+    def _annotate(self, rows, status, details):
+        """Output 5 for a slice of GCP rows: a shallow copy with that slice's status and details attached."""
+        annotated = self.gcp.iloc[rows].copy(deep=False)
+        annotated["validation_status"] = status
         if self.measure_cols:
-            # Bring side-by-side values for detail text
-            side_vals = merged[[key] +
-                               [f"{m}__GCP" for m in self.measure_cols] +
-                               [f"{m}__EDW" for m in self.measure_cols]]
-            gcp_with_status = gcp_with_status.merge(side_vals, on=key, how="left")
-
-            def build_details(row):
-                if row["validation_status"] != "Value Mismatch":
-                    return ""
-                parts = []
-                for m in self.measure_cols:
-                    gv = row.get(f"{m}__GCP")
-                    ev = row.get(f"{m}__EDW")
-                    # flag only those not close
-                    same = np.isclose(gv, ev, equal_nan=True, atol=self.ATOL, rtol=self.RTOL)
-                    if not bool(same):
-                        delta = (gv - ev) if (pd.notna(gv) and pd.notna(ev)) else np.nan
-                        parts.append(f"{m}={gv}|{ev} (Δ={delta})")
-                return "; ".join(parts)
-
-            # Row-wise apply only for final annotation string (acceptable)
-            gcp_with_status["mismatch_details"] = gcp_with_status.apply(build_details, axis=1)
-
-            drop_helpers = [f"{m}__GCP" for m in self.measure_cols] + [f"{m}__EDW" for m in self.measure_cols]
-            gcp_with_status = gcp_with_status.drop(columns=[c for c in drop_helpers if c in gcp_with_status.columns])
-
-        if "mismatch_type" in gcp_with_status.columns:
-            gcp_with_status = gcp_with_status.drop(columns=["mismatch_type"])
-
-        return mismatches_only, gcp_with_status
+            annotated["mismatch_details"] = details
+        return annotated
+
+    def _top_differences(self, report):
+        """PREVIEW_ROWS mismatch rows with the largest max |GCP-EDW| over measures (one-sided rows last)."""
+        if "max_abs_difference" not in report.columns:
+            diffs = np.abs(report[[f"{m}__Diff" for m in self.measure_cols]].to_numpy(dtype="float64"))
+            largest = np.fmax.reduce(diffs, axis=1, initial=np.nan) if len(report) else np.empty(0)
+            report = report.assign(max_abs_difference=largest)
+        return (report.sort_values(["max_abs_difference", self.key_col], ascending=[False, True],
+                                   na_position="last", kind="mergesort")
+                      .head(self.PREVIEW_ROWS).reset_index(drop=True))
+
+    def _annotate_chunk_rows(self):
+        """GCP rows per streamed output 5 chunk: WRITE_CHUNK_ROWS, fewer if MEMORY_BUDGET_MB calls for it."""
+        sample = self.gcp.head(10_000)
+        row_bytes = sample.memory_usage(index=False, deep=True).sum() / len(sample) if len(sample) else 0.0
+        budget = max(float(self.MEMORY_BUDGET_MB), 1.0) * 1024 * 1024
+        fitting = int(budget / (row_bytes * self.MERGE_MEMORY_FACTOR)) if row_bytes else self.WRITE_CHUNK_ROWS
+        return max(1, min(self.WRITE_CHUNK_ROWS, fitting))
+
+    def _stream_outputs(self, results):
+        """
+        Write outputs 4 & 5 to OUTPUT_DIR chunk by chunk. Each join's mismatch rows are finalized
+        (sorted by key within the chunk) and appended as they arrive, and its non-Match GCP
+        statuses are spilled to SPILL_DIR per output 5 chunk; output 5 then follows chunk by
+        chunk (_annotate_chunk_rows), so no array spans the whole table.
+        Returns (top PREVIEW_ROWS mismatches, row counts per status).
+        """
+        if self.OUTPUT_FORMAT not in _ChunkWriter.SUFFIXES:
+            raise ValueError(f"OUTPUT_FORMAT must be one of {list(_ChunkWriter.SUFFIXES)}, got {self.OUTPUT_FORMAT!r}")
+        os.makedirs(self.OUTPUT_DIR, exist_ok=True)
+        suffix = _ChunkWriter.SUFFIXES[self.OUTPUT_FORMAT]
+        mismatch_file = _ChunkWriter(os.path.join(self.OUTPUT_DIR, "4_mismatches" + suffix), self.OUTPUT_FORMAT)
+        annotated_file = _ChunkWriter(os.path.join(self.OUTPUT_DIR, "5_annotated_gcp" + suffix), self.OUTPUT_FORMAT)
+
+        preview, type_counts, status_counts = None, pd.Series(dtype="int64"), pd.Series(dtype="int64")
+        chunk_rows = self._annotate_chunk_rows()
+        try:
+            with tempfile.TemporaryDirectory(dir=self.SPILL_DIR, prefix="annotate_") as spill:
+                for report, rows, chunk_status, chunk_details in results:
+                    # Only non-Match rows need a note; append them to the file of their output 5 chunk
+                    keep = chunk_status != "Match"
+                    rows, chunk_status, chunk_details = rows[keep], chunk_status[keep], chunk_details[keep]
+                    chunk_of = rows // chunk_rows
+                    for c in np.unique(chunk_of):
+                        hit = chunk_of == c
+                        with open(os.path.join(spill, f"notes_{c:07d}.pkl"), "ab") as fh:
+                            pickle.dump((rows[hit], chunk_status[hit], chunk_details[hit]), fh,
+                                        protocol=pickle.HIGHEST_PROTOCOL)
+                    if report.empty:
+                        continue
+                    report = self._finalize_mismatch_report(report)
+                    mismatch_file.write(report)
+                    type_counts = type_counts.add(report["mismatch_type"].value_counts(), fill_value=0)
+                    top = self._top_differences(report)
+                    preview = top if preview is None else self._top_differences(pd.concat([preview, top], ignore_index=True))
+                if mismatch_file.rows == 0:
+                    mismatch_file.write(self._finalize_mismatch_report(self._empty_mismatch_report()))
+                for start in range(0, max(len(self.gcp), 1), chunk_rows):
+                    stop = min(start + chunk_rows, len(self.gcp))
+                    status = np.full(stop - start, "Match", dtype=object)
+                    details = np.full(stop - start, "", dtype=object)
+                    notes = os.path.join(spill, f"notes_{start // chunk_rows:07d}.pkl")
+                    for rows, chunk_status, chunk_details in (self._read_spilled(notes) if os.path.exists(notes) else []):
+                        status[rows - start] = chunk_status
+                        details[rows - start] = chunk_details
+                    status_counts = status_counts.add(pd.Series(status).value_counts(), fill_value=0)
+                    annotated_file.write(self._annotate(slice(start, stop), status, details))
+        finally:
+            mismatch_file.close()
+            annotated_file.close()
+        print("[Validator] Wrote", mismatch_file.rows, "mismatch rows to", mismatch_file.path,
+              "and", annotated_file.rows, "annotated GCP rows to", annotated_file.path)
+
+        if preview is None:
+            preview = self._top_differences(self._finalize_mismatch_report(self._empty_mismatch_report()))
+        counts = pd.concat([
+            pd.DataFrame({"Output": "4_mismatches", "Status": type_counts.index.astype(str),
+                          "Rows": type_counts.to_numpy(dtype="int64"), "Path": mismatch_file.path}),
+            pd.DataFrame({"Output": "5_annotated_gcp", "Status": status_counts.index.astype(str),
+                          "Rows": status_counts.to_numpy(dtype="int64"), "Path": annotated_file.path}),
+        ], ignore_index=True)
+        return preview, counts.sort_values(["Output", "Status"], kind="mergesort").reset_index(drop=True)
+
+    # ---------- Stages 4 & 5 (chunked): out-of-core reconciliation ----------
+
+    def _plan_bucket_count(self):
+        """
+        Number of hash buckets so that one bucket's join fits in MEMORY_BUDGET_MB.
+        Row width is estimated from a bounded sample of each side.
+        """
+        def approx_bytes(df):
+            if len(df) == 0:
+                return 0.0
+            sample = df.head(10_000)
+            return sample.memory_usage(index=False, deep=True).sum() / len(sample) * len(df)
+
+        budget = max(float(self.MEMORY_BUDGET_MB), 1.0) * 1024 * 1024
+        needed = (approx_bytes(self.gcp) + approx_bytes(self.edw)) * self.MERGE_MEMORY_FACTOR
+        return max(1, int(np.ceil(needed / budget)))
+
+    def _take_rows(self, df, cols, start, stop, carry_rows=False):
+        """cols of rows start:stop of df; rows are sliced first so no column is copied whole."""
+        part = df.iloc[start:stop][cols]
+        if carry_rows:
+            part = part.assign(**{self._GCP_ROW_COL: np.arange(start, stop, dtype="int64")})
+        return part
+
+    @staticmethod
+    def _read_spilled(path):
+        """Every object pickled one after another into path."""
+        items = []
+        with open(path, "rb") as fh:
+            while True:
+                try:
+                    items.append(pickle.load(fh))
+                except EOFError:
+                    return items
+
+    def _read_bucket(self, path):
+        """One spilled bucket: an empty frame with the dtypes, then the pieces of each spilled slice."""
+        empty, *parts = self._read_spilled(path)
+        return pd.concat(parts) if parts else empty
+
+    def _run_full_reconciliation_chunked(self):
+        """
+        Same outputs as run_full_reconciliation, but both sides are hash-partitioned on
+        __comparison_id__ into on-disk buckets that are joined one pair at a time. The
+        tables are spilled a bucket's worth of rows at a time, so nothing is copied whole.
+        """
+        key = self.key_col
+        n_buckets = self._plan_bucket_count()
+        print("[Validator] Chunked reconciliation buckets:", n_buckets)
+
+        gcp_cols, edw_cols = self._join_columns()
+
+        with tempfile.TemporaryDirectory(dir=self.SPILL_DIR, prefix="reconcile_") as spill:
+            g_codes = self.gcp["__key_code__"].to_numpy() if self.key_cols else None
+            e_codes = self.edw["__key_code__"].to_numpy() if self.key_cols else None
+            if self.key_cols and (g_codes[1:] >= g_codes[:-1]).all() and (e_codes[1:] >= e_codes[:-1]).all():
+                # Both sides sorted by KEY_COLS: stream aligned key ranges, nothing is spilled
+                print("[Validator] Key-sorted inputs: streaming", n_buckets, "key range(s)")
+                cuts = g_codes[(np.arange(1, n_buckets) * len(g_codes)) // n_buckets]
+                g_edges = np.r_[0, np.searchsorted(g_codes, cuts), len(g_codes)]
+                e_edges = np.r_[0, np.searchsorted(e_codes, cuts), len(e_codes)]
+                pairs = ((self._take_rows(self.gcp, gcp_cols, g_edges[b], g_edges[b + 1], carry_rows=True),
+                          self._take_rows(self.edw, edw_cols, e_edges[b], e_edges[b + 1])) for b in range(n_buckets))
+            else:
+                # Spill each side a bucket's worth of rows at a time (a key always hashes to the
+                # same bucket on both sides); each bucket file starts with an empty, typed frame
+                for side, df, cols in (("gcp", self.gcp, gcp_cols), ("edw", self.edw, edw_cols)):
+                    paths = [os.path.join(spill, f"{side}_{b:05d}.pkl") for b in range(n_buckets)]
+                    for path in paths:
+                        with open(path, "wb") as fh:
+                            pickle.dump(self._take_rows(df, cols, 0, 0, side == "gcp"), fh, protocol=pickle.HIGHEST_PROTOCOL)
+                    step = max(1, -(-len(df) // n_buckets))
+                    for start in range(0, len(df), step):
+                        part = self._take_rows(df, cols, start, min(start + step, len(df)), side == "gcp")
+                        bucket = pd.util.hash_pandas_object(part[key], index=False).to_numpy() % np.uint64(n_buckets)
+                        # Stable, so every bucket keeps its rows in table order
+                        order = np.argsort(bucket, kind="stable")
+                        edges = np.r_[0, np.cumsum(np.bincount(bucket.astype("int64"), minlength=n_buckets))]
+                        for b in np.flatnonzero(np.diff(edges)):
+                            with open(paths[b], "ab") as fh:
+                                pickle.dump(part.iloc[order[edges[b]:edges[b + 1]]], fh, protocol=pickle.HIGHEST_PROTOCOL)
+                pairs = ((self._read_bucket(os.path.join(spill, f"gcp_{b:05d}.pkl")),
+                          self._read_bucket(os.path.join(spill, f"edw_{b:05d}.pkl"))) for b in range(n_buckets))
+
+            # Joined (and, with OUTPUT_DIR, written) while the spilled buckets still exist
+            return self._assemble_outputs(pairs)
 
     # ---------- Orchestration ----------
 
-    def run_all(self):
-        out1 = self.run_summary_validation()
-        out2 = self.run_grand_total_validation()
-        out3 = self.run_time_windows_validation()
-        out4, out5 = self.run_full_reconciliation()
-        # Ensure KNIME-safe (strings) for summary table
-        out1 = out1.astype(str)
-        return out1, out2, out3, out4, out5
+    def run_stages(self, stages):
+        """
+        Compute only the named outputs (keys of STAGES) and return {name: DataFrame}.
+        Outputs 4 and 5 come from one reconciliation, which runs only if either is asked for.
+        """
+        stages = list(stages)
+        bad = [s for s in stages if s not in self.STAGES]
+        if bad:
+            raise ValueError(f"Unknown stage(s) {bad}; choose from {list(self.STAGES)}")
+        out = {}
+        if "summary" in stages:
+            # Ensure KNIME-safe (strings) for summary table
+            out["summary"] = self.run_summary_validation().astype(str)
+        if "grand_totals" in stages:
+            out["grand_totals"] = self.run_grand_total_validation()
+        if "time_windows" in stages:
+            out["time_windows"] = self.run_time_windows_validation()
+        if "mismatches" in stages or "annotated_gcp" in stages:
+            out["mismatches"], out["annotated_gcp"] = self.run_full_reconciliation()
+        return {s: out[s] for s in stages}
+
+    def run_all(self, stages=None):
+        """All five outputs in port order; with `stages`, outputs not named there are empty DataFrames."""
+        out = self.run_stages(self.STAGES if stages is None else stages)
+        return tuple(out.get(name, pd.DataFrame()) for name in self.STAGES)
 
 
 # ===========================
 # Main (safe) execution
 # ===========================
 try:
+    # Optional flow variable choosing the execution backend ("pandas" or "polars")
+    backend = globals().get("flow_variables", {}).get("validator_backend")
+    if backend:
+        MigrationValidator.BACKEND = backend.strip().lower()
     validator = MigrationValidator(input_table_1, input_table_2)
-    output_table_1, output_table_2, output_table_3, output_table_4, output_table_5 = validator.run_all()
+    # Optional flow variable naming the outputs to compute (all when unset)
+    requested = globals().get("flow_variables", {}).get("validator_stages")
+    stages = [s.strip() for s in requested.split(",") if s.strip()] if requested else None
+    # Optional flow variable: stream outputs 4 & 5 to files there (ports get a preview + counts)
+    output_dir = globals().get("flow_variables", {}).get("validator_output_dir")
+    if output_dir:
+        validator.OUTPUT_DIR = output_dir
+    output_table_1, output_table_2, output_table_3, output_table_4, output_table_5 = validator.run_all(stages)
+    # Per-stage profile for downstream nodes (the same events were printed above)
+    if "flow_variables" in globals():
+        flow_variables["validator_profile"] = json.dumps(validator.profile)
 
 except Exception as e:
     # Fail safe: put error in output_table_1; keep other outputs valid but empty
@@ -61,6 +61,14 @@ listed below with the corresponding output index (1‑based):
        equally spaced bins across the combined range of the two
        datasets.
 
+Stages 2, 3 and 6 and the mean/variance of stage 7 never rescan the
+tables: each side is aggregated once into a day × measure cube
+(:class:`DailyAggregates`) from which totals, window sums (via cumulative
+sums), period roll‑ups and moments are derived.  Window boundaries are
+applied at day granularity.  With ``distribution_mode="sketch"`` stage 7
+is computed from mergeable per‑chunk sketches (:class:`MeasureSketch`)
+rather than whole columns, within the error bounds documented there.
+
 The module is intentionally verbose and well commented.  Users wishing
 to extend or customise behaviour (for example by adjusting the time
 window logic or statistical thresholds) should find the code easy to
@@ -78,24 +86,615 @@ node's output ports.  For example:
     validator = ExtendedMigrationValidator(input_table_1, input_table_2)
     out1, out2, out3, out4, out5, out6, out7 = validator.run_all()
 
+Pass ``stages=[...]`` (names from ``ExtendedMigrationValidator.STAGES``) to
+compute only the outputs of connected ports; the others come back empty.
+Pass ``include_profile=True`` to ``run_all()`` for an eighth table with the
+wall time, CPU time, memory and row counts of setup and each stage.
+
+For tables that do not fit in memory alongside their join, pass
+``chunked=True`` (optionally with ``memory_budget_mb`` and ``spill_dir``)
+to reconcile hash‑partitioned buckets from disk one at a time:
+
+    validator = ExtendedMigrationValidator(input_table_1, input_table_2,
+                                           chunked=True, memory_budget_mb=2048)
+
+Tables that already sit in a local SQLite or DuckDB file can be validated
+in place, with the heavy stages run as SQL by the engine, through
+:class:`sql_backend.SqlPushdownValidator`.
+
 Author: OpenAI ChatGPT
 """
 
 from __future__ import annotations
 
+import contextlib
+import copy
+import functools
+import json
+import multiprocessing
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import resource_tracker, shared_memory
+
 import pandas as pd
 import numpy as np
-from typing import List, Optional, Tuple, Dict, Any
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Dict, Any
 from dataclasses import dataclass, field
+from statistics import NormalDist
 
 try:
     # SciPy is available in this environment; use it for statistical tests.
-    from scipy.stats import ks_2samp, chisquare  # type: ignore
+    from scipy.stats import ks_2samp, chisquare, kstwobign  # type: ignore
     _has_scipy = True
 except ImportError:
     # Fallback if SciPy is unavailable (the KS test will be approximated later)
     _has_scipy = False
 
+try:
+    # Process peak RSS for the stage profile (not available on Windows)
+    import resource  # type: ignore
+    _has_resource = True
+except ImportError:
+    _has_resource = False
+
+try:
+    # Streaming Parquet / Arrow IPC writers for output_dir; state store results
+    import pyarrow as pa  # type: ignore
+    import pyarrow.ipc  # type: ignore  # noqa: F401
+    import pyarrow.parquet as pq  # type: ignore
+    _has_pyarrow = True
+except ImportError:
+    _has_pyarrow = False
+
+try:
+    # Optional execution backend for joins and aggregations (backend="polars")
+    import polars as pl  # type: ignore
+    _has_polars = True
+except ImportError:
+    _has_polars = False
+
+# One bucket's slice of outputs 4 and 5: mismatch rows, GCP row positions,
+# validation_status and mismatch_details for those rows
+BucketResult = Tuple[pd.DataFrame, np.ndarray, np.ndarray, np.ndarray]
+
+
+@dataclass
+class DailyAggregates:
+    """Day × measure aggregate cube of one source, built in a single scan.
+
+    Every array has one row per *slot*: one slot per distinct date (in
+    ``days`` order, at day granularity) followed by a final slot holding
+    the rows whose date is missing (or all rows when there is no date
+    column).  Per slot and measure it keeps the non‑null count, the sum
+    and the sum of squared deviations from the slot mean (``m2``), which
+    is enough to derive totals, any date‑range sum via cumulative sums
+    and exact mean/variance via Chan's parallel merge of moments.
+    """
+
+    days: pd.DatetimeIndex
+    rows: np.ndarray
+    counts: np.ndarray
+    sums: np.ndarray
+    m2: np.ndarray
+
+    @property
+    def undated_rows(self) -> int:
+        return int(self.rows[-1])
+
+    def totals(self) -> np.ndarray:
+        """Skip‑NaN sum of every measure over all rows."""
+        return self.sums.sum(axis=0)
+
+    def range_sums(self, start: Any, end: Any) -> np.ndarray:
+        """Sum of every measure over dated rows with ``start <= day <= end``.
+
+        ``start`` and ``end`` may also be equal‑length arrays of dates, in
+        which case one row of sums is returned per window.
+        """
+        cumulative = np.vstack([np.zeros((1, self.sums.shape[1])), np.cumsum(self.sums[:-1], axis=0)])
+        lo = self.days.searchsorted(start, side="left")
+        hi = self.days.searchsorted(end, side="right")
+        return cumulative[hi] - cumulative[lo]
+
+    def moments(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (count, mean, population variance) of every measure."""
+        count = self.counts.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.sums.sum(axis=0) / count
+            slot_mean = self.sums / self.counts
+            spread = np.where(self.counts > 0, self.counts * (slot_mean - mean) ** 2, 0.0)
+            variance = (self.m2.sum(axis=0) + spread.sum(axis=0)) / count
+        return count, mean, variance
+
+    @classmethod
+    def from_day_groups(cls, days: pd.Series, rows: np.ndarray, counts: np.ndarray,
+                        sums: np.ndarray, m2: np.ndarray) -> "DailyAggregates":
+        """Build the cube from per‑day aggregates computed elsewhere (an engine's ``GROUP BY`` day).
+
+        ``days`` holds one day per group, in any order, with ``NaT`` for the
+        group of undated rows; the other arrays are aligned with it (one row
+        per group, one column per measure).  Missing sums count as zero.
+        """
+        days = pd.Series(days, dtype="datetime64[ns]").reset_index(drop=True)
+        order = np.argsort(days.to_numpy(), kind="stable")  # NaT sorts last
+        dated = days.notna().to_numpy()[order]
+        n_days = int(dated.sum())
+
+        def slots(values: np.ndarray) -> np.ndarray:
+            values = np.asarray(values, dtype="float64")[order]
+            block = np.zeros((n_days + 1,) + values.shape[1:])
+            block[:n_days] = values[dated]
+            block[n_days] = values[~dated].sum(axis=0)
+            return np.nan_to_num(block, nan=0.0)
+
+        return cls(days=pd.DatetimeIndex(days.to_numpy()[order][dated]), rows=slots(rows).astype("int64"),
+                   counts=slots(counts), sums=slots(sums), m2=slots(m2))
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per slot: ``day`` (``NaT`` for the undated slot), ``rows`` and per measure ``j``
+        the columns ``c{j}``, ``s{j}`` and ``q{j}`` (count, sum, ``m2``)."""
+        frame = pd.DataFrame({"day": self.days.append(pd.DatetimeIndex([pd.NaT])).astype("datetime64[ns]"),
+                              "rows": self.rows})
+        for j in range(self.sums.shape[1]):
+            frame[f"c{j}"], frame[f"s{j}"], frame[f"q{j}"] = self.counts[:, j], self.sums[:, j], self.m2[:, j]
+        return frame
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "DailyAggregates":
+        """Rebuild a cube from :meth:`to_frame` rows; frames of disjoint days may be concatenated first."""
+        k = (frame.shape[1] - 2) // 3
+
+        def block(prefix: str) -> np.ndarray:
+            return frame[[f"{prefix}{j}" for j in range(k)]].to_numpy(dtype="float64").reshape(len(frame), k)
+
+        return cls.from_day_groups(frame["day"], frame["rows"].to_numpy(), block("c"), block("s"), block("q"))
+
+
+@dataclass
+class MeasureSketch:
+    """Mergeable streaming summary of one measure: moments, extremes and a quantile sketch.
+
+    Moments are kept with Welford/Chan updates (exact up to rounding).
+    Quantiles use a KLL‑style sketch: level ``h`` holds items of weight
+    ``2**h`` and a full level is sorted and every other item promoted to
+    the next level.  Offsets alternate deterministically so that results
+    are reproducible.  While fewer than ``k`` values have been seen the
+    sketch is exact.  Beyond that :attr:`rank_error` bounds the rank error
+    of any value from the compactions that actually took place (recorded
+    in ``weight_sq``), so the allowance grows with the number of values
+    instead of being fixed; the KS floor in stage 7 subtracts it.  Raise
+    ``k`` (``sketch_k`` on the validator) for a tighter allowance.
+    Sketches built from disjoint chunks can be merged in any order.
+    """
+
+    k: int = 200
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = np.inf
+    max: float = -np.inf
+    levels: List[np.ndarray] = field(default_factory=lambda: [np.empty(0)])
+    compactions: int = 0
+    weight_sq: float = 0.0
+
+    def update(self, values: np.ndarray) -> "MeasureSketch":
+        """Add a chunk of values (NaNs are ignored)."""
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if len(values):
+            chunk = MeasureSketch(k=self.k, count=len(values), mean=float(values.mean()),
+                                  m2=float(((values - values.mean()) ** 2).sum()),
+                                  min=float(values.min()), max=float(values.max()), levels=[values])
+            self.merge(chunk)
+        return self
+
+    def merge(self, other: "MeasureSketch") -> "MeasureSketch":
+        """Fold ``other`` into this sketch."""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.weight_sq += other.weight_sq
+        for h, items in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            # Lower levels get geometrically smaller capacities, as in KLL
+            capacity = max(2, int(np.ceil(self.k * (2.0 / 3.0) ** (len(self.levels) - h - 1))))
+            items = self.levels[h]
+            if len(items) > capacity:
+                items = np.sort(items)
+                odd = len(items) % 2
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                offset = ((self.compactions * 0x9E3779B97F4A7C15) >> 40) & 1  # pseudo-random, reproducible
+                self.compactions += 1
+                self.weight_sq += 4.0 ** h
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], items[offset:len(items) - odd:2]])
+                self.levels[h] = items[len(items) - odd:]
+            h += 1
+
+    @property
+    def rank_error(self) -> float:
+        """Rank error allowance as a fraction of the count (0 while the sketch is exact).
+
+        Compacting a sorted level of weight ``w`` moves the rank of any value
+        by 0 or ``±w`` depending on the offset, so by Hoeffding's inequality
+        the summed error exceeds ``sqrt(2 * ln(2 / δ) * weight_sq)`` with
+        probability below ``δ = 1e-6``, where ``weight_sq`` is the sum of
+        ``w**2`` over every compaction behind this sketch (merged ones included).
+        """
+        if not self.weight_sq:
+            return 0.0
+        return float(np.sqrt(2.0 * np.log(2.0 / 1e-6) * self.weight_sq)) / self.count
+
+    @property
+    def variance(self) -> float:
+        """Population variance."""
+        return self.m2 / self.count if self.count else np.nan
+
+    def _weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lvl), 2.0 ** h) for h, lvl in enumerate(self.levels)])
+        order = np.argsort(items, kind="mergesort")
+        return items[order], weights[order]
+
+    def cdf(self, x: np.ndarray, side: str = "right") -> np.ndarray:
+        """Estimated fraction of values ``<= x`` (``side="right"``) or ``< x`` (``side="left"``)."""
+        items, weights = self._weighted_items()
+        if not len(items):
+            return np.full(np.shape(x), np.nan)
+        cumulative = np.concatenate([[0.0], np.cumsum(weights)])
+        return cumulative[np.searchsorted(items, x, side=side)] / cumulative[-1]
+
+    def quantile(self, q: float) -> float:
+        """Estimated ``q`` quantile, interpolated like ``Series.quantile`` while the sketch is exact."""
+        items, weights = self._weighted_items()
+        if not len(items):
+            return np.nan
+        if (weights == 1.0).all():
+            return float(np.quantile(items, q))
+        cumulative = np.cumsum(weights)
+        return float(items[min(np.searchsorted(cumulative, q * cumulative[-1], side="left"), len(items) - 1)])
+
+
+# ----------------------------------------------------------------------
+# Stage profiling
+# ----------------------------------------------------------------------
+PROFILE_COLUMNS = ["Stage", "Wall Seconds", "CPU Seconds", "Peak RSS MB", "Traced Peak MB",
+                   "GCP Rows", "EDW Rows", "Output Rows", "Error"]
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB (NaN where unavailable)."""
+    if not _has_resource:
+        return np.nan
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def _output_rows(result: Any) -> str:
+    """Row count(s) of a stage result, e.g. ``"12"`` or ``"3 / 1000"`` for a pair of tables."""
+    results = result if isinstance(result, tuple) else (result,)
+    return " / ".join(str(len(r)) for r in results if hasattr(r, "__len__"))
+
+
+def _profiled(stage: str) -> Callable:
+    """Record wall/CPU time, memory and row counts of a validator stage.
+
+    Every call appends one event to ``self._profile`` and passes it to
+    ``self.profile_hook``.  A stage called from within another stage is
+    recorded as ``outer/inner``; the outer stage's figures include it.
+    """
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self: "ExtendedMigrationValidator", *args: Any, **kwargs: Any) -> Any:
+            stack = self._profile_stack
+            frame = {"name": "/".join([f["name"] for f in stack] + [stage])}
+            if self.trace_memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    frame["started_tracing"] = True
+                current, peak = tracemalloc.get_traced_memory()
+                if stack:
+                    stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+                tracemalloc.reset_peak()
+                frame["start"], frame["peak"] = current, current
+            gcp, edw = (self.gcp, self.edw) if "gcp" in self.__dict__ else (self.gcp_df, self.edw_df)
+            stack.append(frame)
+            wall, cpu = time.perf_counter(), time.process_time()
+            result, error = None, ""
+            try:
+                result = method(self, *args, **kwargs)
+                return result
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                raise
+            finally:
+                event = {
+                    "Stage": frame["name"],
+                    "Wall Seconds": time.perf_counter() - wall,
+                    "CPU Seconds": time.process_time() - cpu,
+                    "Peak RSS MB": _peak_rss_mb(),
+                    "Traced Peak MB": np.nan,
+                    "GCP Rows": len(gcp),
+                    "EDW Rows": len(edw),
+                    "Output Rows": _output_rows(result) if not error else "",
+                    "Error": error,
+                }
+                stack.pop()
+                if self.trace_memory:
+                    peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                    event["Traced Peak MB"] = (peak - frame["start"]) / 2 ** 20
+                    if stack:
+                        stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+                    if frame.get("started_tracing"):
+                        tracemalloc.stop()
+                self._profile.append(event)
+                if self.profile_hook is not None:
+                    self.profile_hook(dict(event))
+        return wrapper
+    return decorate
+
+
+# ----------------------------------------------------------------------
+# pandas‑compatible row hashing on Polars
+# ----------------------------------------------------------------------
+_U64_NULL = np.iinfo("uint64").max
+_I64_NAT = np.iinfo("int64").min
+
+
+def _pl_mix(expr: "pl.Expr") -> "pl.Expr":
+    """The splitmix64 finaliser :func:`pandas.util.hash_array` applies to 64‑bit values."""
+    expr = expr ^ (expr // (1 << 30))
+    expr = expr * pl.lit(0xBF58476D1CE4E5B9, dtype=pl.UInt64)
+    expr = expr ^ (expr // (1 << 27))
+    expr = expr * pl.lit(0x94D049BB133111EB, dtype=pl.UInt64)
+    return expr ^ (expr // (1 << 31))
+
+
+def _pl_combine(exprs: List["pl.Expr"]) -> "pl.Expr":
+    """Combine column hashes into a row hash as :func:`pandas.util.hash_pandas_object` does."""
+    out, mult = pl.lit(0x345678, dtype=pl.UInt64), 1000003
+    for i, expr in enumerate(exprs):
+        out = (out ^ expr) * pl.lit(mult, dtype=pl.UInt64)
+        mult += 82520 + 2 * (len(exprs) - i)
+    return out + pl.lit(97531, dtype=pl.UInt64)
+
+
+def _pl_column_hash(name: str, values: pd.Series, hash_key: str) -> Tuple[Any, "pl.Expr"]:
+    """A column as Polars input under ``name``, and the expression hashing it.
+
+    Numbers, booleans and datetimes go in as their bits and are mixed by
+    :func:`_pl_mix`.  Categoricals hash their (few) categories in pandas and
+    look up the codes in Polars; other columns are hashed by pandas outright.
+    """
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        table = pd.util.hash_array(np.asarray(dtype.categories), hash_key=hash_key, categorize=False)
+        # Code -1 (missing) wraps round to the null hash appended last
+        table = pl.Series(np.append(table, np.uint64(_U64_NULL)))
+        return values.cat.codes.to_numpy(), pl.lit(table).gather(pl.col(name))
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufmM" and dtype.itemsize <= 8:
+        array = values.to_numpy()
+        if dtype.kind != "b":
+            array = array.view(f"u{dtype.itemsize}")
+        return array.astype("uint64", copy=False), _pl_mix(pl.col(name))
+    return pd.util.hash_array(values.to_numpy(), hash_key=hash_key), pl.col(name)
+
+
+# ----------------------------------------------------------------------
+# Sort-merge join on integer key codes
+# ----------------------------------------------------------------------
+def _is_sorted(codes: np.ndarray) -> bool:
+    return bool(len(codes) < 2 or (codes[1:] >= codes[:-1]).all())
+
+
+def _sort_merge_positions(gcp_codes: np.ndarray, edw_codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Full outer join of two unique integer key arrays.
+
+    Returns, for every key of the union in ascending order, its position in
+    ``gcp_codes`` and in ``edw_codes`` (``-1`` where the side lacks it).
+    Each side is sorted unless its codes already ascend, and the sorted
+    sides are merged with binary searches – no hash table is built.  A
+    key's place in the union is the number of distinct smaller keys: the
+    smaller GCP keys plus the smaller keys that only EDW has.
+    """
+    gcp_order = np.arange(len(gcp_codes)) if _is_sorted(gcp_codes) else np.argsort(gcp_codes, kind="stable")
+    edw_order = np.arange(len(edw_codes)) if _is_sorted(edw_codes) else np.argsort(edw_codes, kind="stable")
+    gcp_sorted, edw_sorted = gcp_codes[gcp_order], edw_codes[edw_order]
+    edw_before = np.searchsorted(edw_sorted, gcp_sorted, side="left")
+    gcp_before = np.searchsorted(gcp_sorted, edw_sorted, side="left")
+    if len(gcp_sorted):
+        edw_only = gcp_sorted[np.minimum(gcp_before, len(gcp_sorted) - 1)] != edw_sorted
+    else:
+        edw_only = np.ones(len(edw_sorted), dtype=bool)
+    edw_only_before = np.r_[0, np.cumsum(edw_only)]
+    gcp_slot = np.arange(len(gcp_sorted)) + edw_only_before[edw_before]
+    edw_slot = gcp_before + edw_only_before[:-1]
+    size = len(gcp_sorted) + int(edw_only.sum())
+    gcp_at = np.full(size, -1, dtype="int64")
+    edw_at = np.full(size, -1, dtype="int64")
+    gcp_at[gcp_slot] = gcp_order
+    edw_at[edw_slot] = edw_order
+    return gcp_at, edw_at
+
+
+def _polars_join_positions(gcp_keys: np.ndarray, edw_keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Full outer join of two unique key arrays as a Polars lazy hash join.
+
+    Returns, for every key of the union, its position in ``gcp_keys`` and
+    in ``edw_keys`` (``-1`` where the side lacks it), like
+    :func:`_sort_merge_positions` but in the join's own order.  Numeric keys
+    are handed to Polars without copying; only positions come back.
+    """
+    gcp = pl.DataFrame({"key": gcp_keys}).with_row_index("gcp").lazy()
+    edw = pl.DataFrame({"key": edw_keys}).with_row_index("edw").lazy()
+    joined = (gcp.join(edw, on="key", how="full", coalesce=True)
+              .select(pl.col("gcp").cast(pl.Int64).fill_null(-1), pl.col("edw").cast(pl.Int64).fill_null(-1))
+              .collect())
+    return joined["gcp"].to_numpy(), joined["edw"].to_numpy()
+
+
+# ----------------------------------------------------------------------
+# Streaming output files
+# ----------------------------------------------------------------------
+class _ChunkWriter:
+    """Append DataFrame chunks to one Parquet or Arrow IPC file.
+
+    The schema is taken from the first chunk, with all‑null columns typed as
+    strings; later chunks are converted to it, so a chunk where a column
+    happens to be all NaN still fits.
+    """
+
+    SUFFIXES = {"parquet": ".parquet", "ipc": ".arrow"}
+
+    def __init__(self, path: str, fmt: str) -> None:
+        if not _has_pyarrow:
+            raise ImportError("output_dir requires pyarrow (pip install pyarrow)")
+        self.path, self.fmt = path, fmt
+        self.rows = 0
+        self._schema: Optional["pa.Schema"] = None
+        self._writer: Any = None
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self._schema is None:
+            schema = pa.Schema.from_pandas(frame, preserve_index=False)
+            self._schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in schema])
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, self._schema)
+        self._writer.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+        self.rows += len(frame)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _frame_to_ipc(frame: pd.DataFrame) -> bytes:
+    """Serialise ``frame`` as Arrow IPC stream bytes (how the state store keeps results)."""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _frame_from_ipc(blob: bytes) -> pd.DataFrame:
+    """Read a frame written by :func:`_frame_to_ipc`; data only, nothing is executed.
+
+    Arrow has one null, so missing values in object columns come back as
+    NaN, the value the outer join fills in.
+    """
+    frame = pa.ipc.open_stream(blob).read_all().to_pandas()
+    for c in frame.columns[frame.dtypes == object]:
+        frame[c] = frame[c].where(frame[c].notna(), np.nan)
+    return frame
+
+
+# ----------------------------------------------------------------------
+# Arrays shared with process pool workers
+# ----------------------------------------------------------------------
+class _SharedArrays:
+    """NumPy arrays placed in shared memory once, for pool workers to map.
+
+    Only ``specs`` (block name, dtype and shape per array) is pickled to a
+    worker, which maps the blocks with :func:`_attach_shared` and reads or
+    writes the row ranges it was given.  The blocks are released on exit.
+    """
+
+    def __init__(self) -> None:
+        self.specs: Dict[str, Tuple[str, str, Tuple[int, ...]]] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        self._blocks: List[shared_memory.SharedMemory] = []
+
+    def add(self, name: str, values: Optional[np.ndarray] = None, dtype: Any = None,
+            shape: Tuple[int, ...] = ()) -> np.ndarray:
+        """Share a copy of ``values``, or an uninitialised array of ``dtype`` and ``shape``."""
+        if values is not None:
+            values = np.ascontiguousarray(values)
+            dtype, shape = values.dtype, values.shape
+        dtype = np.dtype(dtype)
+        block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+        self._blocks.append(block)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        if values is not None:
+            array[...] = values
+        self.specs[name] = (block.name, dtype.str, shape)
+        self.arrays[name] = array
+        return array
+
+    def __enter__(self) -> "_SharedArrays":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.arrays.clear()
+        for block in self._blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass  # a view is still alive; the mapping goes with it
+            block.unlink()
+
+
+@contextlib.contextmanager
+def _attach_shared(specs: Dict[str, Tuple[str, str, Tuple[int, ...]]]) -> Iterator[Dict[str, np.ndarray]]:
+    """Map the blocks of a :class:`_SharedArrays` in a worker process."""
+    blocks = {name: shared_memory.SharedMemory(name=block) for name, (block, _, _) in specs.items()}
+    arrays = {name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=blocks[name].buf)
+              for name, (_, dtype, shape) in specs.items()}
+    try:
+        yield arrays
+    finally:
+        arrays.clear()
+        for block in blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                pass
+
+
+# ----------------------------------------------------------------------
+# Tolerance comparison of measure blocks
+# ----------------------------------------------------------------------
+def _compare_blocks(gcp: np.ndarray, edw: np.ndarray, atol: Any, rtol: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Compare two float blocks whose last axis is the measures, in one pass.
+
+    ``atol`` and ``rtol`` are scalars or one value per measure.  Returns the
+    boolean mismatch matrix, with the semantics of ``~np.isclose(gcp, edw,
+    equal_nan=True)``, and the difference matrix ``gcp - edw`` it was
+    derived from.
+    """
+    with np.errstate(invalid="ignore", over="ignore"):
+        diff = gcp - edw
+        close = np.abs(diff) <= atol + rtol * np.abs(edw)
+    # Infinite differences are only close when both sides hold the same infinity
+    close &= np.isfinite(diff)
+    close |= gcp == edw
+    close |= np.isnan(gcp) & np.isnan(edw)
+    return ~close, diff
+
 
 @dataclass
 class ExtendedMigrationValidator:
@@ -106,6 +705,95 @@ class ExtendedMigrationValidator:
     Internally it discovers dimension, measure and date columns without
     any hardcoded names.  Results are gathered into a variety of
     DataFrames to aid analysis.
+
+    Setting ``chunked=True`` switches stages 4 and 5 to an out‑of‑core
+    reconciliation that joins hash buckets spilled to ``spill_dir`` one
+    at a time, sized so that each join fits in ``memory_budget_mb``.
+    Together with ``output_dir`` no step holds anything as long as the
+    tables, so peak memory stays flat as they grow.
+
+    ``n_workers > 1`` runs key hashing and sequencing, the bucketed join
+    of stages 4 and 5 and the sketches in one process pool per
+    :meth:`run_stages` call, with each concurrently joined bucket sized to
+    fit ``worker_memory_mb``; the outputs match the serial path.  Workers
+    read table data from shared memory or spilled bucket files, so only
+    row ranges and file names pass through the pool's pipes.
+
+    ``digest_prune=True`` first compares order‑independent digests of both
+    sides level by level (table, partition, date, dimension prefixes) and
+    joins only the slices whose digests differ; the number of rows skipped
+    as proven identical is added to the summary (see :meth:`run_digest_diff`).
+
+    ``state_store`` names a SQLite file holding per‑partition fingerprints
+    (row counts and content digests of both sides), reconciliation
+    results and daily row counts and measure sums of both sides, stored
+    as Arrow IPC bytes, from the previous run; only partitions whose
+    fingerprint changed are reconciled and aggregated again, and outputs
+    2, 3 and 6 are rebuilt from the stored days of the others.  Output 1
+    (schema, dtypes and null counts of every column) and the quantiles of
+    output 7 need every row and are always computed in full.  It needs
+    pyarrow and rows matched on the date (with ``key_cols``, the date
+    among them).  ``full_rebuild=True`` ignores the stored results and
+    rewrites the store.
+    ``schema_cache`` names a JSON file caching discovered roles per schema
+    signature (see :meth:`_discover_roles`).
+
+    ``distribution_mode="sketch"`` derives stage 7 from mergeable
+    :class:`MeasureSketch` summaries built chunk by chunk (in the process
+    pool when ``n_workers > 1``) instead of whole materialised columns.
+
+    ``sample_rate`` (e.g. ``0.01``) reconciles only the dimension groups
+    whose key hash falls in the sample, so the same keys are chosen on both
+    sides; unsampled GCP rows are annotated ``Not Sampled`` and
+    :meth:`run_sample_estimates` reports mismatch rates with ``confidence``
+    intervals.  If the estimated mismatch rate exceeds
+    ``escalate_threshold`` the exact reconciliation runs instead.
+
+    When grand totals disagree, :meth:`run_variance_attribution` walks
+    dimension combinations breadth‑first over grouped sums, pruning slices
+    below ``min_share`` of each measure's difference, and returns the few
+    slices that explain most of it without joining any rows.
+
+    Non‑date dimensions are dictionary‑encoded with one dictionary per
+    column shared by both sides (``encode_dimensions``, on by default) and
+    decoded only in the outputs.
+
+    Setup and every ``run_*`` stage are profiled (wall and CPU time, peak
+    RSS, input and output row counts); ``run_all(include_profile=True)``
+    appends the table as an eighth output and ``profile_hook`` receives
+    each event as it is recorded.  ``trace_memory=True`` adds the peak
+    :mod:`tracemalloc` allocation per stage, at some cost in speed.
+
+    Rows are matched on a 64‑bit integer key built with vectorised
+    hashing, on first use by the stages that match rows.  Outputs 4 and 5 both carry it as ``__comparison_id__``, so
+    mismatch rows join back to the annotated GCP rows; ``readable_keys``
+    (on by default) adds the familiar ``<dims>#<seq>`` string as
+    ``__comparison_label__`` for the rows of the mismatch report only.
+
+    ``measure_tolerances`` maps measures to their own ``(atol, rtol)``,
+    overriding ``atol`` and ``rtol`` for those measures in every stage;
+    all measures are compared at once as 2‑D blocks (see
+    :meth:`_compare_measures`).
+
+    ``output_dir`` writes outputs 4 and 5 to ``4_mismatches`` and
+    ``5_annotated_gcp`` files there (``output_format`` ``"parquet"`` or
+    ``"ipc"``), chunk by chunk as the reconciliation produces them, and
+    returns a compact preview and counts in their place (see
+    :meth:`_stream_reconciliation`).  In every mode output 5 is built by
+    attaching the status columns by row position, never by merging.
+
+    ``key_cols`` declares a business key instead: those columns must
+    identify rows uniquely on each side (a ``ValueError`` says otherwise),
+    duplicate sequencing is skipped, the readable label is ``<keys>`` and
+    stages 4 and 5 join with an integer‑coded sort‑merge (see
+    :meth:`_build_key_codes`).  Key columns are never treated as measures.
+
+    ``backend="polars"`` runs the key hashing, duplicate sequencing and
+    collision check, the daily cubes behind stages 2, 3, 6 and 7 and the
+    hash join of stages 4 and 5 on Polars lazy frames (multithreaded, with
+    the columns they need passed without copying); tables still come in and
+    go out as pandas.  Results match the pandas backend, comparison keys
+    bit for bit and sums up to summation order.
     """
 
     gcp_df: pd.DataFrame
@@ -114,44 +802,159 @@ class ExtendedMigrationValidator:
     rtol: float = 1e-9
     partition_freq: str = "M"
     psi_bins: int = 10
+    readable_keys: bool = True
+    chunked: bool = False
+    memory_budget_mb: float = 1024.0
+    spill_dir: Optional[str] = None
+    n_workers: int = 1
+    digest_prune: bool = False
+    state_store: Optional[str] = None
+    full_rebuild: bool = False
+    distribution_mode: str = "exact"
+    sketch_k: int = 200
+    encode_dimensions: bool = True
+    schema_cache: Optional[str] = None
+    sample_rate: Optional[float] = None
+    escalate_threshold: Optional[float] = None
+    confidence: float = 0.95
+    worker_memory_mb: float = 1024.0
+    profile_hook: Optional[Callable[[Dict[str, Any]], None]] = None
+    trace_memory: bool = False
+    key_cols: Optional[List[str]] = None
+    measure_tolerances: Optional[Dict[str, Tuple[float, float]]] = None
+    output_dir: Optional[str] = None
+    output_format: str = "parquet"
+    preview_rows: int = 1000
+    backend: str = "pandas"
     date_col: Optional[str] = field(init=False, default=None)
     measure_cols: List[str] = field(init=False, default_factory=list)
     dimension_cols: List[str] = field(init=False, default_factory=list)
     key_col: str = field(init=False, default="__comparison_id__")
+    label_col: str = field(init=False, default="__comparison_label__")
+
+    # Position of a GCP row in ``self.gcp``; carried through chunked joins
+    _GCP_ROW_COL = "__gcp_row__"
+    # Rough peak memory of a join relative to the size of its two inputs
+    _MERGE_MEMORY_FACTOR = 4.0
+    # Hash keys for the 64‑bit dimension hash and its independent collision check
+    _HASH_KEY = "0123456789123456"
+    _KEY_CODE_COL = "__key_code__"
+    _HASH_KEY_CHECK = "gcp_vs_edw_check"
+    # GCP rows decoded and written per chunk of the streamed output 5
+    _WRITE_CHUNK_ROWS = 1_000_000
+    # Values parsed per candidate column before committing to a full date conversion
+    _ROLE_SAMPLE_ROWS = 10_000
+    # Output names in run_all order (see run_stages)
+    STAGES = ("summary", "grand_totals", "time_windows", "mismatches", "annotated_gcp",
+              "partition_checks", "distribution_stats")
+    # Rows per chunk when building distribution sketches
+    _SKETCH_CHUNK_ROWS = 1_000_000
 
     def __post_init__(self) -> None:
-        # Work on copies to avoid mutating the inputs
-        self.gcp = self.gcp_df.copy().reset_index(drop=True)
-        self.edw = self.edw_df.copy().reset_index(drop=True)
+        # Stage profile events (see _profiled) and the stages currently running
+        self._profile: List[Dict[str, Any]] = []
+        self._profile_stack: List[Dict[str, Any]] = []
+        self._setup()
+
+    @_profiled("setup")
+    def _setup(self) -> None:
+        if self.backend not in ("pandas", "polars"):
+            raise ValueError(f"backend must be 'pandas' or 'polars', got {self.backend!r}")
+        if self.backend == "polars" and not _has_polars:
+            raise ImportError("backend='polars' requires polars (pip install polars)")
+
+        # Work on shallow copies: every change below replaces whole columns,
+        # so the inputs are never mutated and no column is copied up front
+        self.gcp = self.gcp_df.copy(deep=False)
+        self.edw = self.edw_df.copy(deep=False)
+        self.gcp.index = pd.RangeIndex(len(self.gcp))
+        self.edw.index = pd.RangeIndex(len(self.edw))
 
         # Normalise column names by stripping whitespace
         self.gcp.columns = [str(c).strip() for c in self.gcp.columns]
         self.edw.columns = [str(c).strip() for c in self.edw.columns]
 
         # Remove duplicate named columns (retain the first occurrence)
-        self.gcp = self.gcp.loc[:, ~self.gcp.columns.duplicated()]
-        self.edw = self.edw.loc[:, ~self.edw.columns.duplicated()]
+        if self.gcp.columns.duplicated().any():
+            self.gcp = self.gcp.loc[:, ~self.gcp.columns.duplicated()]
+        if self.edw.columns.duplicated().any():
+            self.edw = self.edw.loc[:, ~self.edw.columns.duplicated()]
 
         # Standardise dtypes and string values
         self._normalise_dtypes_and_strings(self.gcp)
         self._normalise_dtypes_and_strings(self.edw)
 
+        if self.key_cols:
+            self.key_cols = list(self.key_cols)
+            missing = [c for c in self.key_cols if c not in self.gcp.columns or c not in self.edw.columns]
+            if missing:
+                raise ValueError(f"key_cols {missing} are not present in both tables")
+
         # Discover roles (date, measures, dimensions)
         self._discover_roles()
 
+        # Roles are all shared columns, so one-sided columns are only needed
+        # by name (output 1).  EDW keeps just its role columns; GCP keeps its
+        # own, uncopied, because output 5 annotates the whole GCP table.
+        gcp_names, edw_names = set(self.gcp.columns), set(self.edw.columns)
+        self._gcp_only = [c for c in self.gcp.columns if c not in edw_names]
+        self._edw_only = [c for c in self.edw.columns if c not in gcp_names]
+        for c in self._edw_only:
+            del self.edw[c]  # unlike a column selection, this keeps the other columns uncopied
+
         # Coerce types for numeric and dimension columns
         self._coerce_types(self.gcp)
         self._coerce_types(self.edw)
 
-        # Build a deterministic comparison key for row matching
-        self._build_comparison_ids(self.gcp)
-        self._build_comparison_ids(self.edw)
+        if self.measure_tolerances:
+            unknown = [m for m in self.measure_tolerances if m not in self.measure_cols]
+            if unknown:
+                raise ValueError(f"measure_tolerances names {unknown}, which are not measures")
+
+        # Dictionary-encode dimensions (one shared dictionary per column)
+        self._dictionaries: Dict[str, pd.CategoricalDtype] = {}
+        self._dictionary_nulls: Dict[str, Any] = {}
+        if self.encode_dimensions:
+            self._encode_dimensions()
+
+        # Order-preserving integer codes of a declared key, used by the sort-merge join
+        if self.key_cols:
+            self._build_key_codes()
+
+        # Comparison keys are built on first use by the stages that match rows
+        # (see _ensure_comparison_ids)
+        self._string_keys = False
+        self._keys_built = False
+
+        # Single-scan aggregates per side, built on first use by the aggregate stages
+        self._aggregates: Dict[str, DailyAggregates] = {}
+        # Period roll-ups of those cubes per (side, frequency), shared by stages 3 and 6
+        self._rollups: Dict[Tuple[str, str], pd.DataFrame] = {}
+        # Row positions left after the digest diff and its per-level report (see run_digest_diff)
+        self._digest_rows: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._digest_report: Optional[pd.DataFrame] = None
+        # Partition fingerprints compared with the state store (see _incremental_plan)
+        self._incremental: Optional[Dict[str, Any]] = None
+        # Per-side measure sketches for the sketch distribution mode
+        self._sketches: Dict[str, List[MeasureSketch]] = {}
+        # Process pool shared by the stages of a run when n_workers > 1 (see _run_pool)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Sampled rows, their reconciliation and estimates (see _sampled_reconciliation)
+        self._sample: Optional[Dict[str, Any]] = None
+        # Shared codes of the dimensions searched by run_variance_attribution (see _slice_dictionary)
+        self._slice_codes: Optional[Dict[str, Any]] = None
 
         # Print summary to console for user visibility in KNIME
         print(f"[Validator] Using date column: {self.date_col}")
         print(f"[Validator] Discovered measures: {self.measure_cols}")
         print(f"[Validator] Discovered dimensions: {self.dimension_cols}")
         print(f"[Validator] GCP rows: {len(self.gcp)}, EDW rows: {len(self.edw)}")
+        if self.state_store:
+            if not _has_pyarrow:
+                raise ImportError("state_store requires pyarrow (pip install pyarrow)")
+            if not self._incremental_enabled():
+                print("[Validator] Warning: state_store needs rows matched on a date column (include it in "
+                      "key_cols when declared); it is ignored and every run reconciles in full")
 
     # ----------------------------------------------------------------------
     # Helper methods
@@ -166,9 +969,65 @@ class ExtendedMigrationValidator:
         # Strip whitespace in strings (object dtype)
         for col in df.select_dtypes(include="object").columns:
             df[col] = df[col].where(df[col].isna(), df[col].astype(str).str.strip())
+        # Arrow-backed strings (e.g. from columnar_loader) are stripped in place of type
+        for col in df.select_dtypes(include="string").columns:
+            df[col] = df[col].str.strip()
+
+    @classmethod
+    def _role_sample(cls, series: pd.Series) -> pd.Series:
+        """Evenly strided sample of at most ``_ROLE_SAMPLE_ROWS`` non‑null values."""
+        values = series.dropna()
+        step = max(1, len(values) // cls._ROLE_SAMPLE_ROWS)
+        return values.iloc[::step].iloc[:cls._ROLE_SAMPLE_ROWS]
+
+    def _schema_signature(self) -> str:
+        """Column names and dtypes of both sides; role discovery depends on nothing else."""
+        return json.dumps([[(str(c), str(t)) for c, t in df.dtypes.items()] for df in (self.gcp, self.edw)])
+
+    def _load_cached_roles(self, signature: str) -> Optional[Dict[str, Any]]:
+        if not self.schema_cache or not os.path.exists(self.schema_cache):
+            return None
+        try:
+            with open(self.schema_cache) as fh:
+                return json.load(fh).get(signature)
+        except (OSError, ValueError):
+            return None
+
+    def _save_cached_roles(self, signature: str, roles: Dict[str, Any]) -> None:
+        profiles: Dict[str, Any] = {}
+        if os.path.exists(self.schema_cache):
+            try:
+                with open(self.schema_cache) as fh:
+                    profiles = json.load(fh)
+            except (OSError, ValueError):
+                profiles = {}
+        profiles[signature] = roles
+        tmp_path = f"{self.schema_cache}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(profiles, fh, indent=1)
+        os.replace(tmp_path, self.schema_cache)
 
     def _discover_roles(self) -> None:
-        """Identify date, measure and dimension columns based on dtype and names."""
+        """Identify date, measure and dimension columns based on dtype and names.
+
+        Name‑matched date candidates are first parsed on a bounded sample
+        and only converted in full when the sample parses.  With
+        ``schema_cache`` the resulting role map is stored in a JSON file
+        keyed by the column names and dtypes of both sides, and a later run
+        with the same signature skips discovery entirely.
+        """
+        signature = self._schema_signature() if self.schema_cache else None
+        roles = self._load_cached_roles(signature) if signature else None
+        if roles is not None:
+            print("[Validator] Using cached role profile")
+        else:
+            roles = self._infer_roles()
+            if signature:
+                self._save_cached_roles(signature, roles)
+        self._apply_roles(roles)
+
+    def _infer_roles(self) -> Dict[str, Any]:
+        """Infer the role map (date column per side, measures, dimensions)."""
         def find_date_column(df: pd.DataFrame) -> Optional[str]:
             # Prefer columns already of datetime type
             datetime_cols = df.select_dtypes(include=["datetime64[ns]", "datetime64[ns, UTC]"]).columns.tolist()
@@ -179,6 +1038,8 @@ class ExtendedMigrationValidator:
             candidates = [c for c in df.columns if any(token in c.lower() for token in ["date", "asof", "as_of", "dt", "day", "period"])]
             for col in candidates:
                 try:
+                    # Cheap rejection on a sample, then a single full conversion to confirm
+                    pd.to_datetime(self._role_sample(df[col]), errors="raise", infer_datetime_format=True, utc=False)
                     parsed = pd.to_datetime(df[col], errors="raise", infer_datetime_format=True, utc=False)
                     df[col] = parsed
                     return col
@@ -189,6 +1050,20 @@ class ExtendedMigrationValidator:
         # Detect date columns in both datasets
         gcp_date = find_date_column(self.gcp)
         edw_date = find_date_column(self.edw)
+
+        # Identify measure columns: numeric columns common to both (exclude booleans)
+        # (the date columns are excluded; they are converted to datetime when the roles are applied)
+        def numeric_columns(df: pd.DataFrame) -> List[str]:
+            cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            return [c for c in cols if df[c].dtype != bool and c not in (gcp_date, edw_date)]
+        gcp_measures = set(numeric_columns(self.gcp))
+        edw_measures = set(numeric_columns(self.edw))
+        return {"gcp_date": gcp_date, "edw_date": edw_date,
+                "measure_cols": sorted(gcp_measures.intersection(edw_measures))}
+
+    def _apply_roles(self, roles: Dict[str, Any]) -> None:
+        """Align and convert the date column and set measure and dimension columns from a role map."""
+        gcp_date, edw_date = roles["gcp_date"], roles["edw_date"]
         # Align the name if both exist but differ
         if gcp_date and edw_date and gcp_date != edw_date:
             if gcp_date not in self.edw.columns:
@@ -209,13 +1084,7 @@ class ExtendedMigrationValidator:
                         pass
                     df[self.date_col] = parsed
 
-        # Identify measure columns: numeric columns common to both (exclude booleans)
-        def numeric_columns(df: pd.DataFrame) -> List[str]:
-            cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            return [c for c in cols if df[c].dtype != bool]
-        gcp_measures = set(numeric_columns(self.gcp))
-        edw_measures = set(numeric_columns(self.edw))
-        self.measure_cols = sorted(gcp_measures.intersection(edw_measures))
+        self.measure_cols = [m for m in roles["measure_cols"] if m not in (self.key_cols or [])]
 
         # Dimensions are shared columns minus measures; include date if present
         shared = sorted(set(self.gcp.columns).intersection(set(self.edw.columns)))
@@ -232,89 +1101,587 @@ class ExtendedMigrationValidator:
             self.dimension_cols = ["__no_dimension__"]
 
     def _coerce_types(self, df: pd.DataFrame) -> None:
-        """Coerce measures to float64 and non-date dimensions to object."""
+        """Coerce measures to float64 and non-date dimensions (except numeric key columns) to object."""
         for col in self.measure_cols:
             df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
         for col in self.dimension_cols:
             if col == self.date_col:
                 continue
-            df[col] = df[col].astype("object")
+            if col in (self.key_cols or []) and pd.api.types.is_numeric_dtype(df[col]):
+                continue
+            if isinstance(df[col].dtype, pd.StringDtype):
+                # Arrow-backed strings mark missing values with pd.NA; use NaN like object columns
+                df[col] = df[col].astype("object").where(df[col].notna(), np.nan)
+            else:
+                df[col] = df[col].astype("object")
+
+    def _encode_dimensions(self) -> None:
+        """Store non‑date dimensions as integer codes into one dictionary shared by both sides.
+
+        Each column becomes a ``category`` with identical categories on GCP
+        and EDW, so grouping, hashing and joins work on the codes and a
+        value has the same code on both sides.  Hashes of categorical
+        columns equal those of the decoded values, so comparison keys are
+        unchanged.  Strings are restored by :meth:`_decode_dimensions` when
+        outputs are produced.  Declared key columns are unique per row, so a
+        dictionary would not shrink them and they are left as they are.
+        """
+        for c in self.dimension_cols:
+            if c == self.date_col or c in (self.key_cols or []):
+                continue
+            values = pd.Index(pd.unique(self.gcp[c]), dtype=object).append(pd.Index(pd.unique(self.edw[c]), dtype=object))
+            dtype = pd.CategoricalDtype(values.unique().dropna())
+            # Codes cannot tell None from NaN; remember which one to decode missing values to
+            nulls = values[values.isna()]
+            self._dictionary_nulls[c] = None if len(nulls) and all(v is None for v in nulls) else np.nan
+            self.gcp[c] = self.gcp[c].astype(dtype)
+            self.edw[c] = self.edw[c].astype(dtype)
+            self._dictionaries[c] = dtype
+
+    def _decode_dimensions(self, frame: pd.DataFrame, absent: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Turn encoded dimension columns of an output frame back into ``object`` values (in place).
+
+        Rows flagged in ``absent`` had no source values (e.g. EDW‑only rows of
+        an outer join) and decode to NaN, as they would without encoding.
+        """
+        for c in self._dictionaries:
+            if c in frame.columns and isinstance(frame[c].dtype, pd.CategoricalDtype):
+                decoded = frame[c].astype("object")
+                decoded = decoded.where(decoded.notna(), self._dictionary_nulls[c])
+                if absent is not None:
+                    decoded = decoded.where(~absent, np.nan)
+                frame[c] = decoded
+        return frame
+
+    @staticmethod
+    def _dimension_codes(df: pd.DataFrame, c: str) -> np.ndarray:
+        """Values of a dimension for grouping: integer codes for encoded columns, raw values otherwise."""
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            return df[c].cat.codes.to_numpy()
+        return df[c].to_numpy()
+
+    def _identity_cols(self) -> List[str]:
+        """Columns that identify a row (with its sequence number): ``key_cols`` if declared, else the dimensions."""
+        return self.key_cols or self.dimension_cols
+
+    def _dimension_strings(self, df: pd.DataFrame) -> pd.Series:
+        """Render the readable ``dim1|dim2|...`` label of each row (date at day granularity)."""
+        parts: Optional[pd.Series] = None
+        for c in self._identity_cols():
+            if c == self.date_col and pd.api.types.is_datetime64_any_dtype(df[c]):
+                col_part = df[c].dt.strftime("%Y-%m-%d").fillna("NaT")
+            elif isinstance(df[c].dtype, pd.CategoricalDtype):
+                # Encoded dimension: render missing values as the decoded null would be
+                col_part = df[c].astype(str).where(df[c].notna(), str(self._dictionary_nulls.get(c, np.nan)))
+            else:
+                col_part = df[c].astype(str).fillna("NaN")
+            parts = col_part if parts is None else parts.str.cat(col_part, sep="|")
+        return parts
+
+    def _dimension_hash(self, df: pd.DataFrame, hash_key: str = _HASH_KEY) -> pd.Series:
+        """Vectorised 64‑bit hash of the dimension values of each row.
+
+        Dates are normalised to the day, mirroring :meth:`_dimension_strings`,
+        so two rows share a hash exactly when they share a readable label
+        (barring hash collisions, which :meth:`_check_key_collisions` detects).
+        The Polars backend computes the same hash on Polars.
+        """
+        if self.backend == "polars":
+            return self._polars_dimension_hash(df, hash_key)
+        parts = {}
+        for c in self._identity_cols():
+            if c == self.date_col and pd.api.types.is_datetime64_any_dtype(df[c]):
+                parts[c] = df[c].dt.normalize()
+            else:
+                parts[c] = df[c]
+        return pd.util.hash_pandas_object(pd.DataFrame(parts, index=df.index), index=False, hash_key=hash_key)
+
+    def _polars_dimension_hash(self, df: pd.DataFrame, hash_key: str) -> pd.Series:
+        """:meth:`_dimension_hash` on Polars, bit for bit (keys are stored and reported, so the hash is fixed)."""
+        columns: Dict[str, Any] = {}
+        exprs = []
+        for i, c in enumerate(self._identity_cols()):
+            name, values = f"c{i}", df[c]
+            if c == self.date_col and isinstance(values.dtype, np.dtype) and values.dtype.kind == "M":
+                # Floor to the day in the column's own unit, leaving NaT as it is
+                day = int(np.timedelta64(1, "D") // np.timedelta64(1, np.datetime_data(values.dtype)[0]))
+                columns[name] = values.to_numpy().view("int64")
+                col = pl.col(name)
+                exprs.append(_pl_mix(pl.when(col == _I64_NAT).then(col).otherwise(col // day * day)
+                                     .reinterpret(signed=False)))
+                continue
+            if c == self.date_col and pd.api.types.is_datetime64_any_dtype(values):
+                values = values.dt.normalize()
+            columns[name], expr = _pl_column_hash(name, values, hash_key)
+            exprs.append(expr)
+        hashed = pl.LazyFrame(columns).select(_pl_combine(exprs)).collect().to_series()
+        return pd.Series(hashed.to_numpy(), index=df.index)
+
+    def _sequence_key(self, df: pd.DataFrame) -> pd.Series:
+        """The ``uint64`` comparison key: the hash of the dimension hash and the sequence number."""
+        if self.backend == "polars":
+            frame = pl.LazyFrame({"h": df["__dimension_hash__"].to_numpy(),
+                                  "seq": df["__row_sequence__"].to_numpy(dtype="int64")})
+            hashed = frame.select(_pl_combine([_pl_mix(pl.col("h")),
+                                               _pl_mix(pl.col("seq").reinterpret(signed=False))])).collect()
+            return pd.Series(hashed.to_series().to_numpy(), index=df.index)
+        return pd.util.hash_pandas_object(df[["__dimension_hash__", "__row_sequence__"]], index=False)
 
     def _build_comparison_ids(self, df: pd.DataFrame) -> None:
-        """Construct a stable comparison ID for each row to align duplicates."""
-        dims = self.dimension_cols
-
-        def dimension_hash(sub_df: pd.DataFrame) -> pd.Series:
-            parts: Optional[pd.Series] = None
-            for c in dims:
-                if c == self.date_col and pd.api.types.is_datetime64_any_dtype(sub_df[c]):
-                    col_part = sub_df[c].dt.strftime("%Y-%m-%d").fillna("NaT")
+        """Construct a stable comparison ID for each row to align duplicates.
+
+        The ID is a fixed‑width ``uint64`` combining the dimension hash with
+        the row's sequence number inside its dimension group.  Readable
+        ``<dims>#<seq>`` strings are only rendered for the rows that end up in
+        the mismatch report (see :meth:`_readable_keys`).
+
+        With ``key_cols`` the key identifies a row by itself, so there is no
+        sequencing: the ID is the key hash (or, after a collision, the
+        ``<keys>`` string).
+        """
+        if self._string_keys:
+            df["__dimension_hash__"] = self._dimension_strings(df)
+            df["__row_sequence__"] = self._row_sequence(df)
+            if self.key_cols:
+                df[self.key_col] = df["__dimension_hash__"]
+            else:
+                df[self.key_col] = df["__dimension_hash__"].str.cat(df["__row_sequence__"].astype(str), sep="#")
+            return
+        df["__dimension_hash__"] = self._dimension_hash(df)
+        df["__row_sequence__"] = self._row_sequence(df)
+        if self.key_cols:
+            df[self.key_col] = df["__dimension_hash__"]
+        else:
+            df[self.key_col] = self._sequence_key(df)
+
+    def _ensure_comparison_ids(self) -> None:
+        """Build the comparison keys of both sides unless already built.
+
+        Only the stages that match rows (reconciliation, the digest diff,
+        sampling and the state store) need them, so runs selecting other
+        stages skip the hashing, sequencing and collision check.
+        """
+        if not self._keys_built:
+            self._build_all_comparison_ids()
+
+    @_profiled("comparison_ids")
+    def _build_all_comparison_ids(self) -> None:
+        # Build a deterministic comparison key for row matching; fall back to
+        # string keys in the (astronomically unlikely) event of a hash collision
+        self._string_keys = False
+        columns = ({side: self._shared_key_columns(df) for side, df in (("gcp", self.gcp), ("edw", self.edw))}
+                   if self.n_workers > 1 else {})
+        if columns and all(v is not None for v in columns.values()):
+            with self._process_pool() as pool:
+                collided = self._build_pooled_comparison_ids(pool, columns)
+        else:
+            self._build_comparison_ids(self.gcp)
+            self._build_comparison_ids(self.edw)
+            collided = self._check_key_collisions()
+        if collided:
+            print("[Validator] 64-bit key collision detected; falling back to string keys")
+            self._string_keys = True
+            self._build_comparison_ids(self.gcp)
+            self._build_comparison_ids(self.edw)
+        self._keys_built = True
+
+    def _sequence_within_group(self, df: pd.DataFrame) -> np.ndarray:
+        """Number the rows of each dimension group deterministically (0, 1, 2, ...).
+
+        Rows are ordered inside their group by the raw date value, then by
+        every measure and finally by original position, so duplicate rows
+        pair up identically on both sides.  Groups are found by factorising
+        ``__dimension_hash__``; only rows of groups with more than one member
+        are sorted, and singleton groups (the common case) simply get 0.
+        The Polars backend numbers the duplicated rows with ``int_range``
+        over each hash, in the same order.
+        """
+        if self.backend == "polars":
+            return self._polars_sequence_within_group(df)
+        codes, _ = pd.factorize(df["__dimension_hash__"], sort=False)
+        seq = np.zeros(len(df), dtype="int64")
+        if len(df) == 0:
+            return seq
+        dup_rows = np.flatnonzero(np.bincount(codes)[codes] > 1)
+        if len(dup_rows) == 0:
+            return seq
+
+        # np.lexsort sorts by the last key first and places NaN last, like sort_values
+        sort_keys: List[np.ndarray] = [dup_rows]
+        for m in reversed(self.measure_cols):
+            sort_keys.append(df[m].to_numpy(dtype="float64")[dup_rows])
+        if (self.measure_cols and self.date_col in self.dimension_cols
+                and pd.api.types.is_datetime64_any_dtype(df[self.date_col])):
+            dates = df[self.date_col].to_numpy(dtype="datetime64[ns]")[dup_rows]
+            # NaT sorts last in sort_values; keep it last here too
+            sort_keys.append(np.where(np.isnat(dates), np.iinfo("int64").max, dates.view("int64")))
+        sort_keys.append(codes[dup_rows])
+        order = dup_rows[np.lexsort(sort_keys)]
+
+        # Position within each run of equal group codes
+        sorted_codes = codes[order]
+        positions = np.arange(len(order))
+        run_start = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+        seq[order] = positions - np.maximum.accumulate(np.where(run_start, positions, 0))
+        return seq
+
+    def _polars_sequence_within_group(self, df: pd.DataFrame) -> np.ndarray:
+        frame = {"h": df["__dimension_hash__"].to_numpy()}
+        order_by = []
+        if (self.measure_cols and self.date_col in self.dimension_cols
+                and pd.api.types.is_datetime64_any_dtype(df[self.date_col])):
+            frame["date"] = df[self.date_col].to_numpy(dtype="datetime64[ns]").view("int64")
+            # NaT sorts last, as in the pandas backend
+            order_by.append(pl.when(pl.col("date") == _I64_NAT).then(int(np.iinfo("int64").max)).otherwise(pl.col("date")))
+        for j, m in enumerate(self.measure_cols):
+            frame[f"m{j}"] = df[m].to_numpy(dtype="float64")
+            # + 0.0 turns -0.0 into 0.0 so the two tie, as they do in np.lexsort
+            order_by.append(pl.col(f"m{j}") + 0.0)
+        dups = (pl.LazyFrame(frame).with_row_index("row").filter(pl.col("h").is_duplicated())
+                .select("row", pl.int_range(pl.len(), dtype=pl.Int64).over("h", order_by=order_by + [pl.col("row")])
+                        .alias("seq"))
+                .collect())
+        seq = np.zeros(len(df), dtype="int64")
+        seq[dups["row"].to_numpy()] = dups["seq"].to_numpy()
+        return seq
+
+    def _row_sequence(self, df: pd.DataFrame) -> np.ndarray:
+        """Sequence numbers for ``df``; a declared key needs no sequence, so every row gets 0."""
+        if self.key_cols:
+            return np.zeros(len(df), dtype="int64")
+        return self._sequence_within_group(df)
+
+    def _shared_key_columns(self, df: pd.DataFrame) -> Optional[Dict[str, Tuple[np.ndarray, Any]]]:
+        """The identity columns of ``df`` as plain arrays for shared memory, or ``None``.
+
+        Each column maps to its values and the dtype that rebuilds it in a
+        worker (``None``: use the values as they are).  Encoded and object
+        columns travel as integer codes with a categorical dtype, which
+        hashes exactly like the original values.  ``None`` means some column
+        (e.g. an extension or time zone aware dtype) has no such form and the
+        keys are built serially.
+        """
+        columns: Dict[str, Tuple[np.ndarray, Any]] = {}
+        for c in self._identity_cols():
+            values = df[c]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                columns[c] = (values.cat.codes.to_numpy(), values.dtype)
+            elif values.dtype == object:
+                codes, uniques = pd.factorize(values, sort=False)
+                columns[c] = (codes, pd.CategoricalDtype(uniques))
+            elif isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufcmM":
+                columns[c] = (values.to_numpy(), None)
+            else:
+                return None
+        return columns
+
+    def _build_pooled_comparison_ids(self, pool: ProcessPoolExecutor,
+                                     columns: Dict[str, Dict[str, Tuple[np.ndarray, Any]]]) -> bool:
+        """Build both sides' comparison keys in ``pool``; return True on a key collision.
+
+        The identity columns (from :meth:`_shared_key_columns`), measures
+        and result arrays of both sides are placed in shared memory once, so
+        only block names and row ranges or partition numbers are pickled.
+        Workers hash row ranges (both hash keys), then sequence the rows and
+        hash the keys by partition of the dimension hash, so every group is
+        sequenced inside one worker, and finally check the partitions for
+        collisions.  The keys equal those of the serial path.
+        """
+        n_parts = self.n_workers
+        view = self._worker_view()
+        sides = (("gcp", self.gcp), ("edw", self.edw))
+        with _SharedArrays() as shared:
+            for side, df in sides:
+                for c, (values, _) in columns[side].items():
+                    shared.add(f"{side}:{c}", values)
+                shared.add(f"{side}:hash", dtype="uint64", shape=(len(df),))
+                shared.add(f"{side}:check", dtype="uint64", shape=(len(df),))
+                if self.key_cols:
+                    continue
+                shared.add(f"{side}:seq", dtype="int64", shape=(len(df),))
+                shared.add(f"{side}:key", dtype="uint64", shape=(len(df),))
+                measures = shared.add(f"{side}:measures", dtype="float64", shape=(len(self.measure_cols), len(df)))
+                for j, m in enumerate(self.measure_cols):
+                    measures[j] = df[m].to_numpy(dtype="float64")
+                if (self.measure_cols and self.date_col in self.dimension_cols
+                        and pd.api.types.is_datetime64_any_dtype(df[self.date_col])):
+                    shared.add(f"{side}:date", df[self.date_col].to_numpy(dtype="datetime64[ns]"))
+
+            tasks = []
+            for side, df in sides:
+                dtypes = {c: dtype for c, (_, dtype) in columns[side].items()}
+                edges = np.linspace(0, len(df), n_parts + 1).astype("int64")
+                tasks += [(side, dtypes, edges[p], edges[p + 1]) for p in range(n_parts)]
+            list(pool.map(_hash_task, repeat(view), repeat(shared.specs), *zip(*tasks)))
+            if not self.key_cols:
+                tasks = [(side, p) for side, _ in sides for p in range(n_parts)]
+                list(pool.map(_sequence_task, repeat(view), repeat(shared.specs), repeat(n_parts), *zip(*tasks)))
+            collided = any(pool.map(_collision_task, repeat(shared.specs), repeat(n_parts), range(n_parts)))
+
+            for side, df in sides:
+                arrays = {name.split(":", 1)[1]: array for name, array in shared.arrays.items()
+                          if name.startswith(f"{side}:")}
+                df["__dimension_hash__"] = arrays["hash"].copy()
+                if self.key_cols:
+                    df["__row_sequence__"] = np.zeros(len(df), dtype="int64")
+                    df[self.key_col] = df["__dimension_hash__"]
                 else:
-                    col_part = sub_df[c].astype(str).fillna("NaN")
-                parts = col_part if parts is None else parts.str.cat(col_part, sep="|")
-            return parts
-
-        def sequence_within_group(sub_df: pd.DataFrame) -> pd.Series:
-            if not self.measure_cols:
-                # If there are no numeric measures, assign sequence based on original order
-                return sub_df.groupby(dims, dropna=False).cumcount()
-            # Stable sort by dimensions then measures
-            tmp = sub_df.copy()
-            tmp["_row_order_"] = np.arange(len(tmp))
-            sort_cols = dims + self.measure_cols + ["_row_order_"]
-            tmp = tmp.sort_values(by=sort_cols, kind="mergesort")
-            seq_sorted = tmp.groupby(dims, dropna=False).cumcount()
-            seq = pd.Series(index=tmp.index, data=seq_sorted.values, dtype="int64")
-            return seq.reindex(sub_df.index)
-
-        df["__dimension_hash__"] = dimension_hash(df)
-        df["__row_sequence__"] = sequence_within_group(df).astype("int64")
-        df[self.key_col] = df["__dimension_hash__"].str.cat(df["__row_sequence__"].astype(str), sep="#")
+                    df["__row_sequence__"] = arrays["seq"].copy()
+                    df[self.key_col] = arrays["key"].copy()
+        return collided
+
+    def _check_key_collisions(self) -> bool:
+        """Return True if the 64‑bit keys are ambiguous on either side or across sides.
+
+        A second, independently keyed dimension hash is computed; if any
+        primary hash maps to more than one secondary hash, two different
+        dimension tuples share a primary hash.  Keys are also required to be
+        unique within each side.
+        """
+        if self.backend == "polars":
+            sides = (self.gcp, self.edw)
+            pairs = pl.LazyFrame({
+                "h": np.concatenate([df["__dimension_hash__"].to_numpy() for df in sides]),
+                "h2": np.concatenate([self._dimension_hash(df, hash_key=self._HASH_KEY_CHECK).to_numpy() for df in sides]),
+            })
+            checks = [pairs.unique().select(pl.col("h").is_duplicated().any())]
+            checks += [pl.LazyFrame({"k": df[self.key_col].to_numpy()}).select(pl.col("k").is_duplicated().any())
+                       for df in sides]
+            return any(frame.item() for frame in pl.collect_all(checks))
+        pairs = pd.concat([
+            pd.DataFrame({"h": df["__dimension_hash__"].to_numpy(),
+                          "h2": self._dimension_hash(df, hash_key=self._HASH_KEY_CHECK).to_numpy()})
+            for df in (self.gcp, self.edw)
+        ], ignore_index=True).drop_duplicates()
+        if pairs["h"].duplicated().any():
+            return True
+        return bool(self.gcp[self.key_col].duplicated().any() or self.edw[self.key_col].duplicated().any())
+
+    def _build_key_codes(self) -> None:
+        """Store an ``int64`` code of every row's ``key_cols`` tuple in ``__key_code__``.
+
+        Codes are assigned over both sides at once, so equal keys get equal
+        codes, and they sort like the key tuples (column by column, values
+        in sorted order, missing values last; dates at day granularity).
+        Tables already sorted by their key therefore have non‑decreasing
+        codes, which lets the join skip sorting (see :func:`_sort_merge_positions`).
+        Raises ``ValueError`` if the key is not unique within either side.
+        """
+        for c in self.key_cols:
+            g_type, e_type = self.gcp[c].dtype, self.edw[c].dtype
+            if g_type != e_type and pd.api.types.is_numeric_dtype(g_type) and pd.api.types.is_numeric_dtype(e_type):
+                # e.g. integer IDs on one side, float IDs (with NaN) on the other: hash and code them alike
+                self.gcp[c] = self.gcp[c].astype("float64")
+                self.edw[c] = self.edw[c].astype("float64")
+
+        n_gcp = len(self.gcp)
+        codes = np.zeros(n_gcp + len(self.edw), dtype="int64")
+        span = 1
+        for c in self.key_cols:
+            values = pd.concat([self.gcp[c], self.edw[c]], ignore_index=True)
+            if c == self.date_col and pd.api.types.is_datetime64_any_dtype(values):
+                values = values.dt.normalize()
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Shared dictionary: rank the categories rather than factorising every value
+                categories = values.cat.categories
+                try:
+                    rank = np.argsort(np.argsort(np.asarray(categories), kind="stable"), kind="stable")
+                except TypeError:
+                    rank = np.arange(len(categories))
+                raw = values.cat.codes.to_numpy()
+                column, size = np.where(raw < 0, len(categories), rank[raw]), len(categories) + 1
+            else:
+                try:
+                    column, uniques = pd.factorize(values, sort=True)
+                except TypeError:
+                    column, uniques = pd.factorize(values, sort=False)
+                column, size = np.where(column < 0, len(uniques), column), len(uniques) + 1
+            if span > np.iinfo("int64").max // size:
+                # Re-densify (order preserving) before the combined code could overflow
+                codes = np.unique(codes, return_inverse=True)[1].astype("int64")
+                span = int(codes.max()) + 1 if len(codes) else 1
+            codes = codes * size + column
+            span *= size
+        self.gcp[self._KEY_CODE_COL] = codes[:n_gcp]
+        self.edw[self._KEY_CODE_COL] = codes[n_gcp:]
+
+        duplicates = [int((np.diff(np.sort(side)) == 0).sum()) for side in (codes[:n_gcp], codes[n_gcp:])]
+        if any(duplicates):
+            raise ValueError(f"key_cols {self.key_cols} do not identify rows uniquely: "
+                             f"{duplicates[0]} duplicate key(s) in GCP, {duplicates[1]} in EDW")
+
+    def _readable_keys(self, keys: pd.Series) -> pd.Series:
+        """Map integer comparison IDs to their readable ``<dims>#<seq>`` form.
+
+        Only the rows of GCP or EDW whose key is in ``keys`` are rendered, so
+        the cost is proportional to the size of the mismatch report.
+        """
+        if self._string_keys or len(keys) == 0:
+            return keys
+        labels = []
+        for df in (self.gcp, self.edw):
+            rows = df.loc[df[self.key_col].isin(keys)]
+            label = self._dimension_strings(rows)
+            if not self.key_cols:
+                label = label.str.cat(rows["__row_sequence__"].astype(str), sep="#")
+            labels.append(pd.Series(label.to_numpy(), index=rows[self.key_col].to_numpy()))
+        lookup = pd.concat(labels)
+        lookup = lookup[~lookup.index.duplicated()]
+        return keys.map(lookup)
+
+    # ----------------------------------------------------------------------
+    # Single-pass aggregation (shared by stages 2, 3, 6 and 7)
+    # ----------------------------------------------------------------------
+    def _build_daily_aggregates(self, df: pd.DataFrame) -> DailyAggregates:
+        """Scan ``df`` once into a :class:`DailyAggregates` cube."""
+        if self.backend == "polars":
+            return self._build_daily_aggregates_polars(df)
+        if self.date_col and self.date_col in df.columns:
+            codes, days = pd.factorize(df[self.date_col].dt.normalize(), sort=True)
+            days = pd.DatetimeIndex(days)
+        else:
+            codes, days = np.full(len(df), -1, dtype="int64"), pd.DatetimeIndex([])
+        n_slots = len(days) + 1
+        slots = np.where(codes < 0, len(days), codes)
+
+        rows = np.bincount(slots, minlength=n_slots)
+        shape = (n_slots, len(self.measure_cols))
+        counts, sums, m2 = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+        for j, m in enumerate(self.measure_cols):
+            values = df[m].to_numpy(dtype="float64")
+            valid = ~np.isnan(values)
+            slot_v, values = slots[valid], values[valid]
+            counts[:, j] = np.bincount(slot_v, minlength=n_slots)
+            sums[:, j] = np.bincount(slot_v, weights=values, minlength=n_slots)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                slot_mean = sums[:, j] / counts[:, j]
+            m2[:, j] = np.bincount(slot_v, weights=(values - slot_mean[slot_v]) ** 2, minlength=n_slots)
+        return DailyAggregates(days=days, rows=rows, counts=counts, sums=sums, m2=m2)
+
+    def _build_daily_aggregates_polars(self, df: pd.DataFrame) -> DailyAggregates:
+        """The cube as one lazy Polars ``group_by`` day (NaN measures count as missing, as in pandas)."""
+        dated = bool(self.date_col) and self.date_col in df.columns
+        columns = {"__day__": df[self.date_col].to_numpy(dtype="datetime64[ns]") if dated
+                   else np.full(len(df), np.datetime64("NaT"), dtype="datetime64[ns]")}
+        columns.update({f"v{j}": df[m].to_numpy(dtype="float64") for j, m in enumerate(self.measure_cols)})
+        values = [pl.col(f"v{j}").fill_nan(None) for j in range(len(self.measure_cols))]
+        aggregations = [pl.len().alias("rows")]
+        for j, v in enumerate(values):
+            aggregations += [v.count().alias(f"c{j}"), v.sum().alias(f"s{j}"), ((v - v.mean()) ** 2).sum().alias(f"q{j}")]
+        cube = (pl.LazyFrame(columns).group_by(pl.col("__day__").dt.truncate("1d"))
+                .agg(aggregations).collect())
+        k = len(self.measure_cols)
+
+        def block(prefix: str) -> np.ndarray:
+            if not k:
+                return np.zeros((cube.height, 0))
+            return np.column_stack([cube[f"{prefix}{j}"].to_numpy() for j in range(k)]).astype("float64")
+
+        return DailyAggregates.from_day_groups(pd.Series(cube["__day__"].to_numpy()), cube["rows"].to_numpy(),
+                                               block("c"), block("s"), block("q"))
+
+    def _side_aggregates(self, side: str) -> DailyAggregates:
+        """Return the (cached) aggregate cube for ``"gcp"`` or ``"edw"``.
+
+        With ``state_store`` the days of unchanged partitions come from the
+        store and only the other rows are scanned (see :meth:`_incremental_plan`).
+        """
+        if side not in self._aggregates:
+            df = self.gcp if side == "gcp" else self.edw
+            if self._incremental_enabled() and self._incremental_plan()["cubes"]:
+                plan = self._incremental_plan()
+                rows = np.flatnonzero(~np.isin(plan[f"{side}_labels"], np.asarray(plan["reused"], dtype=object)))
+                fresh = self._build_daily_aggregates(df[[self.date_col] + self.measure_cols].iloc[rows])
+                cached = [plan["cubes"][p][side] for p in plan["reused"]]
+                self._aggregates[side] = DailyAggregates.from_frame(
+                    pd.concat([fresh.to_frame()] + cached, ignore_index=True))
+            else:
+                self._aggregates[side] = self._build_daily_aggregates(df)
+        return self._aggregates[side]
+
+    def _period_sums(self, side: str, freq: str) -> pd.DataFrame:
+        """Roll one side's cube up to ``freq`` periods (memoised per side and frequency).
+
+        Returns one row per period label (``str`` of ``Period``) with the
+        measure sums and a ``__rows__`` column holding the number of dated
+        rows.  Rows without a date form a ``"NaT"`` period with zero dated
+        rows, mirroring a ``groupby`` on ``to_period(freq).astype(str)``.
+        Callers must not modify the returned frame.
+        """
+        if (side, freq) in self._rollups:
+            return self._rollups[side, freq]
+        agg = self._side_aggregates(side)
+        labels = np.asarray(agg.days.to_period(freq).astype(str))
+        frame = pd.DataFrame(agg.sums[:-1], columns=self.measure_cols)
+        frame["__rows__"] = agg.rows[:-1].astype("float64")
+        grouped = frame.groupby(labels, sort=True).sum()
+        if agg.undated_rows > 0:
+            undated = pd.DataFrame([list(agg.sums[-1]) + [0.0]], columns=self.measure_cols + ["__rows__"], index=["NaT"])
+            grouped = pd.concat([grouped, undated])
+        self._rollups[side, freq] = grouped
+        return grouped
 
     # ----------------------------------------------------------------------
     # Stage 1: Summary
     # ----------------------------------------------------------------------
+    def _table_rows(self, side: str) -> int:
+        """Number of rows of ``"gcp"`` or ``"edw"``."""
+        return len(self.gcp if side == "gcp" else self.edw)
+
+    def _null_counts(self, side: str, columns: List[str]) -> Dict[str, int]:
+        """Missing values per column of ``"gcp"`` or ``"edw"``."""
+        df = self.gcp if side == "gcp" else self.edw
+        return {c: int(df[c].isna().sum()) for c in columns}
+
+    @_profiled("run_summary")
     def run_summary(self) -> pd.DataFrame:
         """Generate a high‑level summary of row counts, schemas, dtypes and null counts."""
-        gcp_cols = set(self.gcp.columns)
-        edw_cols = set(self.edw.columns)
+        # Key columns the validator adds (some only once rows are matched) are not part of either schema
+        helpers = {"__dimension_hash__", "__row_sequence__", self.key_col, self._KEY_CODE_COL}
+        gcp_cols = set(self.gcp.columns) - helpers
+        edw_cols = set(self.edw.columns) - helpers
         shared_cols = sorted(gcp_cols & edw_cols)
 
         # Row count comparison
+        g_rows, e_rows = self._table_rows("gcp"), self._table_rows("edw")
         row_section = pd.DataFrame({
             "Section": ["Row Counts"],
             "Metric": ["Number of Rows"],
-            "GCP Value": [len(self.gcp)],
-            "EDW Value": [len(self.edw)],
-            "Difference": [len(self.gcp) - len(self.edw)]
+            "GCP Value": [g_rows],
+            "EDW Value": [e_rows],
+            "Difference": [g_rows - e_rows]
         })
 
         # Columns present in one source but not the other
         schema_section = pd.DataFrame({
             "Section": ["Schema Differences", "Schema Differences"],
             "Metric": ["Columns Only in GCP", "Columns Only in EDW"],
-            "GCP Value": [", ".join(sorted(gcp_cols - edw_cols)), ""],
-            "EDW Value": ["", ", ".join(sorted(edw_cols - gcp_cols))],
+            "GCP Value": [", ".join(sorted(self._gcp_only)), ""],
+            "EDW Value": ["", ", ".join(sorted(self._edw_only))],
             "Difference": ["", ""]
         })
 
         # Data type comparison for shared columns
         dtype_records: List[Dict[str, Any]] = []
         for col in shared_cols:
+            # Encoded dimensions are reported with their decoded dtype
+            g_dtype = "object" if col in self._dictionaries else str(self.gcp[col].dtype)
+            e_dtype = "object" if col in self._dictionaries else str(self.edw[col].dtype)
             dtype_records.append({
                 "Section": "Data Type Comparison (Shared Columns)",
                 "Metric": col,
-                "GCP Value": str(self.gcp[col].dtype),
-                "EDW Value": str(self.edw[col].dtype),
-                "Difference": "Same" if self.gcp[col].dtype == self.edw[col].dtype else "Different"
+                "GCP Value": g_dtype,
+                "EDW Value": e_dtype,
+                "Difference": "Same" if g_dtype == e_dtype else "Different"
             })
         dtype_section = pd.DataFrame(dtype_records) if dtype_records else pd.DataFrame(columns=["Section","Metric","GCP Value","EDW Value","Difference"])
 
         # Null count comparison for shared columns
         null_records: List[Dict[str, Any]] = []
+        g_null_counts = self._null_counts("gcp", shared_cols)
+        e_null_counts = self._null_counts("edw", shared_cols)
         for col in shared_cols:
-            g_nulls = int(self.gcp[col].isna().sum())
-            e_nulls = int(self.edw[col].isna().sum())
+            g_nulls, e_nulls = g_null_counts[col], e_null_counts[col]
             null_records.append({
                 "Section": "Null Count Comparison (Shared Columns)",
                 "Metric": col,
@@ -324,39 +1691,151 @@ class ExtendedMigrationValidator:
             })
         null_section = pd.DataFrame(null_records) if null_records else pd.DataFrame(columns=["Section","Metric","GCP Value","EDW Value","Difference"])
 
+        sections = [row_section, schema_section, dtype_section, null_section]
+
+        # Rows proven identical by the digest diff (only when pruning is enabled)
+        if self.digest_prune:
+            if self._digest_report is None:
+                self.run_digest_diff()
+            skipped_g = int(self._digest_report["GCP Rows Skipped"].sum())
+            skipped_e = int(self._digest_report["EDW Rows Skipped"].sum())
+            sections.append(pd.DataFrame({
+                "Section": ["Digest Diff"],
+                "Metric": ["Rows Skipped as Proven Identical"],
+                "GCP Value": [skipped_g],
+                "EDW Value": [skipped_e],
+                "Difference": [skipped_g - skipped_e]
+            }))
+
+        # Rows reconciled by the sampling mode and whether it escalated to the exact path
+        if self.sample_rate is not None:
+            sample = self._sampled_reconciliation()
+            escalated = "Yes" if sample["escalated"] else "No"
+            sections.append(pd.DataFrame({
+                "Section": ["Sampling", "Sampling"],
+                "Metric": ["Rows Sampled", "Escalated To Exact Reconciliation"],
+                "GCP Value": [len(sample["gcp_rows"]), escalated],
+                "EDW Value": [len(sample["edw_rows"]), escalated],
+                "Difference": [len(sample["gcp_rows"]) - len(sample["edw_rows"]), ""]
+            }))
+
+        # Rows whose results came from the state store (only for incremental runs)
+        if self._incremental_enabled():
+            plan = self._incremental_plan()
+            reused = np.asarray(plan["reused"], dtype=object)
+            reused_g = int(np.isin(plan["gcp_labels"], reused).sum())
+            reused_e = int(np.isin(plan["edw_labels"], reused).sum())
+            sections.append(pd.DataFrame({
+                "Section": ["State Store"],
+                "Metric": ["Rows Reused From State Store"],
+                "GCP Value": [reused_g],
+                "EDW Value": [reused_e],
+                "Difference": [reused_g - reused_e]
+            }))
+
         # Concatenate sections in order and ensure all values are strings
-        summary = pd.concat([row_section, schema_section, dtype_section, null_section], ignore_index=True)
+        summary = pd.concat(sections, ignore_index=True)
         return summary.astype(str)
 
+    # ----------------------------------------------------------------------
+    # Measure comparison shared by stages 2 to 6
+    # ----------------------------------------------------------------------
+    def _measure_tolerances(self) -> Tuple[np.ndarray, np.ndarray]:
+        """``(atol, rtol)`` per measure: ``measure_tolerances`` where given, else the global pair."""
+        overrides = self.measure_tolerances or {}
+        atol = np.array([overrides.get(m, (self.atol, self.rtol))[0] for m in self.measure_cols], dtype="float64")
+        rtol = np.array([overrides.get(m, (self.atol, self.rtol))[1] for m in self.measure_cols], dtype="float64")
+        return atol, rtol
+
+    def _measure_blocks(self, frame: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """The ``{m}__GCP`` and ``{m}__EDW`` columns of ``frame`` as two contiguous float blocks."""
+        g_block = np.ascontiguousarray(frame[[f"{m}__GCP" for m in self.measure_cols]].to_numpy(dtype="float64"))
+        e_block = np.ascontiguousarray(frame[[f"{m}__EDW" for m in self.measure_cols]].to_numpy(dtype="float64"))
+        return g_block, e_block
+
+    def _compare_measures(self, gcp: np.ndarray, edw: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Mismatch and difference matrices of two blocks whose last axis follows ``measure_cols``."""
+        atol, rtol = self._measure_tolerances()
+        return _compare_blocks(np.asarray(gcp, dtype="float64"), np.asarray(edw, dtype="float64"), atol, rtol)
+
     # ----------------------------------------------------------------------
     # Stage 2: Grand Totals
     # ----------------------------------------------------------------------
+    @_profiled("run_grand_totals")
     def run_grand_totals(self) -> pd.DataFrame:
         """Compute total sums of all numeric measures in both sources with differences and status."""
         columns = ["Measure", "GCP Sum", "EDW Sum", "Difference", "Status"]
         if not self.measure_cols:
             return pd.DataFrame(columns=columns)
 
-        g_sums = self.gcp[self.measure_cols].sum(numeric_only=True)
-        e_sums = self.edw[self.measure_cols].sum(numeric_only=True)
-        data: List[Dict[str, Any]] = []
-        for m in self.measure_cols:
-            g_val = g_sums.get(m, np.nan)
-            e_val = e_sums.get(m, np.nan)
-            diff = g_val - e_val if (pd.notna(g_val) and pd.notna(e_val)) else (g_val - e_val)
-            status = "Match" if np.isclose(g_val, e_val, equal_nan=True, atol=self.atol, rtol=self.rtol) else "Mismatch"
-            data.append({
-                "Measure": m,
-                "GCP Sum": g_val,
-                "EDW Sum": e_val,
-                "Difference": diff,
-                "Status": status
-            })
-        return pd.DataFrame(data, columns=columns)
+        g_sums = np.asarray(self._side_aggregates("gcp").totals(), dtype="float64")
+        e_sums = np.asarray(self._side_aggregates("edw").totals(), dtype="float64")
+        mismatch, diff = self._compare_measures(g_sums, e_sums)
+        return pd.DataFrame({
+            "Measure": list(self.measure_cols),
+            "GCP Sum": g_sums,
+            "EDW Sum": e_sums,
+            "Difference": diff,
+            "Status": np.where(mismatch, "Mismatch", "Match"),
+        }, columns=columns)
 
     # ----------------------------------------------------------------------
     # Stage 3: Time Windows
     # ----------------------------------------------------------------------
+    # Window name -> function giving the first day of the window for each as-of date
+    _WINDOW_STARTS = {
+        "Daily": lambda d: d,
+        "Week to Date": lambda d: d - pd.to_timedelta(d.dayofweek, unit="D"),
+        "Month to Date": lambda d: d.to_period("M").start_time,
+        "Quarter to Date": lambda d: d.to_period("Q").start_time,
+        "Year to Date": lambda d: d.to_period("Y").start_time,
+    }
+    # Window name -> function giving the period label for each as-of date
+    _WINDOW_LABELS = {
+        "Daily": lambda d: d.strftime("%Y-%m-%d"),
+        "Week to Date": lambda d: d.to_period("W").astype(str),
+        "Month to Date": lambda d: d.strftime("%Y-%m"),
+        "Quarter to Date": lambda d: d.year.astype(str) + "-Q" + d.quarter.astype(str),
+        "Year to Date": lambda d: d.year.astype(str),
+    }
+
+    def _compare_sums(self, g_sums: np.ndarray, e_sums: np.ndarray) -> pd.DataFrame:
+        """Long comparison of two ``(n_windows, n_measures)`` sum arrays, window‑major."""
+        k = len(self.measure_cols)
+        g_vals = np.asarray(g_sums, dtype="float64").reshape(-1, k)
+        e_vals = np.asarray(e_sums, dtype="float64").reshape(-1, k)
+        mismatch, diff = self._compare_measures(g_vals, e_vals)
+        return pd.DataFrame({
+            "Measure": np.tile(np.asarray(self.measure_cols, dtype=object), len(g_vals)),
+            "GCP Sum": g_vals.ravel(),
+            "EDW Sum": e_vals.ravel(),
+            "Difference": diff.ravel(),
+            "Status": np.where(mismatch.ravel(), "Mismatch", "Match"),
+        })
+
+    def _window_table(self, asof: pd.DatetimeIndex, windows: List[str]) -> pd.DataFrame:
+        """Window sums of both sides for every as‑of date, ordered by date, window and measure.
+
+        Every window is the difference of two lookups into the cumulative
+        daily sums of :class:`DailyAggregates`, so the cost is independent
+        of the window length and of the number of rows.
+        """
+        asof = pd.DatetimeIndex(asof).normalize()
+        g_agg = self._side_aggregates("gcp")
+        e_agg = self._side_aggregates("edw")
+        # Window starts/labels laid out date‑major, window‑minor
+        starts = np.column_stack([self._WINDOW_STARTS[w](asof).to_numpy() for w in windows]).ravel()
+        labels = np.column_stack([np.asarray(self._WINDOW_LABELS[w](asof), dtype=object) for w in windows]).ravel()
+        ends = np.repeat(asof.to_numpy(), len(windows))
+
+        n_measures = len(self.measure_cols)
+        table = self._compare_sums(g_agg.range_sums(starts, ends), e_agg.range_sums(starts, ends))
+        table.insert(0, "Period", np.repeat(labels, n_measures))
+        table.insert(0, "Window", np.tile(np.repeat(np.asarray(windows, dtype=object), n_measures), len(asof)))
+        table.insert(0, "As Of Date", np.repeat(ends, n_measures))
+        return table
+
+    @_profiled("run_time_windows")
     def run_time_windows(self) -> pd.DataFrame:
         """Generate sums across daily, MTD, QTD, YTD and monthly windows for each measure."""
         columns = ["Measure", "Window", "Period", "GCP Sum", "EDW Sum", "Difference", "Status"]
@@ -365,195 +1844,1002 @@ class ExtendedMigrationValidator:
         if self.date_col not in self.gcp.columns or self.date_col not in self.edw.columns:
             return pd.DataFrame(columns=columns)
 
+        g_agg = self._side_aggregates("gcp")
+        e_agg = self._side_aggregates("edw")
+
         # Determine the latest (most recent) date across both tables
-        latest_g = self.gcp[self.date_col].dropna().max()
-        latest_e = self.edw[self.date_col].dropna().max()
-        valid_dates = [d for d in [latest_g, latest_e] if pd.notna(d)]
+        valid_dates = [agg.days[-1] for agg in (g_agg, e_agg) if len(agg.days) > 0]
         if not valid_dates:
             return pd.DataFrame(columns=columns)
         latest = max(valid_dates)
 
-        # Helper functions for date ranges
-        def month_start(date: pd.Timestamp) -> pd.Timestamp:
-            return pd.Timestamp(date.year, date.month, 1)
-        def quarter_start(date: pd.Timestamp) -> pd.Timestamp:
-            month = date.month
-            first_month = 3 * ((month - 1) // 3) + 1
-            return pd.Timestamp(date.year, first_month, 1)
-        def year_start(date: pd.Timestamp) -> pd.Timestamp:
-            return pd.Timestamp(date.year, 1, 1)
-
-        # Define windows for latest date
-        windows = [
-            ("Daily", latest.normalize(), latest.normalize(), latest.strftime("%Y-%m-%d")),
-            ("Month to Date", month_start(latest), latest.normalize(), month_start(latest).strftime("%Y-%m")),
-            ("Quarter to Date", quarter_start(latest), latest.normalize(), f"{quarter_start(latest).year}-Q{((latest.month-1)//3)+1}"),
-            ("Year to Date", year_start(latest), latest.normalize(), str(year_start(latest).year))
-        ]
-
-        # Precompute monthly sums for all months in the union of both tables
+        # Windows ending on the latest date
+        windows = self._window_table(pd.DatetimeIndex([latest]),
+                                     ["Daily", "Month to Date", "Quarter to Date", "Year to Date"])
+
+        # Monthly sums for all months in the union of both tables, rolled up from the daily cubes.
         # The 'Period' label for monthly window is YYYY-MM
-        gcp_monthly = (self.gcp
-                       .assign(_period=self.gcp[self.date_col].dt.to_period("M").astype(str))
-                       .groupby("_period", dropna=False)[self.measure_cols]
-                       .sum(numeric_only=True))
-        edw_monthly = (self.edw
-                       .assign(_period=self.edw[self.date_col].dt.to_period("M").astype(str))
-                       .groupby("_period", dropna=False)[self.measure_cols]
-                       .sum(numeric_only=True))
+        gcp_monthly = self._period_sums("gcp", "M").drop(columns="__rows__")
+        edw_monthly = self._period_sums("edw", "M").drop(columns="__rows__")
         all_periods = sorted(set(gcp_monthly.index) | set(edw_monthly.index))
+        monthly = self._compare_sums(gcp_monthly.reindex(all_periods).to_numpy(),
+                                     edw_monthly.reindex(all_periods).to_numpy())
+        monthly.insert(0, "Period", np.repeat(np.asarray(all_periods, dtype=object), len(self.measure_cols)))
+        monthly.insert(0, "Window", "Monthly")
+        return pd.concat([windows[columns], monthly[columns]], ignore_index=True)
 
-        result_rows: List[Dict[str, Any]] = []
-        # Compute window sums for each pre‑defined window
-        for window_name, start_date, end_date, label in windows:
-            # Filter rows in each table for the time range and sum measures
-            g_filtered = self.gcp.loc[(self.gcp[self.date_col] >= start_date) & (self.gcp[self.date_col] <= end_date), self.measure_cols]
-            e_filtered = self.edw.loc[(self.edw[self.date_col] >= start_date) & (self.edw[self.date_col] <= end_date), self.measure_cols]
-            g_sums = g_filtered.sum(numeric_only=True)
-            e_sums = e_filtered.sum(numeric_only=True)
-            for m in self.measure_cols:
-                g_val = g_sums.get(m, np.nan)
-                e_val = e_sums.get(m, np.nan)
-                diff = g_val - e_val if (pd.notna(g_val) and pd.notna(e_val)) else (g_val - e_val)
-                status = "Match" if np.isclose(g_val, e_val, equal_nan=True, atol=self.atol, rtol=self.rtol) else "Mismatch"
-                result_rows.append({
-                    "Measure": m,
-                    "Window": window_name,
-                    "Period": label,
-                    "GCP Sum": g_val,
-                    "EDW Sum": e_val,
-                    "Difference": diff,
-                    "Status": status
-                })
-        # Compute monthly sums for each measure across all months
-        for period in all_periods:
-            g_row = gcp_monthly.loc[period] if period in gcp_monthly.index else pd.Series(index=self.measure_cols, dtype="float64")
-            e_row = edw_monthly.loc[period] if period in edw_monthly.index else pd.Series(index=self.measure_cols, dtype="float64")
-            for m in self.measure_cols:
-                g_val = g_row.get(m, np.nan)
-                e_val = e_row.get(m, np.nan)
-                diff = g_val - e_val if (pd.notna(g_val) and pd.notna(e_val)) else (g_val - e_val)
-                status = "Match" if np.isclose(g_val, e_val, equal_nan=True, atol=self.atol, rtol=self.rtol) else "Mismatch"
-                result_rows.append({
-                    "Measure": m,
-                    "Window": "Monthly",
-                    "Period": period,
-                    "GCP Sum": g_val,
-                    "EDW Sum": e_val,
-                    "Difference": diff,
-                    "Status": status
-                })
-        return pd.DataFrame(result_rows, columns=columns)
+    @_profiled("run_time_windows_range")
+    def run_time_windows_range(self, start: Optional[Any] = None, end: Optional[Any] = None,
+                               windows: Optional[List[str]] = None) -> pd.DataFrame:
+        """Daily, WTD, MTD, QTD and YTD sums for every as‑of date in ``[start, end]``.
+
+        ``start`` and ``end`` default to the earliest and latest date across
+        both tables; ``windows`` selects a subset of ``Daily``, ``Week to
+        Date``, ``Month to Date``, ``Quarter to Date`` and ``Year to Date``.
+        Weeks start on Monday.  All as‑of dates are computed in one
+        vectorised pass over the daily aggregates, so a backfill audit over
+        hundreds of dates costs about the same as a single date.
+        """
+        windows = list(self._WINDOW_STARTS) if windows is None else list(windows)
+        unknown = [w for w in windows if w not in self._WINDOW_STARTS]
+        if unknown:
+            raise ValueError(f"Unknown window(s) {unknown}; choose from {list(self._WINDOW_STARTS)}")
+        columns = ["As Of Date", "Measure", "Window", "Period", "GCP Sum", "EDW Sum", "Difference", "Status"]
+        if not self.measure_cols or not self.date_col:
+            return pd.DataFrame(columns=columns)
+        if self.date_col not in self.gcp.columns or self.date_col not in self.edw.columns:
+            return pd.DataFrame(columns=columns)
+
+        days = self._side_aggregates("gcp").days.union(self._side_aggregates("edw").days)
+        if len(days) == 0:
+            return pd.DataFrame(columns=columns)
+        start = days[0] if start is None else pd.Timestamp(start).normalize()
+        end = days[-1] if end is None else pd.Timestamp(end).normalize()
+        return self._window_table(pd.date_range(start, end, freq="D"), windows)[columns]
 
     # ----------------------------------------------------------------------
     # Stage 4 & 5: Reconciliation and Annotated GCP
     # ----------------------------------------------------------------------
-    def run_reconciliation(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Perform a full outer join on the comparison key and return mismatches and annotated GCP."""
+    def _reconcile_frames(self, gcp: pd.DataFrame, edw: pd.DataFrame) -> pd.DataFrame:
+        """Outer join two (partial) tables on the comparison key and classify every key.
+
+        This is the core of stages 4 and 5.  It is used unchanged by the
+        in‑memory path (on the full tables) and by the chunked path (on one
+        hash bucket at a time), which is what keeps both paths identical.
+        """
         key = self.key_col
         # Rename measures to suffix with source for side‑by‑side comparison
-        gcp_renamed = self.gcp.rename(columns={m: f"{m}__GCP" for m in self.measure_cols})
-        edw_renamed = self.edw.rename(columns={m: f"{m}__EDW" for m in self.measure_cols})
+        gcp_renamed = gcp.rename(columns={m: f"{m}__GCP" for m in self.measure_cols})
+        edw_renamed = edw.rename(columns={m: f"{m}__EDW" for m in self.measure_cols})
 
         # Build lists of columns to merge.  Include dimension columns only from the GCP side to
         # avoid duplicate names; EDW dimension columns are dropped for the merge to prevent
         # collisions.  We suffix only numeric measures for each side.
         gcp_merge_cols: List[str] = [key] + [c for c in self.dimension_cols if c != key and c in gcp_renamed.columns]
         gcp_merge_cols += [f"{m}__GCP" for m in self.measure_cols]
+        if self._GCP_ROW_COL in gcp_renamed.columns:
+            gcp_merge_cols.append(self._GCP_ROW_COL)
         edw_merge_cols: List[str] = [key] + [f"{m}__EDW" for m in self.measure_cols]
-        merged = pd.merge(
-            gcp_renamed[gcp_merge_cols],
-            edw_renamed[edw_merge_cols],
-            on=key,
-            how="outer",
-            suffixes=("", "")
-        )
-
-        # Determine presence of key in each side
-        gcp_keys = set(self.gcp[key])
-        edw_keys = set(self.edw[key])
-        in_gcp = merged[key].isin(gcp_keys)
-        in_edw = merged[key].isin(edw_keys)
-
-        # Determine value mismatches for each measure
+        if self.key_cols:
+            # Declared key: sort-merge on the integer key codes instead of a hash join
+            merged, in_gcp, in_edw = self._key_join(gcp_renamed[gcp_merge_cols], edw_renamed[edw_merge_cols],
+                                                    gcp[self._KEY_CODE_COL].to_numpy(), edw[self._KEY_CODE_COL].to_numpy())
+        elif self.backend == "polars":
+            # Hash join on Polars; only the matched positions come back to lay out the frame
+            merged, in_gcp, in_edw = self._positional_join(gcp_renamed[gcp_merge_cols], edw_renamed[edw_merge_cols],
+                                                           *_polars_join_positions(gcp[key].to_numpy(), edw[key].to_numpy()))
+        else:
+            merged = pd.merge(
+                gcp_renamed[gcp_merge_cols],
+                edw_renamed[edw_merge_cols],
+                on=key,
+                how="outer",
+                suffixes=("", "")
+            )
+
+            # Determine presence of key in each side
+            in_gcp = merged[key].isin(gcp[key])
+            in_edw = merged[key].isin(edw[key])
+
+        # Determine value mismatches across all measures at once
         if self.measure_cols:
-            mismatch_flags = []
             for m in self.measure_cols:
-                col_g = f"{m}__GCP"
-                col_e = f"{m}__EDW"
                 # If missing columns (due to schema diffs), fill with NaN
-                if col_g not in merged.columns:
-                    merged[col_g] = np.nan
-                if col_e not in merged.columns:
-                    merged[col_e] = np.nan
-                # np.isclose returns a numpy array; wrap it in a Series for alignment
-                same_array = np.isclose(merged[col_g], merged[col_e], equal_nan=True, atol=self.atol, rtol=self.rtol)
-                same_series = pd.Series(same_array, index=merged.index)
-                mismatch_flags.append(~same_series.rename(m))
-            any_value_mismatch = pd.concat(mismatch_flags, axis=1).any(axis=1)
+                for col in (f"{m}__GCP", f"{m}__EDW"):
+                    if col not in merged.columns:
+                        merged[col] = np.nan
+            mismatch, _ = self._compare_measures(*self._measure_blocks(merged))
+            any_value_mismatch = mismatch.any(axis=1)
         else:
-            any_value_mismatch = pd.Series(False, index=merged.index)
+            any_value_mismatch = np.zeros(len(merged), dtype=bool)
 
         # Classify mismatch type
         mismatch_type = np.where(~in_edw & in_gcp, "In GCP Only",
                           np.where(~in_gcp & in_edw, "In EDW Only",
                                    np.where(any_value_mismatch, "Value Mismatch", "Match")))
         merged["mismatch_type"] = mismatch_type
+        return merged
+
+    def _key_join(self, gcp: pd.DataFrame, edw: pd.DataFrame, gcp_codes: np.ndarray,
+                  edw_codes: np.ndarray) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """Outer join on ``key_cols`` codes, laid out like the ``pd.merge`` of :meth:`_reconcile_frames`.
+
+        Returns the joined frame (in key order) and whether each of its rows
+        exists in GCP and in EDW.
+        """
+        return self._positional_join(gcp, edw, *_sort_merge_positions(gcp_codes, edw_codes))
+
+    def _positional_join(self, gcp: pd.DataFrame, edw: pd.DataFrame, gcp_at: np.ndarray,
+                         edw_at: np.ndarray) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """Lay out an outer join given each joined row's position on both sides (``-1`` where absent)."""
+        key = self.key_col
+        in_gcp, in_edw = gcp_at >= 0, edw_at >= 0
+        keys = np.empty(len(gcp_at), dtype=gcp[key].dtype if len(gcp) else edw[key].dtype)
+        keys[in_gcp] = gcp[key].to_numpy()[gcp_at[in_gcp]]
+        keys[in_edw] = edw[key].to_numpy()[edw_at[in_edw]]
+        # Reindexing a RangeIndex by position fills the missing side's rows with NaN, as the merge would
+        left = gcp.drop(columns=key).reset_index(drop=True).reindex(gcp_at).reset_index(drop=True)
+        right = edw.drop(columns=key).reset_index(drop=True).reindex(edw_at).reset_index(drop=True)
+        merged = pd.concat([left, right], axis=1)
+        merged.insert(0, key, keys)
+        return merged, in_gcp, in_edw
 
-        # Build mismatch-only report
+    def _mismatch_report(self, merged: pd.DataFrame) -> pd.DataFrame:
+        """Build the mismatch‑only report (output 4) from a classified merge."""
+        key = self.key_col
         mismatch_df = merged.loc[merged["mismatch_type"] != "Match"].copy()
         # Pull in dimension columns (prefer unsuffixed if available) for context
         dimension_columns_in_merged = [c for c in self.dimension_cols if c != key and c in mismatch_df.columns]
-        # Create difference columns
-        for m in self.measure_cols:
-            col_g = f"{m}__GCP"
-            col_e = f"{m}__EDW"
-            if col_g not in mismatch_df.columns:
-                mismatch_df[col_g] = np.nan
-            if col_e not in mismatch_df.columns:
-                mismatch_df[col_e] = np.nan
-            mismatch_df[f"{m}__Difference"] = mismatch_df[col_g] - mismatch_df[col_e]
+        # Create difference columns from one block subtraction
+        if self.measure_cols:
+            g_block, e_block = self._measure_blocks(mismatch_df)
+            differences = pd.DataFrame(g_block - e_block, index=mismatch_df.index,
+                                       columns=[f"{m}__Difference" for m in self.measure_cols])
+            mismatch_df = pd.concat([mismatch_df, differences], axis=1)
 
         report_columns = [key, "mismatch_type"] + dimension_columns_in_merged
         report_columns += [f"{m}__GCP" for m in self.measure_cols] + [f"{m}__EDW" for m in self.measure_cols] + [f"{m}__Difference" for m in self.measure_cols]
         report_columns = [c for c in report_columns if c in mismatch_df.columns]
-        mismatch_output = mismatch_df[report_columns].reset_index(drop=True)
+        return mismatch_df[report_columns].reset_index(drop=True)
+
+    def _finalise_mismatch_report(self, report: pd.DataFrame) -> pd.DataFrame:
+        """Add readable key labels (if requested) and order the report by them (or by key)."""
+        report = self._decode_dimensions(report.copy(), absent=(report["mismatch_type"] == "In EDW Only").to_numpy())
+        if not self.readable_keys:
+            return report.sort_values(self.key_col, kind="mergesort").reset_index(drop=True)
+        # The integer key stays, so mismatch rows still join to output 5
+        report.insert(1, self.label_col, self._readable_keys(report[self.key_col]).to_numpy(dtype=object))
+        return report.sort_values(self.label_col, kind="mergesort").reset_index(drop=True)
+
+    def _build_mismatch_details(self, frame: pd.DataFrame) -> pd.Series:
+        """Describe the differing measures of every ``Value Mismatch`` row in ``frame``.
+
+        Built column by column over a (rows × measures) mismatch mask, and
+        only for the ``Value Mismatch`` rows; every other row gets ``""``.
+        """
+        details = np.full(len(frame), "", dtype=object)
+        rows = np.flatnonzero((frame["validation_status"] == "Value Mismatch").to_numpy())
+        if len(rows) == 0 or not self.measure_cols:
+            return pd.Series(details, index=frame.index, dtype="object")
+
+        g_vals, e_vals = self._measure_blocks(frame.iloc[rows])
+        differs, diff = self._compare_measures(g_vals, e_vals)
+
+        text = np.full(len(rows), "", dtype=object)
+        for j, m in enumerate(self.measure_cols):
+            hit = np.flatnonzero(differs[:, j])
+            if len(hit) == 0:
+                continue
+            g_txt = g_vals[hit, j].astype(str).astype(object)
+            e_txt = e_vals[hit, j].astype(str).astype(object)
+            d_txt = diff[hit, j].astype(str).astype(object)
+            part = f"{m}=" + g_txt + "|" + e_txt + " (Δ=" + d_txt + ")"
+            previous = text[hit]
+            text[hit] = np.where(previous == "", part, previous + "; " + part)
+        details[rows] = text
+        return pd.Series(details, index=frame.index, dtype="object")
+
+    @_profiled("run_reconciliation")
+    def run_reconciliation(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Perform a full outer join on the comparison key and return mismatches and annotated GCP.
+
+        When ``chunked`` is set, or ``n_workers > 1``, the join is performed
+        bucket by bucket (see :meth:`iter_reconciliation_chunks`); with
+        ``digest_prune`` only rows in slices flagged by :meth:`run_digest_diff`
+        are joined; with ``state_store`` only partitions changed since the
+        previous run are joined (see :meth:`_run_reconciliation_incremental`).
+        The returned tables are the same in every case.  With ``sample_rate``
+        only sampled rows are reconciled (see :meth:`run_sample_estimates`)
+        unless the estimate triggers escalation to the exact path.
+        """
+        self._ensure_comparison_ids()
+        if self.sample_rate is not None and not self._sampled_reconciliation()["escalated"]:
+            return self._run_reconciliation_sampled()
+        if self._incremental_enabled():
+            return self._run_reconciliation_incremental()
+        if self.digest_prune:
+            # Only rows in slices whose digests differ need to be joined
+            return self._assemble_reconciliation(self._iter_reconciliation_results(*self._digest_candidates()))
+        # Every GCP row carries its position through the join, so output 5 is
+        # assembled by position rather than by merging statuses back onto GCP
+        return self._assemble_reconciliation(self._iter_reconciliation_results())
+
+    # ----------------------------------------------------------------------
+    # Stage 4 & 5 (chunked): Out‑of‑core reconciliation
+    # ----------------------------------------------------------------------
+    def _estimate_row_bytes(self, df: pd.DataFrame, columns: List[str]) -> float:
+        """Estimate the in‑memory size of one row of ``df[columns]`` from a bounded sample."""
+        if len(df) == 0:
+            return 0.0
+        sample = df.head(10_000)[columns]
+        return float(sample.memory_usage(index=False, deep=True).sum()) / len(sample)
 
-        # Build annotated GCP output
-        status_map = merged[[key, "mismatch_type"]].drop_duplicates()
-        gcp_annotated = self.gcp.merge(status_map, on=key, how="left")
-        gcp_annotated["validation_status"] = gcp_annotated["mismatch_type"].fillna("Match")
+    def _plan_bucket_count(self, gcp_cols: List[str], n_gcp: int, edw_cols: List[str], n_edw: int,
+                           budget_mb: float) -> int:
+        """Choose how many hash buckets keep the join of ``n_gcp`` and ``n_edw`` rows within ``budget_mb``."""
+        budget_bytes = max(float(budget_mb), 1.0) * 1024 * 1024
+        total_bytes = (self._estimate_row_bytes(self.gcp, gcp_cols) * n_gcp
+                       + self._estimate_row_bytes(self.edw, edw_cols) * n_edw)
+        # The merge holds both inputs, the joined frame and the comparison masks at once
+        needed = total_bytes * self._MERGE_MEMORY_FACTOR
+        return max(1, int(np.ceil(needed / budget_bytes)))
+
+    def _take_rows(self, df: pd.DataFrame, columns: List[str], rows: Optional[np.ndarray],
+                   start: int, stop: int, carry_rows: bool = False) -> pd.DataFrame:
+        """Copy ``columns`` of rows ``start:stop`` of ``df`` (of ``rows`` if given, else of the table).
+
+        Only that block is copied.  With ``carry_rows`` the rows' positions
+        in ``df`` are added as ``__gcp_row__``.
+        """
+        at = slice(start, stop) if rows is None else rows[start:stop]
+        # Rows first: selecting columns together with rows would copy them over the whole table
+        part = df.iloc[at][columns]
+        if carry_rows:
+            positions = np.arange(start, stop, dtype="int64") if rows is None else rows[start:stop]
+            part = part.assign(**{self._GCP_ROW_COL: positions})
+        return part
+
+    def _spill_buckets(self, df: pd.DataFrame, columns: List[str], rows: Optional[np.ndarray],
+                       n_buckets: int, directory: str, side: str, carry_rows: bool = False) -> List[str]:
+        """Hash‑partition ``df[columns]`` on the comparison key and append each bucket to a file on disk.
+
+        ``df`` is read one bucket's worth of rows at a time (see
+        :meth:`_take_rows`), so spilling stays within the same budget as
+        the joins.  Every file starts with an empty frame carrying the
+        dtypes, followed by one pickled frame per slice that had rows.
+        """
+        n_rows = len(df) if rows is None else len(rows)
+        step = max(1, -(-n_rows // n_buckets))
+        paths = [os.path.join(directory, f"{side}_{b:05d}.pkl") for b in range(n_buckets)]
+        empty = self._take_rows(df, columns, rows, 0, 0, carry_rows)
+        for path in paths:
+            with open(path, "wb") as fh:
+                pickle.dump(empty, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        for start in range(0, n_rows, step):
+            part = self._take_rows(df, columns, rows, start, min(start + step, n_rows), carry_rows)
+            bucket_ids = pd.util.hash_pandas_object(part[self.key_col], index=False).to_numpy() % np.uint64(n_buckets)
+            # A stable sort keeps each bucket's rows in table order
+            order = np.argsort(bucket_ids, kind="stable")
+            edges = np.r_[0, np.cumsum(np.bincount(bucket_ids.astype("int64"), minlength=n_buckets))]
+            for b in np.flatnonzero(np.diff(edges)):
+                with open(paths[b], "ab") as fh:
+                    pickle.dump(part.iloc[order[edges[b]:edges[b + 1]]], fh, protocol=pickle.HIGHEST_PROTOCOL)
+        return paths
+
+    @staticmethod
+    def _read_spilled(path: str) -> List[Any]:
+        """All objects pickled one after another into ``path``."""
+        items = []
+        with open(path, "rb") as fh:
+            while True:
+                try:
+                    items.append(pickle.load(fh))
+                except EOFError:
+                    return items
 
-        # Construct mismatch_details where relevant
+    def _read_bucket(self, path: str) -> pd.DataFrame:
+        """Reassemble one spilled bucket (see :meth:`_spill_buckets`)."""
+        empty, *parts = self._read_spilled(path)
+        return pd.concat(parts) if parts else empty
+
+    def _reconcile_bucket(self, gcp_path: str, edw_path: str) -> BucketResult:
+        """Join one spilled bucket pair and return its slice of outputs 4 and 5."""
+        return self._reconcile_subset(self._read_bucket(gcp_path), self._read_bucket(edw_path))
+
+    def _reconcile_subset(self, gcp_part: pd.DataFrame, edw_part: pd.DataFrame) -> BucketResult:
+        """Join a subset of rows (GCP rows carry their position) into outputs 4 and 5 slices."""
+        row_col = self._GCP_ROW_COL
+        merged = self._reconcile_frames(gcp_part, edw_part)
+        on_gcp = merged.loc[merged[row_col].notna()].copy()
+        on_gcp["validation_status"] = on_gcp["mismatch_type"]
+        return (self._mismatch_report(merged),
+                on_gcp[row_col].to_numpy(dtype="int64"),
+                on_gcp["validation_status"].to_numpy(dtype=object),
+                self._build_mismatch_details(on_gcp).to_numpy(dtype=object))
+
+    def _worker_view(self) -> "ExtendedMigrationValidator":
+        """A shallow copy without the table data, cheap to send to pool workers."""
+        view = copy.copy(self)
+        view.gcp_df = view.edw_df = None  # type: ignore[assignment]
+        view.gcp = self.gcp.head(0)
+        view.edw = self.edw.head(0)
+        view._aggregates = {}
+        view._rollups = {}
+        view._sketches = {}
+        view._pool = None
+        # The hook may not be picklable, and worker events are not collected
+        view.profile_hook = None
+        view._profile, view._profile_stack = [], []
+        return view
+
+    def iter_reconciliation_chunks(self, gcp_rows: Optional[np.ndarray] = None,
+                                   edw_rows: Optional[np.ndarray] = None) -> Iterator[BucketResult]:
+        """Reconcile the two tables one on‑disk hash bucket at a time.
+
+        Both tables are hash‑partitioned on ``__comparison_id__`` so that a
+        key always lands in the same bucket on both sides.  Buckets are
+        spilled to ``spill_dir`` (a temporary directory by default), straight
+        from the tables one bucket's worth of rows at a time, and then
+        joined one pair at a time, so peak memory is bounded by
+        ``memory_budget_mb`` rather than by table size.
+
+        With ``n_workers > 1`` the bucket joins run in a process pool.  Each
+        worker reads its bucket files itself, so table data never passes
+        through the pool's pipes, and there are at least two buckets per
+        worker, each sized to fit ``worker_memory_mb``.  Results are still
+        yielded in bucket order.
+
+        ``gcp_rows`` / ``edw_rows`` optionally restrict the join to the given
+        row positions (used by the digest diff).
+
+        Yields, per bucket, a tuple of the bucket's mismatch rows (output 4
+        layout), the positions of its GCP rows in ``self.gcp`` and their
+        ``validation_status`` and ``mismatch_details`` values.
+        """
+        self._ensure_comparison_ids()
+        gcp_cols, edw_cols = self._join_columns()
+        n_gcp = len(self.gcp) if gcp_rows is None else len(gcp_rows)
+        n_edw = len(self.edw) if edw_rows is None else len(edw_rows)
+        if self.key_cols and self.n_workers <= 1:
+            gcp_codes = self.gcp[self._KEY_CODE_COL].to_numpy()
+            edw_codes = self.edw[self._KEY_CODE_COL].to_numpy()
+            if gcp_rows is not None:
+                gcp_codes = gcp_codes[gcp_rows]
+            if edw_rows is not None:
+                edw_codes = edw_codes[edw_rows]
+            if _is_sorted(gcp_codes) and _is_sorted(edw_codes):
+                # Both sides arrive sorted by key: stream aligned key ranges, nothing is spilled
+                n_ranges = self._plan_bucket_count(gcp_cols, n_gcp, edw_cols, n_edw, self.memory_budget_mb)
+                print(f"[Validator] Key-sorted reconciliation using {n_ranges} key range(s)")
+                cuts = gcp_codes[(np.arange(1, n_ranges) * len(gcp_codes)) // n_ranges]
+                gcp_edges = np.r_[0, np.searchsorted(gcp_codes, cuts, side="left"), len(gcp_codes)]
+                edw_edges = np.r_[0, np.searchsorted(edw_codes, cuts, side="left"), len(edw_codes)]
+                del gcp_codes, edw_codes
+                for b in range(n_ranges):
+                    yield self._reconcile_subset(
+                        self._take_rows(self.gcp, gcp_cols, gcp_rows, gcp_edges[b], gcp_edges[b + 1], carry_rows=True),
+                        self._take_rows(self.edw, edw_cols, edw_rows, edw_edges[b], edw_edges[b + 1]))
+                return
+        if self.n_workers > 1:
+            n_buckets = max(2 * self.n_workers, self._plan_bucket_count(gcp_cols, n_gcp, edw_cols, n_edw,
+                                                                        self.worker_memory_mb))
+            print(f"[Validator] Parallel reconciliation using {n_buckets} bucket(s) on {self.n_workers} workers")
+        else:
+            n_buckets = self._plan_bucket_count(gcp_cols, n_gcp, edw_cols, n_edw, self.memory_budget_mb)
+            print(f"[Validator] Chunked reconciliation using {n_buckets} bucket(s)")
+
+        with tempfile.TemporaryDirectory(dir=self.spill_dir, prefix="reconcile_") as spill:
+            gcp_paths = self._spill_buckets(self.gcp, gcp_cols, gcp_rows, n_buckets, spill, "gcp", carry_rows=True)
+            edw_paths = self._spill_buckets(self.edw, edw_cols, edw_rows, n_buckets, spill, "edw")
+
+            if self.n_workers > 1:
+                with self._process_pool() as pool:
+                    yield from pool.map(_reconcile_bucket_task, repeat(self._worker_view()), gcp_paths, edw_paths)
+            else:
+                for gcp_path, edw_path in zip(gcp_paths, edw_paths):
+                    yield self._reconcile_bucket(gcp_path, edw_path)
+
+    def _iter_reconciliation_results(self, gcp_rows: Optional[np.ndarray] = None,
+                                     edw_rows: Optional[np.ndarray] = None) -> Iterable[BucketResult]:
+        """Reconcile the given row positions (all rows if ``None``) with the configured execution mode."""
+        if self.chunked or self.n_workers > 1:
+            return self.iter_reconciliation_chunks(gcp_rows, edw_rows)
+        gcp_cols, edw_cols = self._join_columns()
+        # Only the joined columns are taken, so the rest of the GCP payload is never copied
+        gcp_part, edw_part = self.gcp[gcp_cols], self.edw[edw_cols]
+        if gcp_rows is None:
+            gcp_rows = np.arange(len(self.gcp), dtype="int64")
+        else:
+            gcp_part = gcp_part.iloc[gcp_rows]
+        if edw_rows is not None:
+            edw_part = edw_part.iloc[edw_rows]
+        return [self._reconcile_subset(gcp_part.assign(**{self._GCP_ROW_COL: gcp_rows}), edw_part)]
+
+    def _join_columns(self) -> Tuple[List[str], List[str]]:
+        """GCP and EDW columns the reconciliation join reads."""
+        key = self.key_col
+        gcp_cols = [key] + [c for c in self.dimension_cols if c != key and c in self.gcp.columns] + self.measure_cols
+        edw_cols = [key] + self.measure_cols
+        if self.key_cols:
+            gcp_cols.append(self._KEY_CODE_COL)
+            edw_cols.append(self._KEY_CODE_COL)
+        return gcp_cols, edw_cols
+
+    def _assemble_reconciliation(self, results: Iterable[BucketResult],
+                                 sampled_rows: Optional[np.ndarray] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Assemble stage 4 and 5 outputs from per‑bucket results.
+
+        GCP rows not covered by any result (e.g. skipped by the digest diff)
+        are ``Match``; with ``sampled_rows`` (ascending positions) only those
+        are, and the other rows are ``Not Sampled``.  With ``output_dir`` the
+        outputs are streamed to files instead.
+        """
+        if self.output_dir:
+            return self._stream_reconciliation(results, sampled_rows)
+        status, details = self._default_annotations(0, len(self.gcp), sampled_rows)
+        mismatch_chunks: List[pd.DataFrame] = []
+        for mismatch_chunk, rows, chunk_status, chunk_details in results:
+            if not mismatch_chunk.empty:
+                mismatch_chunks.append(mismatch_chunk)
+            status[rows] = chunk_status
+            details[rows] = chunk_details
+
+        if mismatch_chunks:
+            mismatch_output = pd.concat(mismatch_chunks, ignore_index=True)
+        else:
+            mismatch_output = self._empty_mismatch_report()
+        mismatch_output = self._finalise_mismatch_report(mismatch_output)
+        return mismatch_output, self._annotate(slice(None), status, details)
+
+    @staticmethod
+    def _default_annotations(start: int, stop: int,
+                             sampled_rows: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Status and details of GCP rows ``start:stop`` that no result covers."""
+        if sampled_rows is None:
+            status = np.full(stop - start, "Match", dtype=object)
+        else:
+            status = np.full(stop - start, "Not Sampled", dtype=object)
+            lo, hi = np.searchsorted(sampled_rows, [start, stop])
+            status[sampled_rows[lo:hi] - start] = "Match"
+        return status, np.full(stop - start, "", dtype=object)
+
+    def _empty_mismatch_report(self) -> pd.DataFrame:
+        return self._mismatch_report(self._reconcile_frames(self.gcp.head(0), self.edw.head(0)))
+
+    def _annotate(self, rows: slice, status: np.ndarray, details: np.ndarray) -> pd.DataFrame:
+        """Output 5 for a slice of GCP rows: the rows with their ``status`` and ``details`` attached by position.
+
+        The frame is a shallow copy of ``self.gcp``, so only the decoded
+        dimensions and the two new columns are allocated.
+        """
+        annotated = self._decode_dimensions(self.gcp.iloc[rows].copy(deep=False))
+        annotated["validation_status"] = status
         if self.measure_cols:
-            # Bring side‑by‑side values for building the details string
-            side_values = merged[[key] + [f"{m}__GCP" for m in self.measure_cols] + [f"{m}__EDW" for m in self.measure_cols]]
-            gcp_annotated = gcp_annotated.merge(side_values, on=key, how="left")
-            def build_details(row: pd.Series) -> str:
-                if row["validation_status"] != "Value Mismatch":
-                    return ""
-                parts: List[str] = []
-                for m in self.measure_cols:
-                    gv = row.get(f"{m}__GCP")
-                    ev = row.get(f"{m}__EDW")
-                    same = np.isclose(gv, ev, equal_nan=True, atol=self.atol, rtol=self.rtol)
-                    if not bool(same):
-                        delta = (gv - ev) if (pd.notna(gv) and pd.notna(ev)) else np.nan
-                        parts.append(f"{m}={gv}|{ev} (Δ={delta})")
-                return "; ".join(parts)
-            gcp_annotated["mismatch_details"] = gcp_annotated.apply(build_details, axis=1)
-            # Drop helper measure columns
-            helper_cols = [f"{m}__GCP" for m in self.measure_cols] + [f"{m}__EDW" for m in self.measure_cols]
-            gcp_annotated.drop(columns=[c for c in helper_cols if c in gcp_annotated.columns], inplace=True)
-        # Drop mismatch_type from the final annotated output
-        if "mismatch_type" in gcp_annotated.columns:
-            gcp_annotated.drop(columns=["mismatch_type"], inplace=True)
-
-        return mismatch_output, gcp_annotated
+            annotated["mismatch_details"] = details
+        return annotated
+
+    def _top_differences(self, report: pd.DataFrame) -> pd.DataFrame:
+        """The ``preview_rows`` rows of a mismatch report with the largest absolute difference.
+
+        ``max_abs_difference`` is the largest ``|GCP - EDW|`` over the
+        measures; one‑sided rows have none and come last.
+        """
+        if "max_abs_difference" not in report.columns:
+            diff_cols = [f"{m}__Difference" for m in self.measure_cols]
+            largest = np.abs(report[diff_cols].to_numpy(dtype="float64")) if diff_cols else np.empty((len(report), 0))
+            with np.errstate(invalid="ignore"):
+                report = report.assign(max_abs_difference=np.fmax.reduce(largest, axis=1, initial=np.nan)
+                                       if len(report) else np.empty(0))
+        ranked = report.sort_values(["max_abs_difference", self.key_col], ascending=[False, True],
+                                    na_position="last", kind="mergesort")
+        return ranked.head(self.preview_rows).reset_index(drop=True)
+
+    def _annotate_chunk_rows(self) -> int:
+        """GCP rows per chunk of the streamed output 5: ``_WRITE_CHUNK_ROWS``, fewer if ``memory_budget_mb`` calls for it."""
+        row_bytes = self._estimate_row_bytes(self.gcp, list(self.gcp.columns))
+        budget_bytes = max(float(self.memory_budget_mb), 1.0) * 1024 * 1024
+        # The chunk is decoded and then converted for the writer
+        fitting = int(budget_bytes / (row_bytes * self._MERGE_MEMORY_FACTOR)) if row_bytes else self._WRITE_CHUNK_ROWS
+        return max(1, min(self._WRITE_CHUNK_ROWS, fitting))
+
+    @staticmethod
+    def _spill_notes(directory: str, chunk_rows: int, rows: np.ndarray, status: np.ndarray,
+                     details: np.ndarray) -> None:
+        """Append the non‑``Match`` annotations of one result to the spill file of each output 5 chunk."""
+        keep = status != "Match"
+        rows, status, details = rows[keep], status[keep], details[keep]
+        chunks = rows // chunk_rows
+        order = np.argsort(chunks, kind="stable")
+        rows, status, details, chunks = rows[order], status[order], details[order], chunks[order]
+        starts = np.flatnonzero(np.r_[True, chunks[1:] != chunks[:-1]]) if len(chunks) else np.empty(0, "int64")
+        for lo, hi in zip(starts, np.r_[starts[1:], len(chunks)].astype("int64")):
+            with open(os.path.join(directory, f"notes_{chunks[lo]:07d}.pkl"), "ab") as fh:
+                pickle.dump((rows[lo:hi], status[lo:hi], details[lo:hi]), fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _stream_reconciliation(self, results: Iterable[BucketResult],
+                               sampled_rows: Optional[np.ndarray] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Write outputs 4 and 5 to ``output_dir`` chunk by chunk; return a preview and counts.
+
+        Each bucket's mismatch rows are finalised (readable keys, decoded
+        dimensions, sorted by key within the chunk) and appended to the
+        ``4_mismatches`` file as soon as they arrive, and its non‑``Match``
+        GCP annotations are spilled to ``spill_dir`` by output 5 chunk.  The
+        ``5_annotated_gcp`` file is then written one chunk of GCP rows at a
+        time (see :meth:`_annotate_chunk_rows`), so no array spans the whole
+        table.  In their place this returns the top ``preview_rows``
+        mismatches by absolute difference (see :meth:`_top_differences`) and
+        a table of row counts per ``mismatch_type`` / ``validation_status``
+        with the file paths.
+        """
+        if self.output_format not in _ChunkWriter.SUFFIXES:
+            raise ValueError(f"output_format must be one of {list(_ChunkWriter.SUFFIXES)}, got {self.output_format!r}")
+        os.makedirs(self.output_dir, exist_ok=True)
+        suffix = _ChunkWriter.SUFFIXES[self.output_format]
+        mismatch_writer = _ChunkWriter(os.path.join(self.output_dir, "4_mismatches" + suffix), self.output_format)
+        annotated_writer = _ChunkWriter(os.path.join(self.output_dir, "5_annotated_gcp" + suffix), self.output_format)
+
+        preview: Optional[pd.DataFrame] = None
+        type_counts = pd.Series(dtype="int64")
+        status_counts = pd.Series(dtype="int64")
+        chunk_rows = self._annotate_chunk_rows()
+        try:
+            with tempfile.TemporaryDirectory(dir=self.spill_dir, prefix="annotate_") as spill:
+                for mismatch_chunk, rows, chunk_status, chunk_details in results:
+                    self._spill_notes(spill, chunk_rows, rows, chunk_status, chunk_details)
+                    if mismatch_chunk.empty:
+                        continue
+                    report = self._finalise_mismatch_report(mismatch_chunk)
+                    mismatch_writer.write(report)
+                    type_counts = type_counts.add(report["mismatch_type"].value_counts(), fill_value=0)
+                    top = self._top_differences(report)
+                    preview = top if preview is None else self._top_differences(pd.concat([preview, top], ignore_index=True))
+                if mismatch_writer.rows == 0:
+                    mismatch_writer.write(self._finalise_mismatch_report(self._empty_mismatch_report()))
+                for start in range(0, max(len(self.gcp), 1), chunk_rows):
+                    stop = min(start + chunk_rows, len(self.gcp))
+                    status, details = self._default_annotations(start, stop, sampled_rows)
+                    notes = os.path.join(spill, f"notes_{start // chunk_rows:07d}.pkl")
+                    for rows, chunk_status, chunk_details in (self._read_spilled(notes) if os.path.exists(notes) else []):
+                        status[rows - start] = chunk_status
+                        details[rows - start] = chunk_details
+                    status_counts = status_counts.add(pd.Series(status).value_counts(), fill_value=0)
+                    annotated_writer.write(self._annotate(slice(start, stop), status, details))
+        finally:
+            mismatch_writer.close()
+            annotated_writer.close()
+        print(f"[Validator] Wrote {mismatch_writer.rows} mismatch rows to {mismatch_writer.path} "
+              f"and {annotated_writer.rows} annotated GCP rows to {annotated_writer.path}")
+
+        if preview is None:
+            preview = self._top_differences(self._finalise_mismatch_report(self._empty_mismatch_report()))
+        counts = pd.concat([
+            pd.DataFrame({"Output": "4_mismatches", "Status": type_counts.index.astype(str),
+                          "Rows": type_counts.to_numpy(dtype="int64"), "Path": mismatch_writer.path}),
+            pd.DataFrame({"Output": "5_annotated_gcp", "Status": status_counts.index.astype(str),
+                          "Rows": status_counts.to_numpy(dtype="int64"), "Path": annotated_writer.path}),
+        ], ignore_index=True)
+        return preview, counts.sort_values(["Output", "Status"], kind="mergesort").reset_index(drop=True)
+
+    # ----------------------------------------------------------------------
+    # Stage 4 & 5 (pruned): Hierarchical digest diff
+    # ----------------------------------------------------------------------
+    def _digest_levels(self) -> List[Tuple[str, Any]]:
+        """Drill‑down levels as ``(name, values_fn)`` pairs, coarsest first.
+
+        ``values_fn(df, rows)`` returns, for the rows at positions ``rows``,
+        the value identifying their slice at that level relative to the
+        parent slice.  Every level keeps whole
+        dimension groups together, so a slice holds all rows of its keys.
+        """
+        levels: List[Tuple[str, Any]] = [("Table", lambda df, rows: np.zeros(len(rows), dtype="int64"))]
+        if self.date_col in self.dimension_cols:
+            date = self.date_col
+            levels.append((f"Partition ({self.partition_freq})",
+                           lambda df, rows: df[date].iloc[rows].dt.to_period(self.partition_freq).array.asi8))
+            levels.append(("Date", lambda df, rows: df[date].iloc[rows].dt.normalize().to_numpy()))
+        prefix: List[str] = []
+        for c in self.dimension_cols:
+            if c == self.date_col:
+                continue
+            prefix.append(c)
+            levels.append((f"Dimensions: {', '.join(prefix)}", lambda df, rows, c=c: self._dimension_codes(df, c)[rows]))
+        return levels
+
+    def _row_digests(self, df: pd.DataFrame) -> np.ndarray:
+        """64‑bit hash of each row's dimensions and exact measure values."""
+        return pd.util.hash_pandas_object(df[["__dimension_hash__"] + self.measure_cols], index=False).to_numpy()
+
+    @staticmethod
+    def _slice_digests(slice_ids: np.ndarray, row_digests: np.ndarray) -> pd.DataFrame:
+        """Order‑independent digest per slice: row count plus the sums of both 32‑bit halves of the row hashes."""
+        parts = pd.DataFrame({
+            "rows": np.ones(len(slice_ids), dtype="uint64"),
+            "lo": row_digests & np.uint64(0xFFFFFFFF),
+            "hi": row_digests >> np.uint64(32),
+        })
+        return parts.groupby(slice_ids, sort=False).sum()
+
+    @_profiled("run_digest_diff")
+    def run_digest_diff(self) -> pd.DataFrame:
+        """Find the slices whose content differs between GCP and EDW.
+
+        Each side is digested slice by slice, from the whole table down
+        through partition, date and growing dimension prefixes.  A slice's
+        digest is its row count plus an order‑independent sum of per‑row
+        hashes, so equal digests prove (with overwhelming probability) that
+        both sides hold the same multiset of rows and every row in it would
+        reconcile as ``Match``.  Only slices with differing digests are
+        drilled into; the rows left at the deepest level are the ones
+        :meth:`run_reconciliation` joins when ``digest_prune`` is set.
+
+        Returns one row per level with the slices compared and differing
+        and the GCP/EDW rows proven identical (skipped) at that level.
+        """
+        columns = ["Level", "Slices Compared", "Slices Differing", "GCP Rows Skipped", "EDW Rows Skipped"]
+        self._ensure_comparison_ids()
+        gcp_rows = np.arange(len(self.gcp))
+        edw_rows = np.arange(len(self.edw))
+        gcp_digest = self._row_digests(self.gcp)
+        edw_digest = self._row_digests(self.edw)
+        gcp_slice = np.zeros(len(self.gcp), dtype="uint64")
+        edw_slice = np.zeros(len(self.edw), dtype="uint64")
+
+        records: List[Dict[str, Any]] = []
+        for name, values in self._digest_levels():
+            if len(gcp_rows) == 0 and len(edw_rows) == 0:
+                break
+            # Refine the parent slice id with this level's value (active rows only)
+            gcp_slice = pd.util.hash_pandas_object(pd.DataFrame({
+                "parent": gcp_slice, "value": values(self.gcp, gcp_rows)}), index=False).to_numpy()
+            edw_slice = pd.util.hash_pandas_object(pd.DataFrame({
+                "parent": edw_slice, "value": values(self.edw, edw_rows)}), index=False).to_numpy()
+
+            g_dig = self._slice_digests(gcp_slice, gcp_digest)
+            e_dig = self._slice_digests(edw_slice, edw_digest)
+            # Reindex with 0 (not an outer join) so the uint64 sums are compared exactly
+            slices = g_dig.index.union(e_dig.index)
+            g_dig = g_dig.reindex(slices, fill_value=0)
+            e_dig = e_dig.reindex(slices, fill_value=0)
+            differing = slices[(g_dig.to_numpy() != e_dig.to_numpy()).any(axis=1)]
+
+            keep_g = np.isin(gcp_slice, differing)
+            keep_e = np.isin(edw_slice, differing)
+            records.append({
+                "Level": name,
+                "Slices Compared": len(slices),
+                "Slices Differing": len(differing),
+                "GCP Rows Skipped": int((~keep_g).sum()),
+                "EDW Rows Skipped": int((~keep_e).sum()),
+            })
+            gcp_rows, gcp_slice, gcp_digest = gcp_rows[keep_g], gcp_slice[keep_g], gcp_digest[keep_g]
+            edw_rows, edw_slice, edw_digest = edw_rows[keep_e], edw_slice[keep_e], edw_digest[keep_e]
+
+        self._digest_rows = (gcp_rows, edw_rows)
+        report = pd.DataFrame(records, columns=columns)
+        self._digest_report = report
+        print(f"[Validator] Digest diff skipped {int(report['GCP Rows Skipped'].sum())} GCP and "
+              f"{int(report['EDW Rows Skipped'].sum())} EDW rows as proven identical")
+        return report
+
+    def _digest_candidates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Row positions (GCP, EDW) left to reconcile after the digest diff."""
+        if self._digest_rows is None:
+            self.run_digest_diff()
+        return self._digest_rows
+
+    # ----------------------------------------------------------------------
+    # Stage 4 & 5 (sampled): Key-hash sampling with confidence intervals
+    # ----------------------------------------------------------------------
+    def _sample_rows(self, df: pd.DataFrame) -> np.ndarray:
+        """Positions of rows whose dimension group falls in the ``sample_rate`` sample.
+
+        The decision depends only on the dimension hash, so both sides pick
+        the same keys and duplicate rows of a group are sampled together.
+        """
+        mixed = df["__dimension_hash__"].to_numpy(dtype="uint64") * np.uint64(0x9E3779B97F4A7C15)
+        uniform = (mixed >> np.uint64(11)).astype("float64") / 2.0 ** 53
+        return np.flatnonzero(uniform < self.sample_rate)
+
+    @staticmethod
+    def _wilson_interval(successes: np.ndarray, n: np.ndarray, z: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Wilson score interval for binomial proportions (NaN where ``n == 0``)."""
+        successes = np.asarray(successes, dtype="float64")
+        n = np.asarray(n, dtype="float64")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            p = successes / n
+            centre = (p + z ** 2 / (2 * n)) / (1 + z ** 2 / n)
+            half = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / (1 + z ** 2 / n)
+        return np.clip(centre - half, 0.0, 1.0), np.clip(centre + half, 0.0, 1.0)
+
+    def _sampled_reconciliation(self) -> Dict[str, Any]:
+        """Reconcile the sampled rows and estimate mismatch rates (memoised)."""
+        if self._sample is not None:
+            return self._sample
+        if not 0.0 < self.sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be in (0, 1], got {self.sample_rate}")
+        self._ensure_comparison_ids()
+        gcp_rows = self._sample_rows(self.gcp)
+        edw_rows = self._sample_rows(self.edw)
+        g_keys = self.gcp[self.key_col].to_numpy()[gcp_rows]
+        e_keys = self.edw[self.key_col].to_numpy()[edw_rows]
+        n_keys = len(np.union1d(g_keys, e_keys))
+        n_both = len(np.intersect1d(g_keys, e_keys))
+
+        join_g, join_e = gcp_rows, edw_rows
+        if self.digest_prune:
+            # Rows outside the digest candidates are proven matches; skip joining them
+            digest_g, digest_e = self._digest_candidates()
+            join_g, join_e = np.intersect1d(gcp_rows, digest_g), np.intersect1d(edw_rows, digest_e)
+        results = list(self._iter_reconciliation_results(join_g, join_e))
+
+        # Mismatch counts overall, per mismatch type and per measure (among keys on both sides)
+        mismatches = pd.concat([r[0] for r in results], ignore_index=True)
+        types = ["In GCP Only", "In EDW Only", "Value Mismatch"]
+        type_counts = mismatches["mismatch_type"].value_counts().reindex(types, fill_value=0).to_numpy()
+        value_rows = mismatches.loc[mismatches["mismatch_type"] == "Value Mismatch"]
+        if self.measure_cols:
+            measure_counts = self._compare_measures(*self._measure_blocks(value_rows))[0].sum(axis=0).tolist()
+        else:
+            measure_counts = []
+        estimates = pd.DataFrame({
+            "Category": ["Overall"] + ["Mismatch Type"] * len(types) + ["Measure"] * len(self.measure_cols),
+            "Name": ["Any Mismatch"] + types + list(self.measure_cols),
+            "Sampled Keys": [n_keys] * (1 + len(types)) + [n_both] * len(self.measure_cols),
+            "Mismatches": [len(mismatches)] + list(type_counts) + measure_counts,
+        })
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            estimates["Estimated Rate"] = estimates["Mismatches"] / estimates["Sampled Keys"]
+        estimates["CI Lower"], estimates["CI Upper"] = self._wilson_interval(
+            estimates["Mismatches"], estimates["Sampled Keys"], z)
+        estimates["Estimated Count"] = estimates["Mismatches"] / self.sample_rate
+
+        overall = estimates["Estimated Rate"].iloc[0]
+        escalated = self.escalate_threshold is not None and bool(overall > self.escalate_threshold)
+        print(f"[Validator] Sampled {len(gcp_rows)} GCP / {len(edw_rows)} EDW rows "
+              f"at rate {self.sample_rate}; estimated mismatch rate {overall:.4%}")
+        if escalated:
+            print(f"[Validator] Estimated mismatch rate exceeds {self.escalate_threshold}; "
+                  "escalating to exact reconciliation")
+        self._sample = {"gcp_rows": gcp_rows, "edw_rows": edw_rows, "results": results,
+                        "estimates": estimates, "escalated": escalated}
+        return self._sample
+
+    def _run_reconciliation_sampled(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Outputs 4 and 5 for the sampled rows; other GCP rows are ``Not Sampled``."""
+        sample = self._sampled_reconciliation()
+        return self._assemble_reconciliation(sample["results"], sample["gcp_rows"])
+
+    @_profiled("run_sample_estimates")
+    def run_sample_estimates(self) -> pd.DataFrame:
+        """Estimated mismatch rates from the ``sample_rate`` sample with Wilson intervals.
+
+        One row overall, one per mismatch type and one per measure (the
+        share of keys present on both sides whose value differs).  Rates
+        are over comparison keys; ``CI Lower``/``CI Upper`` bound the rate
+        at ``confidence`` and ``Estimated Count`` scales the sampled count
+        by ``1 / sample_rate``.  Sampling whole dimension groups makes the
+        intervals slightly optimistic when groups contain many duplicates.
+        """
+        columns = ["Category", "Name", "Sampled Keys", "Mismatches", "Estimated Rate",
+                   "CI Lower", "CI Upper", "Estimated Count"]
+        if self.sample_rate is None:
+            return pd.DataFrame(columns=columns)
+        return self._sampled_reconciliation()["estimates"][columns]
+
+    # ----------------------------------------------------------------------
+    # Stage 4 & 5 (incremental): Persisted per-partition state
+    # ----------------------------------------------------------------------
+    def _partition_labels(self, df: pd.DataFrame) -> np.ndarray:
+        """``partition_freq`` period label of every row (``"NaT"`` for rows without a date)."""
+        codes, uniques = pd.factorize(df[self.date_col].dt.to_period(self.partition_freq))
+        names = np.append(np.asarray(uniques.astype(str), dtype=object), "NaT")
+        return names[codes]
+
+    def _state_signature(self) -> str:
+        """Configuration that cached results depend on; a change forces a full rebuild."""
+        return json.dumps({
+            "date_col": self.date_col,
+            "dimension_cols": self.dimension_cols,
+            "measure_cols": self.measure_cols,
+            "partition_freq": self.partition_freq,
+            "atol": self.atol,
+            "rtol": self.rtol,
+            "string_keys": self._string_keys,
+            "key_cols": self.key_cols,
+            "measure_tolerances": {m: list(t) for m, t in (self.measure_tolerances or {}).items()},
+        }, sort_keys=True)
+
+    def _open_state_store(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.state_store)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(partitions)")]
+        if columns and columns != ["partition", "fingerprint", "mismatches", "annotations", "gcp_days", "edw_days"]:
+            # Written in an older layout whose results cannot be read back; start over
+            with conn:
+                conn.execute("DROP TABLE partitions")
+        conn.execute("""CREATE TABLE IF NOT EXISTS partitions (
+                            partition TEXT PRIMARY KEY, fingerprint TEXT,
+                            mismatches BLOB, annotations BLOB, gcp_days BLOB, edw_days BLOB)""")
+        return conn
+
+    def _partition_fingerprints(self, g_labels: np.ndarray, e_labels: np.ndarray) -> pd.Series:
+        """Digest fingerprint per partition covering both sides (see :meth:`run_digest_diff`)."""
+        sides = []
+        for df, labels in ((self.gcp, g_labels), (self.edw, e_labels)):
+            dig = self._slice_digests(labels, self._row_digests(df))
+            sides.append(dig["rows"].astype(str) + ":" + dig["lo"].astype(str) + ":" + dig["hi"].astype(str))
+        partitions = sides[0].index.union(sides[1].index)
+        return sides[0].reindex(partitions, fill_value="-") + "|" + sides[1].reindex(partitions, fill_value="-")
+
+    def _incremental_plan(self) -> Dict[str, Any]:
+        """Compare current partition fingerprints with the state store (memoised).
+
+        Returns the partition labels of both sides, the current fingerprints,
+        the partitions whose cached results can be reused, the cached rows
+        for those partitions and their cached daily cubes per side (see
+        :meth:`DailyAggregates.to_frame`).
+        """
+        if self._incremental is not None:
+            return self._incremental
+        self._ensure_comparison_ids()
+        g_labels = self._partition_labels(self.gcp)
+        e_labels = self._partition_labels(self.edw)
+        fingerprints = self._partition_fingerprints(g_labels, e_labels)
+
+        cached: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+        cubes: Dict[str, Dict[str, pd.DataFrame]] = {}
+        conn = self._open_state_store()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'signature'").fetchone()
+            if not self.full_rebuild and row is not None and row[0] == self._state_signature():
+                for partition, fingerprint, mismatches, annotations, gcp_days, edw_days in conn.execute(
+                        "SELECT * FROM partitions"):
+                    if fingerprints.get(partition) == fingerprint:
+                        cached[partition] = (_frame_from_ipc(mismatches), _frame_from_ipc(annotations))
+                        cubes[partition] = {"gcp": _frame_from_ipc(gcp_days), "edw": _frame_from_ipc(edw_days)}
+        finally:
+            conn.close()
+
+        reused = sorted(cached)
+        print(f"[Validator] State store: reusing {len(reused)} of {len(fingerprints)} partition(s)")
+        self._incremental = {"gcp_labels": g_labels, "edw_labels": e_labels,
+                             "fingerprints": fingerprints, "reused": reused, "cached": cached, "cubes": cubes}
+        return self._incremental
+
+    def _incremental_enabled(self) -> bool:
+        """Whether ``state_store`` applies: rows are matched on the date, so no key spans two partitions."""
+        return bool(self.state_store) and self.date_col is not None and self.date_col in self._identity_cols()
+
+    def _partition_of_keys(self, keys: pd.Series, g_labels: np.ndarray, e_labels: np.ndarray) -> np.ndarray:
+        """Partition label of each comparison key (looked up on whichever side has it)."""
+        lookups = []
+        for df, labels in ((self.gcp, g_labels), (self.edw, e_labels)):
+            hit = df[self.key_col].isin(keys).to_numpy()
+            lookups.append(pd.Series(labels[hit], index=df[self.key_col].to_numpy()[hit]))
+        lookup = pd.concat(lookups)
+        return keys.map(lookup[~lookup.index.duplicated()]).to_numpy(dtype=object)
+
+    def _run_reconciliation_incremental(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Reconcile only partitions whose fingerprint changed since the previous run.
+
+        A comparison key never spans partitions (rows are matched on the
+        date, see :meth:`_incremental_enabled`), so partitions reconcile
+        independently.  Mismatch rows and non‑``Match`` GCP annotations of
+        unchanged partitions come from ``state_store``; the changed
+        partitions are joined (honouring the chunked, parallel and
+        digest‑prune modes) and written back together with their
+        fingerprints.
+        """
+        plan = self._incremental_plan()
+        g_labels, e_labels, cached = plan["gcp_labels"], plan["edw_labels"], plan["cached"]
+        reused = np.asarray(plan["reused"], dtype=object)
+        gcp_rows = np.flatnonzero(~np.isin(g_labels, reused))
+        edw_rows = np.flatnonzero(~np.isin(e_labels, reused))
+        if self.digest_prune:
+            digest_g, digest_e = self._digest_candidates()
+            gcp_rows = np.intersect1d(gcp_rows, digest_g)
+            edw_rows = np.intersect1d(edw_rows, digest_e)
+        fresh = list(self._iter_reconciliation_results(gcp_rows, edw_rows))
+
+        # Cached results for the reused partitions, in the same shape as a fresh bucket
+        results = list(fresh)
+        if cached:
+            # Partitions without mismatches are skipped, so the concatenation dtypes come from real rows
+            stored = list(cached.values())
+            cached_mismatches = pd.concat([m for m, _ in stored if len(m)] or [stored[0][0]], ignore_index=True)
+            cached_notes = pd.concat([a for _, a in stored if len(a)] or [stored[0][1]],
+                                     ignore_index=True).set_index(self.key_col)
+            reused_rows = np.flatnonzero(np.isin(g_labels, reused))
+            keys = self.gcp[self.key_col].to_numpy()[reused_rows]
+            noted = pd.Index(keys).isin(cached_notes.index)
+            rows, keys = reused_rows[noted], keys[noted]
+            results.append((cached_mismatches, rows,
+                            cached_notes["validation_status"].reindex(keys).to_numpy(dtype=object),
+                            cached_notes["mismatch_details"].reindex(keys).to_numpy(dtype=object)))
+
+        self._save_state(fresh)
+        return self._assemble_reconciliation(results)
+
+    def _save_state(self, fresh: List[BucketResult]) -> None:
+        """Write fingerprints, fresh results and daily cubes of recomputed partitions to the store."""
+        plan = self._incremental_plan()
+        g_labels, e_labels, fingerprints = plan["gcp_labels"], plan["edw_labels"], plan["fingerprints"]
+        changed = [p for p in fingerprints.index if p not in plan["cached"]]
+
+        mismatches = pd.concat([r[0] for r in fresh], ignore_index=True) if fresh else pd.DataFrame(columns=[self.key_col])
+        mismatch_partition = self._partition_of_keys(mismatches[self.key_col], g_labels, e_labels)
+        rows = np.concatenate([r[1] for r in fresh]) if fresh else np.array([], dtype="int64")
+        notes = pd.DataFrame({
+            self.key_col: self.gcp[self.key_col].to_numpy()[rows],
+            "validation_status": np.concatenate([r[2] for r in fresh]) if fresh else np.array([], dtype=object),
+            "mismatch_details": np.concatenate([r[3] for r in fresh]) if fresh else np.array([], dtype=object),
+        })
+        note_partition = g_labels[rows]
+        not_match = (notes["validation_status"] != "Match").to_numpy()
+        # Daily cubes split by the partition of each day; the undated slot belongs to "NaT"
+        days = {}
+        for side in ("gcp", "edw"):
+            cube = self._side_aggregates(side).to_frame()
+            days[side] = (cube, cube["day"].dt.to_period(self.partition_freq).astype(str).to_numpy())
+
+        conn = self._open_state_store()
+        try:
+            with conn:
+                if self.full_rebuild or not plan["cached"]:
+                    conn.execute("DELETE FROM partitions")
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (self._state_signature(),))
+                conn.execute(f"DELETE FROM partitions WHERE partition NOT IN ({','.join('?' * len(fingerprints))})",
+                             list(fingerprints.index))
+                for p in changed:
+                    conn.execute("INSERT OR REPLACE INTO partitions VALUES (?, ?, ?, ?, ?, ?)", (
+                        p, fingerprints[p],
+                        _frame_to_ipc(mismatches.loc[mismatch_partition == p].reset_index(drop=True)),
+                        _frame_to_ipc(notes.loc[not_match & (note_partition == p)].reset_index(drop=True)),
+                        *(_frame_to_ipc(cube.loc[labels == p].reset_index(drop=True)) for cube, labels in days.values()),
+                    ))
+        finally:
+            conn.close()
 
     # ----------------------------------------------------------------------
     # Stage 6: Partition Checks
     # ----------------------------------------------------------------------
+    def _partition_table(self, freq: str) -> pd.DataFrame:
+        """Outer‑aligned partition comparison at one frequency, period‑major then measure.
+
+        Both sides are rolled up from their daily cubes and reindexed on the
+        union of periods, so counts, sums and tolerance checks are whole‑array
+        operations.  A period missing on one side has NaN count and sums
+        there and is reported as ``Mismatch``.
+        """
+        gcp_grouped = self._period_sums("gcp", freq)
+        edw_grouped = self._period_sums("edw", freq)
+        periods = sorted(set(gcp_grouped.index) | set(edw_grouped.index))
+        gcp_grouped = gcp_grouped.reindex(periods)
+        edw_grouped = edw_grouped.reindex(periods)
+
+        k = len(self.measure_cols)
+        g_count = np.repeat(gcp_grouped["__rows__"].to_numpy(dtype="float64"), k)
+        e_count = np.repeat(edw_grouped["__rows__"].to_numpy(dtype="float64"), k)
+        g_block = gcp_grouped[self.measure_cols].to_numpy(dtype="float64")
+        e_block = edw_grouped[self.measure_cols].to_numpy(dtype="float64")
+        sums_differ, sum_diff = self._compare_measures(g_block, e_block)
+        g_sums, e_sums = g_block.ravel(), e_block.ravel()
+        # Row counts are compared with the global tolerances
+        same = ~sums_differ.ravel() & ~_compare_blocks(g_count, e_count, self.atol, self.rtol)[0]
+        return pd.DataFrame({
+            "Period": np.repeat(np.asarray(periods, dtype=object), k),
+            "Measure": np.tile(np.asarray(self.measure_cols, dtype=object), len(periods)),
+            "GCP Row Count": g_count,
+            "EDW Row Count": e_count,
+            "Row Count Difference": g_count - e_count,
+            "GCP Sum": g_sums,
+            "EDW Sum": e_sums,
+            "Sum Difference": sum_diff.ravel(),
+            "Status": np.where(same, "Match", "Mismatch"),
+        })
+
+    @_profiled("run_partition_checks")
     def run_partition_checks(self) -> pd.DataFrame:
         """Compute partition level statistics (row counts and sums) for each period."""
         columns = ["Period", "Measure", "GCP Row Count", "EDW Row Count", "Row Count Difference",
@@ -563,48 +2849,32 @@ class ExtendedMigrationValidator:
         if self.date_col not in self.gcp.columns or self.date_col not in self.edw.columns:
             return pd.DataFrame(columns=columns)
 
-        # Determine the period label using the specified frequency (e.g. monthly 'M')
-        gcp_periods = self.gcp[self.date_col].dt.to_period(self.partition_freq).astype(str)
-        edw_periods = self.edw[self.date_col].dt.to_period(self.partition_freq).astype(str)
-        # Build DataFrames with period labels
-        gcp_df = self.gcp.assign(_period=gcp_periods)
-        edw_df = self.edw.assign(_period=edw_periods)
-        # Group by period and compute row counts and measure sums
-        gcp_grouped = gcp_df.groupby("_period").agg({**{self.date_col: "count"}, **{m: "sum" for m in self.measure_cols}})
-        edw_grouped = edw_df.groupby("_period").agg({**{self.date_col: "count"}, **{m: "sum" for m in self.measure_cols}})
-        # Rename the row count column
-        gcp_grouped.rename(columns={self.date_col: "GCP Row Count"}, inplace=True)
-        edw_grouped.rename(columns={self.date_col: "EDW Row Count"}, inplace=True)
-        # Ensure all periods appear on both sides
-        all_periods = sorted(set(gcp_grouped.index) | set(edw_grouped.index))
-        rows: List[Dict[str, Any]] = []
-        for period in all_periods:
-            gcp_row = gcp_grouped.loc[period] if period in gcp_grouped.index else pd.Series(index=gcp_grouped.columns, dtype="float64")
-            edw_row = edw_grouped.loc[period] if period in edw_grouped.index else pd.Series(index=edw_grouped.columns, dtype="float64")
-            gcp_count = gcp_row.get("GCP Row Count", 0.0)
-            edw_count = edw_row.get("EDW Row Count", 0.0)
-            count_diff = gcp_count - edw_count
-            for m in self.measure_cols:
-                g_val = gcp_row.get(m, np.nan)
-                e_val = edw_row.get(m, np.nan)
-                sum_diff = g_val - e_val if (pd.notna(g_val) and pd.notna(e_val)) else (g_val - e_val)
-                status = "Match" if (np.isclose(g_val, e_val, equal_nan=True, atol=self.atol, rtol=self.rtol) and np.isclose(gcp_count, edw_count, equal_nan=True, atol=self.atol, rtol=self.rtol)) else "Mismatch"
-                rows.append({
-                    "Period": period,
-                    "Measure": m,
-                    "GCP Row Count": gcp_count,
-                    "EDW Row Count": edw_count,
-                    "Row Count Difference": count_diff,
-                    "GCP Sum": g_val,
-                    "EDW Sum": e_val,
-                    "Sum Difference": sum_diff,
-                    "Status": status
-                })
-        return pd.DataFrame(rows, columns=columns)
+        # Roll the daily cubes up to the partition frequency (e.g. monthly 'M')
+        return self._partition_table(self.partition_freq)
+
+    @_profiled("run_partition_checks_multi")
+    def run_partition_checks_multi(self, freqs: Iterable[str] = ("D", "W", "M", "Q", "Y")) -> pd.DataFrame:
+        """Partition checks at several frequencies at once, stacked in one tidy table.
+
+        Each frequency is a roll‑up of the same daily cubes, so adding
+        frequencies costs one small groupby over days each rather than a
+        pass over the rows.  A leading ``Frequency`` column identifies the
+        partitioning; the other columns match :meth:`run_partition_checks`.
+        """
+        freqs = list(freqs)
+        columns = ["Frequency", "Period", "Measure", "GCP Row Count", "EDW Row Count", "Row Count Difference",
+                   "GCP Sum", "EDW Sum", "Sum Difference", "Status"]
+        if not freqs or not self.measure_cols or not self.date_col:
+            return pd.DataFrame(columns=columns)
+        if self.date_col not in self.gcp.columns or self.date_col not in self.edw.columns:
+            return pd.DataFrame(columns=columns)
+        tables = [self._partition_table(freq).assign(Frequency=freq) for freq in freqs]
+        return pd.concat(tables, ignore_index=True)[columns]
 
     # ----------------------------------------------------------------------
     # Stage 7: Distribution Statistics
     # ----------------------------------------------------------------------
+    @_profiled("run_distribution_stats")
     def run_distribution_stats(self) -> pd.DataFrame:
         """Compute descriptive and distributional statistics for each numeric measure."""
         columns = ["Measure", "GCP Mean", "EDW Mean", "Mean Difference",
@@ -615,21 +2885,31 @@ class ExtendedMigrationValidator:
         if not self.measure_cols:
             return pd.DataFrame(columns=columns)
 
+        if self.distribution_mode not in ("exact", "sketch"):
+            raise ValueError(f"distribution_mode must be 'exact' or 'sketch', got {self.distribution_mode!r}")
+        if self.distribution_mode == "sketch":
+            return self._sketch_distribution_stats(columns)
+
+        # Mean and (population) variance come from the moments kept in the daily cubes
+        _, g_means, g_vars = self._side_aggregates("gcp").moments()
+        _, e_means, e_vars = self._side_aggregates("edw").moments()
+        g_values, e_values = self._measure_frame("gcp"), self._measure_frame("edw")
+
         results: List[Dict[str, Any]] = []
-        for m in self.measure_cols:
-            g_series = self.gcp[m].dropna()
-            e_series = self.edw[m].dropna()
-            g_mean = g_series.mean()
-            e_mean = e_series.mean()
+        for j, m in enumerate(self.measure_cols):
+            g_series = g_values[m].dropna()
+            e_series = e_values[m].dropna()
+            g_mean = g_means[j]
+            e_mean = e_means[j]
             mean_diff = g_mean - e_mean
             g_median = g_series.median()
             e_median = e_series.median()
             median_diff = g_median - e_median
-            g_std = g_series.std(ddof=0)
-            e_std = e_series.std(ddof=0)
+            g_std = np.sqrt(g_vars[j])
+            e_std = np.sqrt(e_vars[j])
             std_diff = g_std - e_std
-            g_var = g_series.var(ddof=0)
-            e_var = e_series.var(ddof=0)
+            g_var = g_vars[j]
+            e_var = e_vars[j]
             var_diff = g_var - e_var
             # KS test (if available)
             if _has_scipy and len(g_series) > 0 and len(e_series) > 0:
@@ -689,17 +2969,454 @@ class ExtendedMigrationValidator:
             })
         return pd.DataFrame(results, columns=columns)
 
+    def _measure_frame(self, side: str) -> pd.DataFrame:
+        """A frame holding the measure columns of ``"gcp"`` or ``"edw"`` (stage 7 reads only those)."""
+        return self.gcp if side == "gcp" else self.edw
+
+    def _side_sketches(self, side: str) -> List[MeasureSketch]:
+        """One :class:`MeasureSketch` per measure for ``"gcp"`` or ``"edw"``, built once per side.
+
+        Rows are summarised in chunks of ``_SKETCH_CHUNK_ROWS`` and the chunk
+        sketches merged.  With ``n_workers > 1`` the chunks are summarised in
+        the process pool, from the values placed once in shared memory.
+        """
+        if side not in self._sketches:
+            frame = self._measure_frame(side)
+            starts = range(0, len(frame), self._SKETCH_CHUNK_ROWS)
+            if self.n_workers > 1 and len(starts) > 1:
+                with _SharedArrays() as shared, self._process_pool() as pool:
+                    values = shared.add("values", dtype="float64", shape=(len(frame), len(self.measure_cols)))
+                    for j, m in enumerate(self.measure_cols):
+                        values[:, j] = frame[m].to_numpy(dtype="float64")
+                    partials = list(pool.map(_sketch_task, repeat(self.sketch_k), repeat(shared.specs), starts,
+                                             [start + self._SKETCH_CHUNK_ROWS for start in starts]))
+            else:
+                values = frame[self.measure_cols].to_numpy(dtype="float64")
+                partials = [_sketch_rows(self.sketch_k, values[start:start + self._SKETCH_CHUNK_ROWS])
+                            for start in starts]
+            sketches = [MeasureSketch(k=self.sketch_k) for _ in self.measure_cols]
+            for partial in partials:
+                for sketch, chunk_sketch in zip(sketches, partial):
+                    sketch.merge(chunk_sketch)
+            self._sketches[side] = sketches
+        return self._sketches[side]
+
+    def _sketch_distribution_stats(self, columns: List[str]) -> pd.DataFrame:
+        """Stage 7 from the per‑side sketches.
+
+        Mean and variance are exact.  Median, the KS statistic and the PSI
+        bin shares are estimated from the quantile sketches: each CDF value
+        is within the sketch's rank error allowance (see
+        :attr:`MeasureSketch.rank_error`), so the KS statistic and every PSI
+        bin share are within the two sides' allowances combined.
+        The KS p‑value uses the asymptotic Kolmogorov distribution for the
+        statistic less that error, so ``KS Pass`` only fails on gaps the
+        sketches cannot account for.
+        """
+        results: List[Dict[str, Any]] = []
+        for m, g_sk, e_sk in zip(self.measure_cols, self._side_sketches("gcp"), self._side_sketches("edw")):
+            g_std, e_std = np.sqrt(g_sk.variance), np.sqrt(e_sk.variance)
+            ks_stat, ks_p = np.nan, np.nan
+            psi_value, psi_pass = np.nan, False
+            if g_sk.count > 0 and e_sk.count > 0:
+                # KS statistic: largest CDF gap over every retained value of either sketch
+                support = np.concatenate(g_sk.levels + e_sk.levels)
+                ks_stat = float(np.max(np.abs(g_sk.cdf(support) - e_sk.cdf(support))))
+                if _has_scipy:
+                    n_eff = g_sk.count * e_sk.count / (g_sk.count + e_sk.count)
+                    ks_floor = max(ks_stat - g_sk.rank_error - e_sk.rank_error, 0.0)
+                    ks_p = float(kstwobign.sf(ks_floor * np.sqrt(n_eff)))
+                # PSI over equal-width bins of the combined range, shares from CDF differences
+                lo, hi = min(g_sk.min, e_sk.min), max(g_sk.max, e_sk.max)
+                if lo == hi:
+                    psi_value, psi_pass = 0.0, True
+                else:
+                    edges = np.linspace(lo, hi, self.psi_bins + 1)
+                    epsilon = 1e-12
+                    shares = []
+                    for sk in (g_sk, e_sk):
+                        below = np.append(sk.cdf(edges[:-1], side="left"), 1.0)
+                        shares.append(np.where(np.diff(below) <= 0, epsilon, np.diff(below)))
+                    psi_value = float(np.sum((shares[0] - shares[1]) * np.log(shares[0] / shares[1])))
+                    psi_pass = psi_value < 0.1
+            g_median, e_median = g_sk.quantile(0.5), e_sk.quantile(0.5)
+            results.append({
+                "Measure": m,
+                "GCP Mean": g_sk.mean if g_sk.count else np.nan,
+                "EDW Mean": e_sk.mean if e_sk.count else np.nan,
+                "Mean Difference": (g_sk.mean - e_sk.mean) if (g_sk.count and e_sk.count) else np.nan,
+                "GCP Median": g_median,
+                "EDW Median": e_median,
+                "Median Difference": g_median - e_median,
+                "GCP Std Dev": g_std,
+                "EDW Std Dev": e_std,
+                "Std Dev Difference": g_std - e_std,
+                "GCP Variance": g_sk.variance,
+                "EDW Variance": e_sk.variance,
+                "Variance Difference": g_sk.variance - e_sk.variance,
+                "KS Statistic": ks_stat,
+                "KS p-value": ks_p,
+                "KS Pass": ks_p >= 0.05 if not np.isnan(ks_p) else False,
+                "PSI Value": psi_value,
+                "PSI Pass": psi_pass
+            })
+        return pd.DataFrame(results, columns=columns)
+
+    # ----------------------------------------------------------------------
+    # Variance attribution: drill into grand-total differences
+    # ----------------------------------------------------------------------
+    def _attribution_dims(self) -> List[str]:
+        """Dimensions to drill into; declared key columns single out rows and are left out."""
+        return [c for c in self.dimension_cols if c not in (self.key_cols or [])]
+
+    def _slice_dictionary(self) -> Dict[str, Any]:
+        """Both sides folded into cells of the attribution dimensions (built once).
+
+        A cell holds the rows of one side sharing every attribution value,
+        so drilling down aggregates cells instead of rows.  Returns
+        ``{"codes": codes, "values": {dim: values}, "rows": counts,
+        "measures": block, "gcp_cells": n}``: ``codes`` has one row per cell
+        (GCP cells first) and one column per :meth:`_attribution_dims`
+        entry, with one dictionary per column shared by both sides;
+        ``values[dim]`` maps a code back to its (still encoded) value, the
+        date being its ``partition_freq`` period label; ``block`` holds the
+        measure sums of each cell with missing values counted as zero.
+        """
+        if self._slice_codes is None:
+            dims = self._attribution_dims()
+            sides = (self.gcp, self.edw)
+            codes = np.empty((len(self.gcp) + len(self.edw), len(dims) + 1), dtype="int64", order="F")
+            codes[:, 0] = np.repeat([0, 1], [len(self.gcp), len(self.edw)])
+            values: Dict[str, pd.Series] = {}
+            for i, c in enumerate(dims, start=1):
+                if c == self.date_col:
+                    ordinals = np.concatenate([df[c].dt.to_period(self.partition_freq).array.asi8 for df in sides])
+                    codes[:, i], uniques = pd.factorize(ordinals)
+                    labels = pd.arrays.PeriodArray(uniques, dtype=pd.PeriodDtype(self.partition_freq)).astype(str)
+                    values[c] = pd.Series(np.asarray(labels, dtype=object))
+                else:
+                    codes[:, i], uniques = pd.factorize(pd.concat([df[c] for df in sides], ignore_index=True),
+                                                        use_na_sentinel=False)
+                    values[c] = pd.Series(uniques)
+            cells, first = _fold_codes(codes, [2] + [len(values[c]) for c in dims])
+            measures = np.vstack([self._measure_frame(side)[self.measure_cols].to_numpy(dtype="float64")
+                                  for side in ("gcp", "edw")])
+            measures = np.nan_to_num(measures, nan=0.0)
+            sums = np.zeros((len(first), len(self.measure_cols)), order="F")
+            for j in range(len(self.measure_cols)):
+                sums[:, j] = np.bincount(cells, weights=measures[:, j], minlength=len(first))
+            # The side is the leading code, so every GCP cell is numbered before any EDW cell
+            self._slice_codes = {
+                "codes": np.asfortranarray(codes[first, 1:]),
+                "values": values,
+                "rows": np.bincount(cells, minlength=len(first)),
+                "measures": sums,
+                "gcp_cells": int(cells[:len(self.gcp)].max()) + 1 if len(self.gcp) else 0,
+            }
+        return self._slice_codes
+
+    def _slice_differences(self, dims: List[str],
+                           cells: Optional[np.ndarray] = None) -> Tuple[pd.DataFrame, Optional[np.ndarray]]:
+        """Both sides' row counts and measure sums per slice of ``dims`` present on either side.
+
+        One column per dimension holds the decoded slice values, with the
+        date as its ``partition_freq`` period label and missing values as
+        slices of their own, followed by ``__gcp_rows__``/``__edw_rows__``
+        and ``{m}__GCP``/``{m}__EDW`` (zero where a side has no rows).  Both
+        sides are numbered with the shared codes, so they line up without a
+        groupby or a join.
+
+        ``cells`` (ascending positions in :meth:`_slice_dictionary`) limits
+        the aggregation to those cells.  Also returns the slice (row of the
+        frame) of each aggregated cell, so the caller can narrow ``cells``
+        for the next level.
+        """
+        dictionary = self._slice_dictionary()
+        columns = [self._attribution_dims().index(c) for c in dims]
+        codes = np.stack([dictionary["codes"][:, i] if cells is None else dictionary["codes"][:, i][cells]
+                          for i in columns], axis=1)
+        cell_slices, first = _fold_codes(codes, [len(dictionary["values"][c]) for c in dims])
+        frame = pd.DataFrame({c: dictionary["values"][c].take(codes[first, i]).reset_index(drop=True)
+                              for i, c in enumerate(dims)})
+        # Positions are ascending, so the GCP cells come first
+        split = dictionary["gcp_cells"] if cells is None else int(np.searchsorted(cells, dictionary["gcp_cells"]))
+        for side, on_side in (("GCP", slice(None, split)), ("EDW", slice(split, None))):
+            def weights(values: np.ndarray) -> np.ndarray:
+                return values[on_side] if cells is None else values[cells[on_side]]
+            frame[f"__{side.lower()}_rows__"] = np.bincount(cell_slices[on_side], weights=weights(dictionary["rows"]),
+                                                            minlength=len(first)).astype("int64")
+            for j, m in enumerate(self.measure_cols):
+                frame[f"{m}__{side}"] = np.bincount(cell_slices[on_side], weights=weights(dictionary["measures"][:, j]),
+                                                    minlength=len(first))
+        return self._decode_dimensions(frame), cell_slices
+
+    @_profiled("run_variance_attribution")
+    def run_variance_attribution(self, min_share: float = 0.05, coverage: float = 0.8,
+                                 max_depth: int = 3, max_slices: int = 10) -> pd.DataFrame:
+        """Explain each mismatching grand total by the fewest dimension slices.
+
+        Starting from the grand‑total difference of every measure whose
+        totals mismatch, combinations of dimensions are searched breadth
+        first, one more dimension per level (up to ``max_depth``), on
+        per‑slice sums of both sides rather than on joined rows.  A slice
+        whose difference is below ``min_share`` of the measure's grand‑total
+        difference is pruned: its rows are not aggregated again at deeper
+        levels.  Combinations are extended in ``dimension_cols`` order, so
+        each is aggregated once; the date drills down by ``partition_freq``
+        period and declared key columns are not searched.
+
+        The slices of one combination are disjoint, so their differences add
+        up to the grand‑total difference.  For each measure the report is the
+        smallest set of unpruned slices of one combination holding at least
+        ``coverage`` of that combination's absolute variation (the sum of
+        ``|Difference|`` over its slices, with each pruned branch counted
+        once at the level it was pruned), so offsetting slices elsewhere
+        cannot make a slice look more decisive than it is.  Ties go to the
+        deeper, more specific combination and then to the larger share.
+        When no combination is covered by ``max_slices`` slices the gap is
+        spread too thinly to localise and the whole table is reported as one
+        depth‑0 slice.
+        """
+        columns = ["Measure", "Rank", "Depth", "Dimensions", "Slice", "GCP Rows", "EDW Rows", "GCP Sum",
+                   "EDW Sum", "Difference", "Share of Difference", "Variation Share", "Cumulative Variation Share"]
+        if not self.measure_cols:
+            return pd.DataFrame(columns=columns)
+        g_tot = np.asarray(self._side_aggregates("gcp").totals(), dtype="float64")
+        e_tot = np.asarray(self._side_aggregates("edw").totals(), dtype="float64")
+        mismatch, total_diff = self._compare_measures(g_tot, e_tot)
+        mismatch &= np.isfinite(total_diff) & (total_diff != 0)
+        if not mismatch.any():
+            return pd.DataFrame(columns=columns)
+
+        k = len(self.measure_cols)
+        dims = self._attribution_dims()
+        floor = min_share * np.abs(total_diff)
+        alive_cols = [f"__alive_{j}__" for j in range(k)]
+        # Combination -> (its unpruned slices with per-measure survival, |Difference| pruned on the way
+        # there, the cells in those slices); the root is the whole table
+        frontier: Dict[Tuple[str, ...], Tuple[Optional[pd.DataFrame], np.ndarray, Optional[np.ndarray]]] = {
+            (): (None, np.zeros(k), None)}
+        # (combination, its unpruned slices, their survival per measure, its variation per measure)
+        searched: List[Tuple[Tuple[str, ...], pd.DataFrame, np.ndarray, np.ndarray]] = []
+        for _ in range(min(max_depth, len(dims))):
+            next_frontier: Dict[Tuple[str, ...], Tuple[Optional[pd.DataFrame], np.ndarray, Optional[np.ndarray]]] = {}
+            for parent, (survivors, pruned, cells) in frontier.items():
+                start = dims.index(parent[-1]) + 1 if parent else 0
+                for c in dims[start:]:
+                    combo = parent + (c,)
+                    table, cell_slices = self._slice_differences(list(combo), cells)
+                    n_slices = len(table)
+                    table["__slice__"] = np.arange(n_slices)
+                    if survivors is None:
+                        inherited = np.broadcast_to(mismatch, (len(table), k))
+                    else:
+                        # Only children of unpruned slices, alive for the measures their parent is
+                        table = table.merge(survivors, on=list(parent), how="inner", sort=False)
+                        inherited = table[alive_cols].to_numpy(dtype=bool)
+                        table = table.drop(columns=alive_cols)
+                    difference = np.abs(self._compare_measures(*self._measure_blocks(table))[1])
+                    alive = inherited & (difference >= floor)
+                    keep = alive.any(axis=1)
+                    searched.append((combo, table.loc[keep].reset_index(drop=True), alive[keep],
+                                     pruned + difference.sum(axis=0)))
+                    if keep.any():
+                        child_cells = None
+                        if cell_slices is not None:
+                            kept = np.zeros(n_slices, dtype=bool)
+                            kept[table["__slice__"].to_numpy()[keep]] = True
+                            child_cells = np.flatnonzero(kept[cell_slices]) if cells is None else cells[kept[cell_slices]]
+                        next_frontier[combo] = (
+                            pd.concat([table.loc[keep, list(combo)].reset_index(drop=True),
+                                       pd.DataFrame(alive[keep], columns=alive_cols)], axis=1),
+                            pruned + difference[~keep].sum(axis=0), child_cells)
+            frontier = next_frontier
+            if not frontier:
+                break
+
+        reports = []
+        for j in np.flatnonzero(mismatch):
+            m = self.measure_cols[j]
+            best: Optional[Tuple[Tuple[Any, ...], Tuple[str, ...], pd.DataFrame, float]] = None
+            for combo, table, alive, variation in searched:
+                if not variation[j]:
+                    continue
+                share = np.abs(table[f"{m}__GCP"].to_numpy() - table[f"{m}__EDW"].to_numpy()) / variation[j]
+                order = np.argsort(-share, kind="stable")
+                order = order[alive[order, j]][:max_slices]
+                reached = np.flatnonzero(np.cumsum(share[order]) >= coverage)
+                if not len(reached):
+                    continue
+                chosen = order[:reached[0] + 1]
+                rank = (len(chosen), -len(combo), -share[chosen].sum())
+                if best is None or rank < best[0]:
+                    best = (rank, combo, table.iloc[chosen], variation[j])
+            if best is None:
+                report = pd.DataFrame({"Depth": [0], "Dimensions": ["(all)"], "Slice": ["(all rows)"],
+                                       "GCP Rows": [self._table_rows("gcp")], "EDW Rows": [self._table_rows("edw")],
+                                       "GCP Sum": [g_tot[j]], "EDW Sum": [e_tot[j]]})
+                variation_j = abs(total_diff[j])
+            else:
+                _, combo, chosen, variation_j = best
+                labels = [c + "=" + chosen[c].astype(str) for c in combo]
+                report = pd.DataFrame({"Depth": len(combo), "Dimensions": ", ".join(combo),
+                                       "Slice": labels[0].str.cat(labels[1:], sep=", ").to_numpy(),
+                                       "GCP Rows": chosen["__gcp_rows__"].to_numpy(dtype="int64"),
+                                       "EDW Rows": chosen["__edw_rows__"].to_numpy(dtype="int64"),
+                                       "GCP Sum": chosen[f"{m}__GCP"].to_numpy(),
+                                       "EDW Sum": chosen[f"{m}__EDW"].to_numpy()})
+            report.insert(0, "Measure", m)
+            report.insert(1, "Rank", np.arange(1, len(report) + 1))
+            report["Difference"] = report["GCP Sum"] - report["EDW Sum"]
+            report["Share of Difference"] = report["Difference"] / total_diff[j]
+            report["Variation Share"] = report["Difference"].abs() / variation_j
+            report["Cumulative Variation Share"] = report["Variation Share"].cumsum()
+            reports.append(report)
+        print(f"[Validator] Variance attribution aggregated {len(searched)} dimension combinations")
+        return pd.concat(reports, ignore_index=True)[columns]
+
     # ----------------------------------------------------------------------
     # Orchestration
     # ----------------------------------------------------------------------
-    def run_all(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-        """Run all stages and return the seven output DataFrames."""
-        summary_df = self.run_summary()
-        grand_df = self.run_grand_totals()
-        time_df = self.run_time_windows()
-        mismatch_df, annotated_df = self.run_reconciliation()
-        partition_df = self.run_partition_checks()
-        distribution_df = self.run_distribution_stats()
-        # Ensure summary is string typed for KNIME compatibility
-        summary_df = summary_df.astype(str)
-        return summary_df, grand_df, time_df, mismatch_df, annotated_df, partition_df, distribution_df
\ No newline at end of file
+    def profile_table(self) -> pd.DataFrame:
+        """One row per profiled stage call so far (setup first), in the order the calls finished."""
+        return pd.DataFrame(self._profile, columns=PROFILE_COLUMNS)
+
+    def run_stages(self, stages: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """Run only the named outputs (see ``STAGES``) and return them by name.
+
+        Nothing is computed for outputs that are not requested; intermediates
+        (the comparison keys, the daily cubes and their period roll‑ups,
+        digests, sketches, the sample) are memoised on the instance, so later
+        calls reuse them.
+        ``mismatches`` and ``annotated_gcp`` share one reconciliation.
+        With ``n_workers > 1`` one process pool serves every stage of the call.
+        """
+        stages = list(stages)
+        unknown = [s for s in stages if s not in self.STAGES]
+        if unknown:
+            raise ValueError(f"Unknown stage(s) {unknown}; choose from {list(self.STAGES)}")
+        with self._run_pool():
+            return self._run_selected_stages(stages)
+
+    @contextlib.contextmanager
+    def _run_pool(self) -> Iterator[None]:
+        """Keep one process pool in ``self._pool`` (when ``n_workers > 1``) until the block exits."""
+        if self.n_workers <= 1 or self._pool is not None:
+            yield
+            return
+        self._pool = self._new_pool()
+        try:
+            yield
+        finally:
+            pool, self._pool = self._pool, None
+            pool.shutdown()
+
+    @contextlib.contextmanager
+    def _process_pool(self) -> Iterator[ProcessPoolExecutor]:
+        """The pool of the current run, or a pool for this block only outside a run."""
+        if self._pool is not None:
+            yield self._pool
+            return
+        with self._new_pool() as pool:
+            yield pool
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Start the tracker before the workers start, so they share it with this process.
+        # Polars' thread pool does not survive a fork, so its workers are spawned.
+        resource_tracker.ensure_running()
+        context = multiprocessing.get_context("spawn") if self.backend == "polars" else None
+        return ProcessPoolExecutor(max_workers=self.n_workers, mp_context=context)
+
+    def _run_selected_stages(self, stages: List[str]) -> Dict[str, pd.DataFrame]:
+        out: Dict[str, pd.DataFrame] = {}
+        if "summary" in stages:
+            # Ensure summary is string typed for KNIME compatibility
+            out["summary"] = self.run_summary().astype(str)
+        if "grand_totals" in stages:
+            out["grand_totals"] = self.run_grand_totals()
+        if "time_windows" in stages:
+            out["time_windows"] = self.run_time_windows()
+        if "mismatches" in stages or "annotated_gcp" in stages:
+            out["mismatches"], out["annotated_gcp"] = self.run_reconciliation()
+        if "partition_checks" in stages:
+            out["partition_checks"] = self.run_partition_checks()
+        if "distribution_stats" in stages:
+            out["distribution_stats"] = self.run_distribution_stats()
+        return {s: out[s] for s in stages}
+
+    def run_all(self, include_profile: bool = False,
+                stages: Optional[Iterable[str]] = None) -> Tuple[pd.DataFrame, ...]:
+        """Run all stages and return the seven output DataFrames.
+
+        Stages 2, 3 and 6 and the moments of stage 7 are all derived from one
+        :class:`DailyAggregates` scan per side, built on first use.  With
+        ``stages`` (names from ``STAGES``) only those outputs are computed and
+        the others are returned as empty DataFrames, e.g. for disconnected
+        KNIME ports.  With ``include_profile=True`` the stage profile
+        (:meth:`profile_table`) is returned as an eighth DataFrame.
+        """
+        out = self.run_stages(self.STAGES if stages is None else stages)
+        outputs = tuple(out.get(name, pd.DataFrame()) for name in self.STAGES)
+        if include_profile:
+            outputs += (self.profile_table(),)
+        return outputs
+
+
+# ----------------------------------------------------------------------
+# Process pool tasks (module level so they can be pickled)
+# ----------------------------------------------------------------------
+def _reconcile_bucket_task(view: ExtendedMigrationValidator, gcp_path: str, edw_path: str) -> BucketResult:
+    return view._reconcile_bucket(gcp_path, edw_path)
+
+
+def _hash_task(view: ExtendedMigrationValidator, specs: Dict[str, Tuple[str, str, Tuple[int, ...]]],
+               side: str, dtypes: Dict[str, Any], start: int, stop: int) -> None:
+    with _attach_shared(specs) as arrays:
+        frame = pd.DataFrame({
+            c: (arrays[f"{side}:{c}"][start:stop] if dtype is None
+                else pd.Categorical.from_codes(arrays[f"{side}:{c}"][start:stop], dtype=dtype))
+            for c, dtype in dtypes.items()
+        })
+        arrays[f"{side}:hash"][start:stop] = view._dimension_hash(frame).to_numpy()
+        arrays[f"{side}:check"][start:stop] = view._dimension_hash(frame, hash_key=view._HASH_KEY_CHECK).to_numpy()
+        del frame
+
+
+def _sequence_task(view: ExtendedMigrationValidator, specs: Dict[str, Tuple[str, str, Tuple[int, ...]]],
+                   n_parts: int, side: str, part: int) -> None:
+    with _attach_shared(specs) as arrays:
+        rows = np.flatnonzero(arrays[f"{side}:hash"] % np.uint64(n_parts) == part)
+        frame = pd.DataFrame({"__dimension_hash__": arrays[f"{side}:hash"][rows]})
+        for j, m in enumerate(view.measure_cols):
+            frame[m] = arrays[f"{side}:measures"][j, rows]
+        if f"{side}:date" in arrays:
+            frame[view.date_col] = arrays[f"{side}:date"][rows]
+        frame["__row_sequence__"] = view._sequence_within_group(frame)
+        arrays[f"{side}:seq"][rows] = frame["__row_sequence__"].to_numpy()
+        arrays[f"{side}:key"][rows] = view._sequence_key(frame).to_numpy()
+        del frame
+
+
+def _collision_task(specs: Dict[str, Tuple[str, str, Tuple[int, ...]]], n_parts: int, part: int) -> bool:
+    # Equal hashes and equal keys fall in the same partition, so checking each partition checks the whole
+    with _attach_shared(specs) as arrays:
+        pairs, keys = [], []
+        for side in ("gcp", "edw"):
+            h = arrays[f"{side}:hash"]
+            rows = np.flatnonzero(h % np.uint64(n_parts) == part)
+            pairs.append(pd.DataFrame({"h": h[rows], "h2": arrays[f"{side}:check"][rows]}))
+            key = arrays.get(f"{side}:key", h)
+            keys.append(pd.Series(key[key % np.uint64(n_parts) == part]))
+        if pd.concat(pairs, ignore_index=True).drop_duplicates()["h"].duplicated().any():
+            return True
+        return any(bool(k.duplicated().any()) for k in keys)
+
+
+def _sketch_rows(k: int, values: np.ndarray) -> List[MeasureSketch]:
+    return [MeasureSketch(k=k).update(values[:, j]) for j in range(values.shape[1])]
+
+
+def _sketch_task(k: int, specs: Dict[str, Tuple[str, str, Tuple[int, ...]]], start: int, stop: int) -> List[MeasureSketch]:
+    with _attach_shared(specs) as arrays:
+        values = np.array(arrays["values"][start:stop])
+    return _sketch_rows(k, values)
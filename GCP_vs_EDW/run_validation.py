@@ -1,9 +1,11 @@
-import pandas as pd
+import os
 from code_1 import MigrationValidator
+from columnar_loader import load_table_pair
 
-# Load the CSV files
-input_table_1 = pd.read_csv("GCP Data.CSV")
-input_table_2 = pd.read_csv("EDW Data.CSV")
+# Load the extracts (Parquet when available, otherwise the CSV files)
+gcp_path = "GCP Data.parquet" if os.path.exists("GCP Data.parquet") else "GCP Data.CSV"
+edw_path = "EDW Data.parquet" if os.path.exists("EDW Data.parquet") else "EDW Data.CSV"
+input_table_1, input_table_2 = load_table_pair(gcp_path, edw_path)
 
 # Initialize the validator
 validator = MigrationValidator(input_table_1, input_table_2)
@@ -17,8 +19,8 @@ print("\nStage 2: Running grand total validation...")
 output_table_2 = validator.run_grand_total_validation()
 print(output_table_2)
 
-print("\nStage 3: Running GroupBy dimension validation...")
-output_table_3 = validator.run_groupby_validation()
+print("\nStage 3: Running time-series validation...")
+output_table_3 = validator.run_time_series_validation()
 print(output_table_3)
 
 print("\nStage 4: Running row-level validation...")
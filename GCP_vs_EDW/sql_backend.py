@@ -0,0 +1,445 @@
+"""
+sql_backend.py
+~~~~~~~~~~~~~~
+
+SQL pushdown backend for :class:`~extended_migration_validator.ExtendedMigrationValidator`.
+When both extracts already sit as tables in a local SQLite or DuckDB
+database file, :class:`SqlPushdownValidator` runs the heavy stages inside
+that engine and only result tables come back into pandas:
+
+  * stage 1 – row and null counts are one aggregate query per table,
+  * stages 2, 3 and 6 (and the mean/variance of stage 7) – each table is
+    aggregated by ``GROUP BY`` day into the same day × measure cube
+    (:class:`~extended_migration_validator.DailyAggregates`) the pandas
+    backend builds, so grand totals, time windows and partition checks
+    are then derived from it by the very same code,
+  * stage 4 – the outer join is a ``UNION ALL`` of both tables numbered
+    with ``ROW_NUMBER()`` inside each dimension group and grouped on
+    (dimensions, sequence); only the keys whose measures are not exactly
+    equal come back, and the tolerance check, readable key labels and
+    report layout are applied to those in pandas.
+
+Roles, dtypes and the dimension dictionaries are discovered on the first
+``sample_rows`` rows of each table, which is all that is read into pandas
+during setup:
+
+    from sql_backend import SqlPushdownValidator
+    validator = SqlPushdownValidator.from_database("extracts.duckdb", "gcp_orders", "edw_orders")
+    out1, out2, out3, out4, out5, out6, out7 = validator.run_all()
+
+Outputs 1–4, 6 and 7 have the layout and values of the pandas backend on
+the same tables; sums agree to floating‑point summation order, which is
+far inside the comparison tolerances.  Output 5 is not materialised: it
+is the table of row counts per ``mismatch_type`` / ``validation_status``
+that ``output_dir`` mode returns.  Stage 7 reads the measure columns
+only.  DuckDB is optional (``pip install duckdb``); SQLite needs version
+3.39 or later for its window functions and ``NULLS LAST``.  Dates must be
+stored as ISO‑8601 text (SQLite) or ``DATE``/``TIMESTAMP`` (DuckDB).
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from extended_migration_validator import DailyAggregates, ExtendedMigrationValidator, _profiled
+
+try:
+    import duckdb  # type: ignore
+    _has_duckdb = True
+except ImportError:
+    _has_duckdb = False
+
+# Database file suffix -> engine; anything else is opened with SQLite
+_ENGINE_SUFFIXES = {".duckdb": "duckdb", ".ddb": "duckdb"}
+
+# Per-engine SQL fragments: day of a date column, its instant for ordering, null-safe inequality
+_DIALECTS: Dict[str, Dict[str, str]] = {
+    "sqlite": {"day": "date({0})", "instant": "julianday({0})", "distinct": "{0} IS NOT {1}"},
+    "duckdb": {"day": "TRY_CAST({0} AS DATE)", "instant": "TRY_CAST({0} AS TIMESTAMP)",
+               "distinct": "{0} IS DISTINCT FROM {1}"},
+}
+
+# Characters str.strip() removes from ASCII text, as the pandas backend strips dimension values
+_WHITESPACE = " \t\n\r\x0b\x0c"
+
+
+def _infer_engine(database: str) -> str:
+    return _ENGINE_SUFFIXES.get(os.path.splitext(database)[1].lower(), "sqlite")
+
+
+def _connect(database: str, engine: str) -> Any:
+    """Open ``database`` read‑only with ``engine`` (``"sqlite"`` or ``"duckdb"``)."""
+    if engine == "duckdb":
+        if not _has_duckdb:
+            raise ImportError("engine='duckdb' requires duckdb (pip install duckdb)")
+        return duckdb.connect(database, read_only=True)
+    if engine != "sqlite":
+        raise ValueError(f"engine must be 'sqlite' or 'duckdb', got {engine!r}")
+    if sqlite3.sqlite_version_info < (3, 39):
+        raise RuntimeError(f"SQLite {sqlite3.sqlite_version} is too old; the SQL backend needs 3.39 or later")
+    return sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _read_frame(conn: Any, engine: str, sql: str) -> pd.DataFrame:
+    if engine == "duckdb":
+        frame = conn.execute(sql).df()
+        # Nullable integers become float64 when they hold nulls, as pd.read_sql delivers them
+        for c in frame.columns:
+            if pd.api.types.is_extension_array_dtype(frame[c]) and pd.api.types.is_integer_dtype(frame[c]):
+                frame[c] = frame[c].astype("float64" if frame[c].isna().any() else frame[c].dtype.numpy_dtype)
+        return frame
+    return pd.read_sql_query(sql, conn)
+
+
+def read_sample(database: str, table: str, rows: int, engine: Optional[str] = None) -> pd.DataFrame:
+    """The first ``rows`` rows of ``table``, as role discovery sees them."""
+    engine = engine or _infer_engine(database)
+    conn = _connect(database, engine)
+    try:
+        return _read_frame(conn, engine, f"SELECT * FROM {_quote(table)} LIMIT {int(rows)}")
+    finally:
+        conn.close()
+
+
+def write_tables(database: str, tables: Dict[str, pd.DataFrame], engine: Optional[str] = None) -> None:
+    """Store DataFrames as (replaced) tables of ``database``, e.g. to benchmark the backend."""
+    engine = engine or _infer_engine(database)
+    if engine == "duckdb":
+        if not _has_duckdb:
+            raise ImportError("engine='duckdb' requires duckdb (pip install duckdb)")
+        conn = duckdb.connect(database)
+        try:
+            for name, frame in tables.items():
+                conn.register("__frame__", frame)
+                conn.execute(f"CREATE OR REPLACE TABLE {_quote(name)} AS SELECT * FROM __frame__")
+                conn.unregister("__frame__")
+        finally:
+            conn.close()
+        return
+    conn = sqlite3.connect(database)
+    try:
+        for name, frame in tables.items():
+            frame.to_sql(name, conn, index=False, if_exists="replace", chunksize=100_000)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _parse_dates(values: Any) -> pd.Series:
+    """Parse date values like the pandas backend does (coerced, timezone‑naive, nanoseconds)."""
+    parsed = pd.to_datetime(pd.Series(values), errors="coerce")
+    try:
+        parsed = parsed.dt.tz_localize(None)
+    except Exception:
+        pass
+    return parsed.astype("datetime64[ns]")
+
+
+@dataclass
+class SqlPushdownValidator(ExtendedMigrationValidator):
+    """:class:`ExtendedMigrationValidator` whose stages run as SQL inside a local database.
+
+    Build it with :meth:`from_database`; ``gcp_df`` and ``edw_df`` are
+    then the role‑discovery samples of the two tables.  The out‑of‑core,
+    parallel, digest, state‑store, sampling and ``output_dir`` options do
+    not apply (the engine plans its own execution) and raise ``ValueError``.
+    """
+
+    database: str = ""
+    gcp_table: str = ""
+    edw_table: str = ""
+    engine: Optional[str] = None
+
+    # Options of the pandas backend this backend does not support
+    _UNSUPPORTED = {"chunked": False, "n_workers": 1, "digest_prune": False, "state_store": None,
+                    "sample_rate": None, "output_dir": None}
+
+    def __post_init__(self) -> None:
+        unsupported = [name for name, default in self._UNSUPPORTED.items() if getattr(self, name) != default]
+        if unsupported:
+            raise ValueError(f"SqlPushdownValidator does not support {unsupported}")
+        self.engine = self.engine or _infer_engine(self.database)
+        self._conn = _connect(self.database, self.engine)
+        self._dialect = _DIALECTS[self.engine]
+        self._row_counts: Dict[str, int] = {}
+        super().__post_init__()
+        print(f"[Validator] Roles discovered on {len(self.gcp)} / {len(self.edw)} sampled rows; "
+              f"stages run in {self.engine} ({self.database})")
+
+    @classmethod
+    def from_database(cls, database: str, gcp_table: str, edw_table: str, engine: Optional[str] = None,
+                      sample_rows: int = ExtendedMigrationValidator._ROLE_SAMPLE_ROWS,
+                      **options: Any) -> "SqlPushdownValidator":
+        """Validate ``gcp_table`` against ``edw_table`` of ``database``; ``options`` as for the pandas backend."""
+        engine = engine or _infer_engine(database)
+        gcp_sample = read_sample(database, gcp_table, sample_rows, engine)
+        edw_sample = read_sample(database, edw_table, sample_rows, engine)
+        return cls(gcp_sample, edw_sample, database=database, gcp_table=gcp_table, edw_table=edw_table,
+                   engine=engine, **options)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ----------------------------------------------------------------------
+    # SQL building blocks
+    # ----------------------------------------------------------------------
+    def _query(self, sql: str) -> pd.DataFrame:
+        return _read_frame(self._conn, self.engine, sql)
+
+    def _table(self, side: str) -> str:
+        return _quote(self.gcp_table if side == "gcp" else self.edw_table)
+
+    def _apply_roles(self, roles: Dict[str, Any]) -> None:
+        """Apply the roles, then map every column to its name in the source table of each side."""
+        super()._apply_roles(roles)
+        self._source_columns: Dict[str, Dict[str, str]] = {}
+        self._text_columns: Dict[str, set] = {}
+        for side, sample, date in (("gcp", self.gcp_df, roles["gcp_date"]), ("edw", self.edw_df, roles["edw_date"])):
+            names: Dict[str, str] = {}
+            text = set()
+            for c in sample.columns:
+                if str(c).strip() not in names:
+                    names[str(c).strip()] = str(c)
+                    if not pd.api.types.is_numeric_dtype(sample[c]) and not pd.api.types.is_datetime64_any_dtype(sample[c]):
+                        text.add(str(c).strip())
+            # The EDW date column is renamed to the GCP name when the names differ
+            if date and self.date_col and self.date_col not in names and date in names:
+                names[self.date_col] = names[date]
+            self._source_columns[side] = names
+            self._text_columns[side] = text
+
+    def _has_column(self, side: str, col: str) -> bool:
+        return col in self._source_columns[side]
+
+    def _value_expr(self, side: str, col: str) -> str:
+        """SQL for a column's values as the pandas backend sees them (text stripped, dates at day level)."""
+        if col == "__no_dimension__":
+            return "'ALL'"
+        source = _quote(self._source_columns[side][col])
+        if col == self.date_col:
+            return self._dialect["day"].format(source)
+        if col in self._text_columns[side]:
+            return f"TRIM({source}, '{_WHITESPACE}')"
+        return source
+
+    def _display_expr(self, side: str, col: str) -> str:
+        """SQL for a dimension as output 4 shows it (the date keeps its time of day)."""
+        if col == self.date_col:
+            return _quote(self._source_columns[side][col])
+        return self._value_expr(side, col)
+
+    # ----------------------------------------------------------------------
+    # Stage 1: Summary
+    # ----------------------------------------------------------------------
+    def _table_rows(self, side: str) -> int:
+        if side not in self._row_counts:
+            self._row_counts[side] = int(self._query(f"SELECT COUNT(*) AS n FROM {self._table(side)}").iloc[0, 0])
+        return self._row_counts[side]
+
+    def _null_counts(self, side: str, columns: List[str]) -> Dict[str, int]:
+        """Null counts in one scan; columns the table lacks (helper columns) have none."""
+        selected = [c for c in columns if self._has_column(side, c)]
+        counts = {c: 0 for c in columns}
+        if not selected:
+            return counts
+        # A date that does not parse is missing in the pandas backend too
+        exprs = [f"SUM(CASE WHEN {self._value_expr(side, c)} IS NULL THEN 1 ELSE 0 END) AS c{i}"
+                 if c == self.date_col else f"COUNT(*) - COUNT({_quote(self._source_columns[side][c])}) AS c{i}"
+                 for i, c in enumerate(selected)]
+        row = self._query(f"SELECT {', '.join(exprs)} FROM {self._table(side)}").iloc[0]
+        counts.update({c: int(row.iloc[i]) if pd.notna(row.iloc[i]) else 0 for i, c in enumerate(selected)})
+        return counts
+
+    # ----------------------------------------------------------------------
+    # Stages 2, 3, 6 and 7: the day × measure cube as one GROUP BY
+    # ----------------------------------------------------------------------
+    def _side_aggregates(self, side: str) -> DailyAggregates:
+        """Build one side's :class:`DailyAggregates` cube with a single ``GROUP BY`` day.
+
+        The squared deviations use the day's mean from a window ``AVG``, as
+        :meth:`_build_daily_aggregates` uses the slot mean.
+        """
+        if side in self._aggregates:
+            return self._aggregates[side]
+        dated = bool(self.date_col) and self._has_column(side, self.date_col)
+        day = self._value_expr(side, self.date_col) if dated else "NULL"
+        inner = [f"{day} AS d"]
+        outer = ["d", "COUNT(*) AS n"]
+        for j, m in enumerate(self.measure_cols):
+            inner += [f"{_quote(self._source_columns[side][m])} AS v{j}", f"AVG({_quote(self._source_columns[side][m])}) OVER (PARTITION BY {day}) AS a{j}"]
+            outer += [f"COUNT(v{j}) AS c{j}", f"SUM(v{j}) AS s{j}", f"SUM((v{j} - a{j}) * (v{j} - a{j})) AS q{j}"]
+        cube = self._query(f"SELECT {', '.join(outer)} FROM (SELECT {', '.join(inner)} FROM {self._table(side)}) AS t GROUP BY d")
+
+        days = _parse_dates(cube["d"]) if dated else pd.Series(pd.NaT, index=cube.index, dtype="datetime64[ns]")
+        k = len(self.measure_cols)
+
+        def block(prefix: str) -> np.ndarray:
+            return cube[[f"{prefix}{j}" for j in range(k)]].to_numpy(dtype="float64").reshape(len(cube), k)
+
+        self._aggregates[side] = DailyAggregates.from_day_groups(days, cube["n"].to_numpy(dtype="int64"),
+                                                                 block("c"), block("s"), block("q"))
+        return self._aggregates[side]
+
+    def _measure_frame(self, side: str) -> pd.DataFrame:
+        """Only the measure columns are read for the distribution statistics."""
+        if not self.measure_cols:
+            return pd.DataFrame()
+        columns = ", ".join(_quote(self._source_columns[side][m]) for m in self.measure_cols)
+        frame = self._query(f"SELECT {columns} FROM {self._table(side)}")
+        frame.columns = self.measure_cols
+        return frame.apply(pd.to_numeric, errors="coerce").astype("float64")
+
+    # ----------------------------------------------------------------------
+    # Variance attribution: per-slice sums as one GROUP BY per table
+    # ----------------------------------------------------------------------
+    def _slice_differences(self, dims: List[str],
+                           cells: Optional[np.ndarray] = None) -> Tuple[pd.DataFrame, Optional[np.ndarray]]:
+        """Per‑slice row counts and sums of both tables, grouped by the engine.
+
+        The date is grouped by day and rolled up to its ``partition_freq``
+        period here.  Whole tables are aggregated (``cells`` is ignored);
+        the caller keeps only the children of unpruned slices.
+        """
+        sides = []
+        for side, suffix in (("gcp", "GCP"), ("edw", "EDW")):
+            keys = [f"{self._value_expr(side, c)} AS g{i}" for i, c in enumerate(dims)]
+            sums = [f"SUM({_quote(self._source_columns[side][m])}) AS s{j}" for j, m in enumerate(self.measure_cols)]
+            frame = self._query(f"SELECT {', '.join(keys + ['COUNT(*) AS n'] + sums)} FROM {self._table(side)} "
+                                f"GROUP BY {', '.join(f'g{i}' for i in range(len(dims)))}")
+            grouped = pd.DataFrame({c: _parse_dates(frame[f"g{i}"]).dt.to_period(self.partition_freq).astype(str)
+                                    if c == self.date_col else
+                                    frame[f"g{i}"].where(frame[f"g{i}"].notna(), self._dictionary_nulls.get(c, np.nan))
+                                    for i, c in enumerate(dims)})
+            grouped[f"__{side}_rows__"] = frame["n"].to_numpy(dtype="int64")
+            for j, m in enumerate(self.measure_cols):
+                grouped[f"{m}__{suffix}"] = pd.to_numeric(frame[f"s{j}"], errors="coerce").fillna(0.0).to_numpy(dtype="float64")
+            sides.append(grouped.groupby(dims, dropna=False, sort=False).sum().reset_index())
+        merged = pd.merge(sides[0], sides[1], on=dims, how="outer", sort=False)
+        counts = ["__gcp_rows__", "__edw_rows__"]
+        merged[counts] = merged[counts].fillna(0).astype("int64")
+        return merged.fillna({c: 0.0 for c in merged.columns if c not in dims and c not in counts}), None
+
+    # ----------------------------------------------------------------------
+    # Setup check for declared keys
+    # ----------------------------------------------------------------------
+    def _build_key_codes(self) -> None:
+        """Check on the sample as the pandas backend does, then count duplicate keys in each table."""
+        super()._build_key_codes()
+        duplicates = []
+        for side in ("gcp", "edw"):
+            keys = ", ".join(self._value_expr(side, c) for c in self.key_cols)
+            extra = self._query(f"SELECT SUM(n - 1) AS d FROM (SELECT COUNT(*) AS n FROM {self._table(side)} "
+                                f"GROUP BY {keys}) AS t").iloc[0, 0]
+            duplicates.append(int(extra) if pd.notna(extra) else 0)
+        if any(duplicates):
+            raise ValueError(f"key_cols {self.key_cols} do not identify rows uniquely: "
+                             f"{duplicates[0]} duplicate key(s) in GCP, {duplicates[1]} in EDW")
+
+    # ----------------------------------------------------------------------
+    # Stage 4 & 5: Reconciliation as one grouped UNION ALL
+    # ----------------------------------------------------------------------
+    def _sequenced_side(self, side: str, flag: int) -> str:
+        """One table's identity values, display dimensions, measures and sequence number.
+
+        The sequence numbers rows inside their dimension group in the order
+        of :meth:`_sequence_within_group`: raw date, every measure (nulls
+        last), then position (``rowid``).  A declared key needs none.
+        """
+        identity = [self._value_expr(side, c) for c in self._identity_cols()]
+        columns = [f"{flag} AS side"] + [f"{expr} AS i{i}" for i, expr in enumerate(identity)]
+        columns += [f"{self._display_expr(side, c)} AS d{i}" for i, c in enumerate(self.dimension_cols)]
+        measures = [_quote(self._source_columns[side][m]) for m in self.measure_cols]
+        columns += [f"{expr} AS v{j}" for j, expr in enumerate(measures)]
+        if self.key_cols:
+            columns.append("0 AS seq")
+        else:
+            order = []
+            if self.measure_cols and self.date_col in self.dimension_cols:
+                order.append(self._dialect["instant"].format(_quote(self._source_columns[side][self.date_col])) + " NULLS LAST")
+            order += [f"{expr} NULLS LAST" for expr in measures] + ["rowid"]
+            columns.append(f"ROW_NUMBER() OVER (PARTITION BY {', '.join(identity)} ORDER BY {', '.join(order)}) - 1 AS seq")
+        return f"SELECT {', '.join(columns)} FROM {self._table(side)}"
+
+    def _reconciliation_sql(self) -> str:
+        """Keys present on one side only or whose measures are not exactly equal, with both sides' values."""
+        n_id, k = len(self._identity_cols()), len(self.measure_cols)
+        group = [f"i{i}" for i in range(n_id)] + ["seq"]
+        pick = ["MAX(CASE WHEN side = 0 THEN 1 ELSE 0 END) AS in_gcp", "MAX(CASE WHEN side = 1 THEN 1 ELSE 0 END) AS in_edw"]
+        pick += [f"MAX(CASE WHEN side = 0 THEN d{i} END) AS d{i}" for i in range(len(self.dimension_cols))]
+        pick += [f"MAX(CASE WHEN side = 0 THEN v{j} END) AS g{j}" for j in range(k)]
+        pick += [f"MAX(CASE WHEN side = 1 THEN v{j} END) AS e{j}" for j in range(k)]
+        differs = ["in_gcp = 0", "in_edw = 0"] + [self._dialect["distinct"].format(f"g{j}", f"e{j}") for j in range(k)]
+        return (f"SELECT * FROM (SELECT {', '.join(group + pick)} FROM ("
+                f"{self._sequenced_side('gcp', 0)} UNION ALL {self._sequenced_side('edw', 1)}) AS sides "
+                f"GROUP BY {', '.join(group)}) AS pairs WHERE {' OR '.join(differs)}")
+
+    @_profiled("run_reconciliation")
+    def run_reconciliation(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Return the mismatch report (output 4) and row counts per status in place of output 5.
+
+        Only keys that are one‑sided or not exactly equal leave the engine;
+        the configured tolerances then decide which of them are ``Value
+        Mismatch``, so the classification matches the pandas backend.
+        """
+        pairs = self._query(self._reconciliation_sql())
+        in_gcp = pairs["in_gcp"].to_numpy(dtype="int64") == 1
+        in_edw = pairs["in_edw"].to_numpy(dtype="int64") == 1
+        k = len(self.measure_cols)
+        g_block = pairs[[f"g{j}" for j in range(k)]].to_numpy(dtype="float64") if k else np.empty((len(pairs), 0))
+        e_block = pairs[[f"e{j}" for j in range(k)]].to_numpy(dtype="float64") if k else np.empty((len(pairs), 0))
+        any_value_mismatch = self._compare_measures(g_block, e_block)[0].any(axis=1) if k else np.zeros(len(pairs), dtype=bool)
+        mismatch_type = np.where(~in_edw & in_gcp, "In GCP Only",
+                                 np.where(~in_gcp & in_edw, "In EDW Only",
+                                          np.where(any_value_mismatch, "Value Mismatch", "Match")))
+        keep = mismatch_type != "Match"
+        pairs, mismatch_type = pairs.loc[keep].reset_index(drop=True), mismatch_type[keep]
+        g_block, e_block, in_gcp = g_block[keep], e_block[keep], in_gcp[keep]
+
+        # Identity values as the pandas backend holds them, for the key
+        identity = pd.DataFrame({c: _parse_dates(pairs[f"i{i}"]) if c == self.date_col else pairs[f"i{i}"]
+                                 for i, c in enumerate(self._identity_cols())})
+        sequence = pairs["seq"].to_numpy(dtype="int64")
+        hashes = self._dimension_hash(identity)
+        keys = hashes if self.key_cols else pd.util.hash_pandas_object(
+            pd.DataFrame({"__dimension_hash__": hashes.to_numpy(), "__row_sequence__": sequence}), index=False)
+
+        report = pd.DataFrame({self.key_col: keys.to_numpy(), "mismatch_type": mismatch_type})
+        if self.readable_keys:
+            labels = self._dimension_strings(identity) if len(pairs) else pd.Series([], dtype=object)
+            if not self.key_cols:
+                labels = labels.str.cat(pd.Series(sequence).astype(str), sep="#")
+            report.insert(1, self.label_col, labels.to_numpy(dtype=object))
+        for i, c in enumerate(self.dimension_cols):
+            values = _parse_dates(pairs[f"d{i}"]) if c == self.date_col else pairs[f"d{i}"]
+            report[c] = values.where(in_gcp, np.nan)
+        for j, m in enumerate(self.measure_cols):
+            report[f"{m}__GCP"] = g_block[:, j]
+        for j, m in enumerate(self.measure_cols):
+            report[f"{m}__EDW"] = e_block[:, j]
+        for j, m in enumerate(self.measure_cols):
+            report[f"{m}__Difference"] = g_block[:, j] - e_block[:, j]
+        report = report.sort_values(self.label_col if self.readable_keys else self.key_col,
+                                    kind="mergesort").reset_index(drop=True)
+
+        # Output 5 in summary form: every GCP row not in the report matched
+        type_counts = report["mismatch_type"].value_counts()
+        status_counts = type_counts.drop("In EDW Only", errors="ignore")
+        status_counts["Match"] = self._table_rows("gcp") - int(status_counts.sum())
+        status_counts = status_counts[status_counts > 0]
+        counts = pd.concat([
+            pd.DataFrame({"Output": "4_mismatches", "Status": type_counts.index.astype(str),
+                          "Rows": type_counts.to_numpy(dtype="int64")}),
+            pd.DataFrame({"Output": "5_annotated_gcp", "Status": status_counts.index.astype(str),
+                          "Rows": status_counts.to_numpy(dtype="int64")}),
+        ], ignore_index=True)
+        return report, counts.sort_values(["Output", "Status"], kind="mergesort").reset_index(drop=True)
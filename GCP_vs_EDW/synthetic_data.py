@@ -0,0 +1,96 @@
+"""
+synthetic_data.py
+~~~~~~~~~~~~~~~~~
+
+Deterministic generator of GCP/EDW table pairs for exercising and
+benchmarking the validators.  The EDW table is the "source of truth"; the
+GCP table is derived from it with a controlled amount of damage:
+
+  * ``dup_rate``       – share of rows duplicated exactly (on both sides),
+  * ``mismatch_rate``  – share of GCP rows with one measure shifted by 1.0,
+  * ``gcp_only_rate``  – share of rows present only in GCP,
+  * ``edw_only_rate``  – share of rows present only in EDW.
+
+Every table has a ``biz_date`` column, ``n_dims`` string dimensions
+(``dim_1`` …) with ``cardinality`` distinct values each and ``n_measures``
+float measures (``measure_1`` …).  The same ``seed`` always produces the
+same pair, so timings and outputs are comparable across runs:
+
+    from synthetic_data import make_table_pair
+    gcp, edw, injected = make_table_pair(100_000, mismatch_rate=0.01)
+
+Dimensions are ``object`` string columns, as KNIME delivers them; pass
+``categorical=True`` to generate ``category`` columns instead, which keeps
+the largest tiers affordable to generate.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple, Union, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def make_table_pair(rows: int, n_dims: int = 3, cardinality: Union[int, Sequence[int]] = 50,
+                    n_measures: int = 3, n_days: int = 365, dup_rate: float = 0.01,
+                    mismatch_rate: float = 0.001, gcp_only_rate: float = 0.0005,
+                    edw_only_rate: float = 0.0005, seed: int = 0, categorical: bool = False
+                    ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
+    """Return ``(gcp, edw, injected)`` where ``injected`` counts the damage applied.
+
+    ``rows`` is the size of the shared base table before duplicates and
+    one‑sided rows are added.  ``cardinality`` is either one value for every
+    dimension or one value per dimension.
+    """
+    rng = np.random.default_rng(seed)
+    if isinstance(cardinality, int):
+        cardinality = [cardinality] * n_dims
+    if len(cardinality) != n_dims:
+        raise ValueError(f"cardinality needs {n_dims} values, got {len(cardinality)}")
+
+    columns: Dict[str, object] = {
+        "biz_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, n_days, rows), unit="D"),
+    }
+    for i, card in enumerate(cardinality, start=1):
+        categories = [f"d{i}_{v:05d}" for v in range(card)]
+        values = pd.Categorical.from_codes(rng.integers(0, card, rows), categories)
+        columns[f"dim_{i}"] = values if categorical else values.astype(object)
+    for j in range(1, n_measures + 1):
+        columns[f"measure_{j}"] = np.round(rng.normal(1000.0, 250.0, rows), 2)
+    base = pd.DataFrame(columns)
+
+    # Exact duplicate rows exist on both sides
+    n_dups = int(rows * dup_rate)
+    if n_dups:
+        base = pd.concat([base, base.iloc[rng.choice(rows, n_dups, replace=False)]], ignore_index=True)
+
+    # Rows that only one side has
+    n_gcp_only = int(rows * gcp_only_rate)
+    n_edw_only = int(rows * edw_only_rate)
+    one_sided = rng.choice(len(base), n_gcp_only + n_edw_only, replace=False)
+    gcp_only, edw_only = one_sided[:n_gcp_only], one_sided[n_gcp_only:]
+
+    edw = base.drop(index=gcp_only)
+    gcp = base.drop(index=edw_only).copy()
+
+    # Shift one measure of a few GCP rows that both sides have
+    n_mismatch = int(rows * mismatch_rate)
+    if n_mismatch and n_measures:
+        shared = np.setdiff1d(np.arange(len(base)), one_sided)
+        targets = rng.choice(shared, n_mismatch, replace=False)
+        which = rng.integers(1, n_measures + 1, n_mismatch)
+        for j in range(1, n_measures + 1):
+            hit = targets[which == j]
+            gcp.loc[hit, f"measure_{j}"] += 1.0
+
+    # GCP arrives in a different order than EDW
+    gcp = gcp.iloc[rng.permutation(len(gcp))].reset_index(drop=True)
+    edw = edw.reset_index(drop=True)
+    injected = {
+        "duplicate_rows": n_dups,
+        "value_mismatches": n_mismatch if n_measures else 0,
+        "gcp_only_rows": n_gcp_only,
+        "edw_only_rows": n_edw_only,
+    }
+    return gcp, edw, injected
@@ -0,0 +1,16 @@
+import numpy as np
+
+from extended_migration_validator import MeasureSketch
+
+
+def test_rank_error_bounds_the_error_at_ten_million_values():
+    n, chunk = 10_000_000, 10_000
+    values = np.random.default_rng(0).permutation(n).astype("float64")
+    sketch = MeasureSketch(k=200)
+    for start in range(0, n, chunk):
+        sketch.update(values[start:start + chunk])
+
+    # The values are 0 .. n - 1, so the true rank of item v is v + 1
+    items, weights = sketch._weighted_items()
+    worst = np.abs(np.cumsum(weights) - (items + 1)).max() / n
+    assert 0 < worst <= sketch.rank_error < 0.05, (worst, sketch.rank_error)
@@ -0,0 +1,46 @@
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from extended_migration_validator import ExtendedMigrationValidator
+from synthetic_data import make_table_pair
+
+
+def _keys(gcp, edw, **kwargs):
+    """The comparison key columns of both sides, built with ``kwargs``."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator = ExtendedMigrationValidator(gcp.copy(), edw.copy(), **kwargs)
+        with validator._run_pool():
+            validator._ensure_comparison_ids()
+    columns = ["__dimension_hash__", "__row_sequence__", validator.key_col]
+    return [df[columns] for df in (validator.gcp, validator.edw)]
+
+
+def test_pooled_keys_match_serial_keys():
+    gcp, edw, _ = make_table_pair(20_000, seed=3, dup_rate=0.1)
+    gcp.loc[gcp.index[::7], "dim_1"] = None
+    edw.loc[edw.index[::11], "dim_1"] = np.nan
+    for encode in (True, False):
+        serial = _keys(gcp, edw, encode_dimensions=encode)
+        pooled = _keys(gcp, edw, encode_dimensions=encode, n_workers=3)
+        for s, p in zip(serial, pooled):
+            assert (s.dtypes == p.dtypes).all()
+            assert (s.to_numpy() == p.to_numpy()).all()
+
+
+def test_polars_keys_match_pandas_keys():
+    pytest.importorskip("polars")
+    gcp, edw, _ = make_table_pair(20_000, seed=3, dup_rate=0.1)
+    gcp.loc[gcp.index[::7], "dim_1"] = None
+    gcp.loc[gcp.index[::13], "biz_date"] = pd.NaT
+    gcp["biz_date"] += pd.to_timedelta(np.arange(len(gcp)) % 5, unit="h")
+    gcp.loc[gcp.index[::17], "measure_1"] = -0.0
+    for encode in (True, False):
+        expected = _keys(gcp, edw, encode_dimensions=encode)
+        polars = _keys(gcp, edw, encode_dimensions=encode, backend="polars")
+        for e, p in zip(expected, polars):
+            assert (e.dtypes == p.dtypes).all()
+            assert (e.to_numpy() == p.to_numpy()).all()